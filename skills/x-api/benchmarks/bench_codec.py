@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON decoding of 100-tweet pages for each field profile.
+
+Builds realistic response pages for the minimal / metrics / full field
+profiles and times decoding with every installed JSON codec.
+
+Usage: python3 bench_codec.py [pages]
+
+Example:
+    python3 bench_codec.py 2000
+"""
+
+import sys
+import os
+import json
+import random
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from x_api_client import FIELD_PROFILES, available_codecs
+
+
+_WORDS = ("agents ship faster when the loop is tight and the feedback is honest "
+          "latency matters more than throughput until it does not").split()
+
+
+def _tweet(rng: random.Random, tweet_id: int, fields: str) -> dict:
+    """Build one tweet object containing the requested tweet.fields."""
+    author_id = str(rng.randrange(10**17, 10**18))
+    tweet = {
+        "id": str(tweet_id),
+        "text": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 40))),
+        "edit_history_tweet_ids": [str(tweet_id)],
+    }
+    for field in fields.split(","):
+        if field == "created_at":
+            tweet["created_at"] = "2026-01-01T12:%02d:%02d.000Z" % (rng.randrange(60), rng.randrange(60))
+        elif field == "public_metrics":
+            tweet["public_metrics"] = {
+                "retweet_count": rng.randrange(500),
+                "reply_count": rng.randrange(200),
+                "like_count": rng.randrange(5000),
+                "quote_count": rng.randrange(50),
+                "bookmark_count": rng.randrange(100),
+                "impression_count": rng.randrange(10**6),
+            }
+        elif field == "reply_settings":
+            tweet["reply_settings"] = "everyone"
+        elif field == "author_id":
+            tweet["author_id"] = author_id
+        elif field == "lang":
+            tweet["lang"] = "en"
+        elif field == "conversation_id":
+            tweet["conversation_id"] = str(tweet_id)
+        elif field == "entities":
+            tweet["entities"] = {
+                "hashtags": [{"start": 0, "end": 7, "tag": "agents"}],
+                "urls": [{
+                    "start": 10, "end": 33, "url": "https://t.co/abcdefghij",
+                    "expanded_url": "https://example.com/a/long/path", "display_url": "example.com/a/long/path",
+                }],
+            }
+        elif field == "referenced_tweets":
+            tweet["referenced_tweets"] = [{"type": "replied_to", "id": str(tweet_id - 1)}]
+    return tweet
+
+
+def build_page(profile: str, size: int = 100, seed: int = 1) -> bytes:
+    """Build a search response page for a field profile, as raw JSON bytes."""
+    rng = random.Random(seed)
+    params = FIELD_PROFILES[profile]
+    tweets = [_tweet(rng, 1800000000000000000 + i, params["tweet.fields"]) for i in range(size)]
+    page = {"data": tweets, "meta": {"result_count": size, "newest_id": tweets[0]["id"],
+                                     "oldest_id": tweets[-1]["id"], "next_token": "b26v89c19zqg8o3f"}}
+    if "expansions" in params:
+        page["includes"] = {"users": [
+            {"id": tweet["author_id"], "name": "Example User", "username": f"user{i}", "verified": False,
+             "public_metrics": {"followers_count": rng.randrange(10**6), "following_count": 300,
+                                "tweet_count": 12000, "listed_count": 40, "like_count": 9000}}
+            for i, tweet in enumerate(tweets)
+        ]}
+    return json.dumps(page).encode("utf-8")
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    codecs = available_codecs()
+
+    print(f"\nDecoding {pages} pages of 100 tweets per profile")
+    print(f"Codecs installed: {', '.join(codecs)}\n")
+    print(f"{'profile':<8} {'bytes/page':>10} {'codec':<7} {'us/page':>9} {'MB/s':>8} {'speedup':>8}")
+
+    for profile in FIELD_PROFILES:
+        payload = build_page(profile)
+        baseline = None
+        for name, codec in reversed(list(codecs.items())):
+            codec.loads(payload)  # warm up
+            start = time.perf_counter()
+            for _ in range(pages):
+                codec.loads(payload)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{profile:<8} {len(payload):>10} {name:<7} {elapsed / pages * 1e6:>9.1f} "
+                  f"{len(payload) * pages / elapsed / 1e6:>8.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark client read paths against a recorded cassette, offline.
+
+Re-issues every recorded request through XAPIClient (signing, response
+handling, JSON decoding) with responses served from the cassette, and
+reports the client-side cost per endpoint. Results are deterministic for
+a given cassette, so runs can be compared across changes.
+
+Record a cassette first by running any scripts with:
+    X_API_CASSETTE=/tmp/x.cassette.gz X_API_CASSETTE_MODE=record python3 scripts/...
+
+Usage: python3 bench_replay.py <cassette> [rounds] [--latency]
+
+Example:
+    python3 bench_replay.py /tmp/x.cassette.gz 200
+"""
+
+import sys
+import os
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from x_api_client import XAPIClient, XAPIClientError, endpoint_group, percentile
+from cassette import install
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--latency"]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    path = args[0]
+    rounds = int(args[1]) if len(args) > 1 else 100
+
+    # Credentials are only used to sign; replayed responses never reach the network
+    client = XAPIClient("replay", "replay", "replay", "replay")
+    # Measure the client itself: recorded 429s/5xx must not trip breakers or shrink limits
+    client.adaptive_concurrency = False
+    cassette = install(client, path, mode="replay", simulate_latency="--latency" in sys.argv)
+    recorded = [entry for entry in cassette.entries() if "files" not in (entry["body"] or {})]
+
+    timings = {}
+    sizes = {}
+    for entry in recorded:
+        group = endpoint_group(entry['method'], entry['path'])
+        sizes.setdefault(group, []).append(len(entry.get("content", "")))
+
+    for _ in range(rounds):
+        for entry in recorded:
+            group = endpoint_group(entry['method'], entry['path'])
+            params = {}
+            for key, value in entry["query"]:
+                params[key] = value
+            body = entry["body"] if entry["method"] != "GET" else None
+            start = time.perf_counter()
+            try:
+                client.request(entry["method"], entry["path"], params=params or None, data=body)
+            except XAPIClientError:
+                pass  # Recorded errors are part of the workload
+            timings.setdefault(group, []).append(time.perf_counter() - start)
+
+    print(f"\nReplayed {len(recorded)} recorded requests x {rounds} rounds "
+          f"(codec: {client.codec.name})\n")
+    print(f"{'endpoint':<55} {'calls':>7} {'bytes':>9} {'p50 us':>9} {'p99 us':>9}")
+    for group in sorted(timings):
+        values = timings[group]
+        mean_size = sum(sizes[group]) // len(sizes[group])
+        print(f"{group:<55} {len(values):>7} {mean_size:>9} "
+              f"{percentile(values, 0.5) * 1e6:>9.1f} {percentile(values, 0.99) * 1e6:>9.1f}")
+    print(f"\nCassette: {cassette.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark SeenFilter memory and throughput against a plain set.
+
+Inserts N distinct tweet-like IDs, then measures lookups of seen IDs,
+lookups of unseen IDs (reporting the observed false positive rate) and
+the save/load round trip. Set memory is measured with tracemalloc on up to
+2M IDs and extrapolated beyond that.
+
+Usage: python3 bench_seen_filter.py [ids] [error_rate]
+
+Example:
+    python3 bench_seen_filter.py 10000000 0.001
+"""
+
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from seen_filter import SeenFilter
+
+
+_BASE_ID = 1800000000000000000
+_SET_SAMPLE = 2_000_000
+
+
+def _ids(start: int, count: int):
+    # Spread like real snowflakes: increasing, with gaps
+    return (str(_BASE_ID + (start + i) * 4099) for i in range(count))
+
+
+def _rate(count: int, elapsed: float) -> str:
+    return f"{count / elapsed / 1000:>8.0f}k/s"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    error_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.001
+    probes = min(count, 200_000)
+
+    print(f"\n{count:,} IDs, target false positive rate {error_rate}\n")
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.bin")
+    seen = SeenFilter(path=path, capacity=count, error_rate=error_rate)
+
+    start = time.perf_counter()
+    for tweet_id in _ids(0, count):
+        seen.add(tweet_id)
+    insert_time = time.perf_counter() - start
+
+    # Probe IDs older than the exact window so the Bloom filters are exercised
+    start = time.perf_counter()
+    hits = sum(1 for tweet_id in _ids(0, probes) if tweet_id in seen)
+    seen_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    false_positives = sum(1 for tweet_id in _ids(count, probes) if tweet_id in seen)
+    unseen_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    seen.save()
+    save_time = time.perf_counter() - start
+    start = time.perf_counter()
+    SeenFilter(path=path, capacity=count, error_rate=error_rate)
+    load_time = time.perf_counter() - start
+
+    sample = min(count, _SET_SAMPLE)
+    tracemalloc.start()
+    plain = set(_ids(0, sample))
+    set_bytes = tracemalloc.get_traced_memory()[0] * count / sample
+    tracemalloc.stop()
+    start = time.perf_counter()
+    sum(1 for tweet_id in _ids(0, probes) if tweet_id in plain)
+    set_lookup_time = time.perf_counter() - start
+    del plain
+
+    print(f"{'':<22} {'SeenFilter':>14} {'set':>14}")
+    print(f"{'memory':<22} {seen.memory_bytes() / 1e6:>11.1f} MB {set_bytes / 1e6:>11.1f} MB"
+          f"{' (extrapolated)' if sample < count else ''}")
+    print(f"{'inserts':<22} {_rate(count, insert_time):>14}")
+    print(f"{'lookups (seen)':<22} {_rate(probes, seen_time):>14} {_rate(probes, set_lookup_time):>14}")
+    print(f"{'lookups (unseen)':<22} {_rate(probes, unseen_time):>14}")
+    print(f"\nSeen IDs found: {hits}/{probes} | false positives: {false_positives}/{probes} "
+          f"({false_positives / probes:.5f})")
+    print(f"State file: {os.path.getsize(path) / 1e6:.1f} MB, save {save_time:.2f}s, load {load_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
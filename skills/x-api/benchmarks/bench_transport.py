@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Compare HTTP transports: throughput and tail latency at several concurrency levels.
+
+For each transport and concurrency level, one shared client is driven by N
+threads issuing requests back to back for a fixed time. Adaptive
+concurrency and GET coalescing are turned off (and every query is unique)
+so that only the transport is measured.
+
+The target is a local mock server (see mock_server.py) started in a
+subprocess, or any server given with X_API_BASE_URL. The mock is plain http:
+there the http2 transport (ALPN) falls back to HTTP/1.1 over its shared
+pool, while h2c speaks HTTP/2 by prior knowledge and so measures
+multiplexing (the mock needs the h2 package for that). The protocol each
+transport actually used is reported.
+
+Usage: python3 bench_transport.py [concurrency[,...]] [seconds] [transports] [op] [latency_ms]
+
+    concurrency  Threads sharing one client (default: 1,8,32,64)
+    seconds      Duration of each run (default: 5)
+    transports   Comma-separated: requests, httpx, http2, h2c (default: all installed)
+    op           search (100-tweet page), like (small POST) (default: search)
+    latency_ms   Mock server latency (default: 50)
+
+Examples:
+    python3 bench_transport.py
+    python3 bench_transport.py 16,128 10 requests,h2c like 20
+"""
+
+import sys
+import os
+import itertools
+import threading
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from x_api_client import XAPIClient, XAPIClientError, TRANSPORTS, make_transport, percentile
+from load_test import start_mock_server
+
+
+_counter = itertools.count()
+
+OPERATIONS = {
+    "search": lambda client: client.search_tweets(f"#python {next(_counter)}", max_results=100,
+                                                  fields="full"),
+    "like": lambda client: client.like_post(str(1800000000000000000 + next(_counter))),
+}
+
+
+def protocol(transport, base_url: str) -> str:
+    """HTTP version a transport negotiates with the server."""
+    response = transport.send("GET", f"{base_url}/2/users/me", headers={}, timeout=10)
+    return getattr(response, "http_version", None) or "HTTP/1.1"
+
+
+def run(base_url: str, transport_name: str, concurrency: int, seconds: float, op: str) -> dict:
+    """Drive one shared client from `concurrency` threads; returns the summary row."""
+    transport = make_transport(transport_name)
+    client = XAPIClient("bench", "bench", "bench", "bench", base_url=base_url, transport=transport)
+    client.adaptive_concurrency = False
+    operation = OPERATIONS[op]
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local = []
+        failed = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                operation(client)
+            except XAPIClientError:
+                failed += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    try:
+        version = protocol(transport, base_url)
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+    finally:
+        transport.close()
+
+    return {
+        "transport": transport_name,
+        "protocol": version,
+        "concurrency": concurrency,
+        "ops": len(latencies),
+        "throughput": len(latencies) / wall,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "errors": errors[0],
+    }
+
+
+def available_transports():
+    names = []
+    for name in TRANSPORTS:
+        try:
+            make_transport(name).close()
+        except XAPIClientError:
+            continue
+        names.append(name)
+    return names
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help"):
+        print(__doc__)
+        sys.exit(1)
+
+    levels = [int(value) for value in (sys.argv[1] if len(sys.argv) > 1 else "1,8,32,64").split(",")]
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    names = sys.argv[3].split(",") if len(sys.argv) > 3 else available_transports()
+    op = sys.argv[4] if len(sys.argv) > 4 else "search"
+    latency_ms = float(sys.argv[5]) if len(sys.argv) > 5 else 50
+    if op not in OPERATIONS:
+        print(f"Error: Unknown operation: {op} (choose from {', '.join(OPERATIONS)})")
+        sys.exit(1)
+
+    process = None
+    base_url = os.getenv("X_API_BASE_URL")
+    if not base_url:
+        process, base_url = start_mock_server(latency_ms, 0, 0.0)
+
+    print(f"Target: {base_url} | op: {op} | {seconds:.0f}s per run")
+    print(f"\n{'transport':<10} {'protocol':<9} {'threads':>7} {'ops':>8} {'ops/s':>9} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    try:
+        for name in names:
+            for concurrency in levels:
+                try:
+                    row = run(base_url, name, concurrency, seconds, op)
+                except XAPIClientError as e:
+                    print(f"{name:<10} Error: {e}")
+                    break
+                print(f"{row['transport']:<10} {row['protocol']:<9} {row['concurrency']:>7} "
+                      f"{row['ops']:>8} {row['throughput']:>9.1f} {row['p50'] * 1000:>8.1f} "
+                      f"{row['p99'] * 1000:>8.1f} {row['errors']:>7}", flush=True)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Load test the client with many concurrent simulated agents.
+
+Each agent runs its own XAPIClient (as separate agent processes would) in a
+thread, picking operations from a weighted mix as fast as responses come
+back. The target is a local mock server (see mock_server.py) started in a
+subprocess, or any server given with X_API_BASE_URL.
+
+For each agent count the report gives throughput, p50/p95/p99 latency per
+operation, error and 429 rates, and client CPU time and peak memory.
+
+Usage: python3 load_test.py <agents[,agents...]> [seconds] [mix] [latency_ms] [rate_limit] [error_rate]
+
+    agents      Concurrent agents; a comma-separated list runs one test per count
+    seconds     Duration of each test (default: 10)
+    mix         read, write, mixed (default) or weights like "search=5,post=1"
+    latency_ms, rate_limit, error_rate
+                Passed to the mock server (defaults: 50, 0, 0)
+
+Operations: search, timeline, user_posts, lookup, like, post, dm
+
+Examples:
+    python3 load_test.py 1,4,16,64 10 mixed
+    python3 load_test.py 32 30 read 80 300 0.01
+"""
+
+import sys
+import os
+import random
+import resource
+import subprocess
+import threading
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from x_api_client import XAPIClient, XAPIClientError, XAPIRateLimitError, XAPIConnectionError, percentile
+
+
+MIXES = {
+    "read": {"search": 4, "timeline": 3, "user_posts": 2, "lookup": 1},
+    "write": {"post": 4, "like": 4, "dm": 2},
+    "mixed": {"search": 3, "timeline": 2, "user_posts": 1, "lookup": 1, "like": 1, "post": 1, "dm": 1},
+}
+
+_LOOKUP_IDS = [str(1800000000000000000 + i) for i in range(100)]
+
+OPERATIONS = {
+    "search": lambda client, rng: client.search_tweets("#python", max_results=100, fields="full"),
+    "timeline": lambda client, rng: client.get_timeline(count=50),
+    "user_posts": lambda client, rng: client.get_user_posts(rng.choice(["nasa", "esa", "github"]),
+                                                           max_results=20),
+    "lookup": lambda client, rng: client.get_tweets(_LOOKUP_IDS, tweet_fields="public_metrics"),
+    "like": lambda client, rng: client.like_post(str(1800000000000000000 + rng.randrange(10**6))),
+    "post": lambda client, rng: client.post_tweet(f"Load test {rng.random():.12f}"),
+    "dm": lambda client, rng: client.send_dm("loadtarget", "Load test message"),
+}
+
+
+def parse_mix(value: str) -> dict:
+    """Parse a named mix or "op=weight,..." weights."""
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {name} (choose from {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def start_mock_server(latency_ms: float, rate_limit: int, error_rate: float):
+    """Start mock_server.py in a subprocess; returns (process, base_url)."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_server.py")
+    process = subprocess.Popen(
+        [sys.executable, path, "0", str(latency_ms), str(rate_limit), str(error_rate)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline().strip()
+    if not line.startswith("listening on "):
+        process.kill()
+        raise RuntimeError(f"Mock server failed to start: {line}")
+    return process, line[len("listening on "):]
+
+
+def run_agents(base_url: str, agents: int, seconds: float, mix: dict) -> dict:
+    """Run one load test; returns samples and resource use."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = []  # (operation, latency, outcome)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def agent(index: int):
+        rng = random.Random(index)
+        client = XAPIClient("load", "load", "load", "load", base_url=base_url)
+        local = []
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                OPERATIONS[name](client, rng)
+                outcome = "ok"
+            except XAPIRateLimitError:
+                outcome = "429"
+            except XAPIConnectionError:
+                outcome = "connection"
+            except XAPIClientError:
+                outcome = "error"
+            local.append((name, time.perf_counter() - start, outcome))
+        with lock:
+            samples.extend(local)
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=agent, args=(i,)) for i in range(agents)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    return {
+        "agents": agents,
+        "wall": wall,
+        "samples": samples,
+        "cpu": cpu,
+        "max_rss_mb": usage_after.ru_maxrss / 1024,  # ru_maxrss is in KB on Linux
+    }
+
+
+def report(result: dict) -> dict:
+    """Print one test's results; returns its summary row."""
+    samples = result["samples"]
+    wall = result["wall"]
+    latencies = [latency for _, latency, _ in samples]
+    count = len(samples) or 1
+    rate_limited = sum(1 for _, _, outcome in samples if outcome == "429")
+    errors = sum(1 for _, _, outcome in samples if outcome in ("error", "connection"))
+
+    print(f"\n{result['agents']} agent(s), {wall:.1f}s: {len(samples)} ops, "
+          f"{len(samples) / wall:.1f} ops/s, CPU {result['cpu']:.2f}s "
+          f"({result['cpu'] / wall * 100:.0f}% of one core), max RSS {result['max_rss_mb']:.0f} MB")
+    print(f"   {'operation':<11} {'ops':>7} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'err %':>6} {'429 %':>6}")
+    for name in sorted({name for name, _, _ in samples}):
+        rows = [(latency, outcome) for op, latency, outcome in samples if op == name]
+        values = [latency for latency, _ in rows]
+        op_errors = sum(1 for _, outcome in rows if outcome in ("error", "connection"))
+        op_limited = sum(1 for _, outcome in rows if outcome == "429")
+        print(f"   {name:<11} {len(rows):>7} {len(rows) / wall:>8.1f} "
+              f"{percentile(values, 0.50) * 1000:>8.1f} {percentile(values, 0.95) * 1000:>8.1f} "
+              f"{percentile(values, 0.99) * 1000:>8.1f} {op_errors * 100 / len(rows):>6.1f} "
+              f"{op_limited * 100 / len(rows):>6.1f}")
+
+    return {
+        "agents": result["agents"],
+        "throughput": len(samples) / wall,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "error_rate": errors / count,
+        "rate_limited": rate_limited / count,
+        "cpu": result["cpu"] / wall,
+    }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    agent_counts = [int(value) for value in sys.argv[1].split(",")]
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    mix_name = sys.argv[3] if len(sys.argv) > 3 else "mixed"
+    latency_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 50
+    rate_limit = int(sys.argv[5]) if len(sys.argv) > 5 else 0
+    error_rate = float(sys.argv[6]) if len(sys.argv) > 6 else 0.0
+
+    try:
+        mix = parse_mix(mix_name)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    process = None
+    base_url = os.getenv("X_API_BASE_URL")
+    if not base_url:
+        process, base_url = start_mock_server(latency_ms, rate_limit, error_rate)
+
+    try:
+        print(f"Target: {base_url} | mix: {mix_name} | {seconds:.0f}s per test")
+        rows = [report(run_agents(base_url, agents, seconds, mix)) for agents in agent_counts]
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(f"\n{'agents':>6} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'err %':>6} {'429 %':>6} {'cpu %':>6}")
+    for row in rows:
+        print(f"{row['agents']:>6} {row['throughput']:>9.1f} {row['p50'] * 1000:>8.1f} "
+              f"{row['p95'] * 1000:>8.1f} {row['p99'] * 1000:>8.1f} {row['error_rate'] * 100:>6.1f} "
+              f"{row['rate_limited'] * 100:>6.1f} {row['cpu'] * 100:>6.0f}")
+
+
+if __name__ == "__main__":
+    main()
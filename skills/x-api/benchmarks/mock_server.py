@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Local mock of the X API v2 endpoints used by the client, for load tests.
+
+Serves realistic payloads (100-tweet pages with includes, user objects,
+post/like/DM responses, quote tweets, retweeters and likers),
+x-rate-limit-* headers, and optional latency, per-endpoint rate limits and
+injected 5xx errors. Paginated results page forever by default, or end
+after a set number of pages.
+Signatures are not checked. Speaks HTTP/1.1, and HTTP/2 over cleartext
+with prior knowledge (h2c, as the client's h2c transport does) on the same
+port when the h2 package is installed.
+
+Prints "listening on http://host:port" once ready.
+
+Usage: python3 mock_server.py [port] [latency_ms] [rate_limit] [error_rate] [pages]
+
+    port        0 picks a free port (default: 0)
+    latency_ms  Mean added latency, +/-50% jitter (default: 50)
+    rate_limit  Requests per endpoint per 15 minute window; 0 disables (default: 0)
+    error_rate  Fraction of requests answered with 503 (default: 0)
+    pages       Pages per paginated result; 0 never ends (default: 0)
+
+Example:
+    python3 mock_server.py 8400 80 300 0.01
+    X_API_BASE_URL=http://127.0.0.1:8400 python3 ../scripts/search_tweets.py "#python"
+"""
+
+import sys
+import os
+import json
+import random
+import re
+import socket
+import threading
+import time
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    h2 = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_codec import build_page
+
+
+RATE_LIMIT_WINDOW = 15 * 60
+
+_ID_PATTERN = re.compile(r"/\d{3,}")
+
+# First bytes of an HTTP/2 connection started with prior knowledge
+_H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+def _user(username: str, user_id: int) -> dict:
+    return {
+        "id": str(user_id), "name": username.title(), "username": username,
+        "created_at": "2015-03-01T10:00:00.000Z", "description": "Mock account",
+        "verified": False, "protected": False,
+        "public_metrics": {"followers_count": 12000, "following_count": 300,
+                           "tweet_count": 4500, "listed_count": 40, "like_count": 9000},
+    }
+
+
+class MockXServer:
+    """Threaded mock X API server."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05,
+                 rate_limit: int = 0, error_rate: float = 0.0, window: float = RATE_LIMIT_WINDOW,
+                 pages: int = 0):
+        """
+        Args:
+            host: Interface to bind
+            port: Port (0 picks a free one)
+            latency: Mean added latency in seconds (+/-50% jitter)
+            rate_limit: Requests per endpoint per window (0 disables)
+            error_rate: Fraction of requests answered with 503
+            window: Rate limit window in seconds
+            pages: Pages per paginated result (0: every page has a next_token)
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.window = window
+        self.pages = pages
+        self._lock = threading.Lock()
+        self._windows = {}  # endpoint group -> (window start, count)
+        self._pages = {}  # (profile, size) -> encoded page
+        self._next_id = 1900000000000000000
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Headers and body are separate writes
+
+            def log_message(self, *args):
+                pass
+
+            def handle(self):
+                if h2 is not None:
+                    preface = self.connection.recv(len(_H2_PREFACE), socket.MSG_PEEK | socket.MSG_WAITALL)
+                    if preface == _H2_PREFACE:
+                        server._serve_h2(self.connection)
+                        return
+                super().handle()
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def do_DELETE(self):
+                server._handle(self, "DELETE")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockXServer":
+        """Serve in a background thread."""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _new_id(self) -> str:
+        with self._lock:
+            self._next_id += 1
+            return str(self._next_id)
+
+    def _users_page(self, query: dict) -> dict:
+        """Retweeters/likers: follower counts spread over 10 to 10M."""
+        size = min(100, max(1, int(query.get("max_results", 100))))
+        token = query.get("pagination_token") or ""
+        index = int(token[1:]) if token[1:].isdigit() else 0
+        users = []
+        for i in range(size):
+            n = index * size + i
+            user = _user(f"engager{n}", 3000000 + n)
+            user["public_metrics"]["followers_count"] = 10 ** (1 + n % 7) + n
+            users.append(user)
+        page = {"data": users, "meta": {"result_count": size}}
+        if not self.pages or index + 1 < self.pages:
+            page["meta"]["next_token"] = f"p{index + 1}"
+        return page
+
+    def _page(self, query: dict) -> bytes:
+        size = min(100, max(1, int(query.get("max_results", 10))))
+        if "expansions" in query:
+            profile = "full"
+        elif "public_metrics" in query.get("tweet.fields", ""):
+            profile = "metrics"
+        else:
+            profile = "minimal"
+        key = (profile, size)
+        if key not in self._pages:
+            self._pages[key] = build_page(profile, size)
+        if not self.pages:
+            return self._pages[key]
+
+        # Finite pagination: tokens p1, p2, ... with older IDs on every page
+        token = query.get("next_token") or query.get("pagination_token") or ""
+        index = int(token[1:]) if token[1:].isdigit() else 0
+        page = json.loads(self._pages[key])
+        for tweet in page["data"]:
+            tweet["id"] = str(int(tweet["id"]) - (index + 1) * 1000)
+        page["meta"].update(newest_id=page["data"][0]["id"], oldest_id=page["data"][-1]["id"])
+        if index + 1 < self.pages:
+            page["meta"]["next_token"] = f"p{index + 1}"
+        else:
+            del page["meta"]["next_token"]
+        return page
+
+    def _rate_limit(self, group: str):
+        """Count a request; returns (limited, remaining, reset_at)."""
+        now = time.time()
+        with self._lock:
+            started, count = self._windows.get(group, (now, 0))
+            if now - started >= self.window:
+                started, count = now, 0
+            count += 1
+            self._windows[group] = (started, count)
+        reset_at = int(started + self.window)
+        if not self.rate_limit:
+            return False, None, reset_at
+        return count > self.rate_limit, max(0, self.rate_limit - count), reset_at
+
+    def _route(self, method: str, path: str, query: dict, body: bytes):
+        """Build (status, payload) for a request."""
+        if method == "GET":
+            if path == "/2/users/me":
+                return 200, {"data": _user("me", 1000)}
+            match = re.fullmatch(r"/2/users/by/username/(\w+)", path)
+            if match:
+                return 200, {"data": _user(match.group(1), 2000 + len(match.group(1)))}
+            if path == "/2/users/by":
+                names = query.get("usernames", "").split(",")
+                return 200, {"data": [_user(name, 2000 + i) for i, name in enumerate(names) if name]}
+            if path == "/2/tweets":
+                ids = query.get("ids", "").split(",")
+                return 200, {"data": [{"id": tweet_id, "text": "Mock tweet",
+                                       "public_metrics": {"like_count": 10, "retweet_count": 2,
+                                                          "reply_count": 1, "quote_count": 0}}
+                                      for tweet_id in ids if tweet_id]}
+            if path == "/2/tweets/search/recent" or re.fullmatch(
+                r"/2/(users/\d+/(tweets|timelines/reverse_chronological)|tweets/\d+/quote_tweets)", path
+            ):
+                return 200, self._page(query)
+            if re.fullmatch(r"/2/tweets/\d+/(retweeted_by|liking_users)", path):
+                return 200, self._users_page(query)
+            if re.fullmatch(r"/2/dm_conversations/with/\d+/dm_events", path):
+                return 200, {"data": [], "meta": {"result_count": 0}}
+        elif method == "POST":
+            if path == "/2/tweets":
+                text = json.loads(body or b"{}").get("text", "")
+                return 201, {"data": {"id": self._new_id(), "text": text,
+                                      "edit_history_tweet_ids": []}}
+            if path == "/2/media/upload":
+                return 200, {"data": {"id": self._new_id(), "media_key": "3_mock"}}
+            if re.fullmatch(r"/2/users/\d+/likes", path):
+                return 200, {"data": {"liked": True}}
+            if re.fullmatch(r"/2/users/\d+/retweets", path):
+                return 200, {"data": {"retweeted": True}}
+            if re.fullmatch(r"/2/dm_conversations/with/\d+/messages", path):
+                return 201, {"data": {"dm_conversation_id": "1000-2000", "dm_event_id": self._new_id()}}
+        elif method == "DELETE" and re.fullmatch(r"/2/tweets/\d+", path):
+            return 200, {"data": {"deleted": True}}
+        return 404, {"title": "Not Found Error", "detail": f"No mock for {method} {path}"}
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        body = handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        status, headers, data = self._respond(method, handler.path, body)
+        handler.send_response(status)
+        for name, value in headers:
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _serve_h2(self, sock: socket.socket) -> None:
+        """Serve one h2c connection; each stream is answered from its own thread."""
+        conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        lock = threading.Condition()  # Guards conn and socket writes; notified on window updates
+        streams = {}  # stream ID -> (headers, body)
+        closed = threading.Event()
+
+        def send_pending():
+            pending = conn.data_to_send()
+            if pending:
+                sock.sendall(pending)
+
+        def respond(stream_id: int, headers: dict, body: bytes):
+            status, extra, data = self._respond(headers[":method"], headers[":path"], body)
+            with lock:
+                try:
+                    conn.send_headers(stream_id, [(":status", str(status))] + [
+                        (name.lower(), value) for name, value in extra])
+                    send_pending()
+                    while data:
+                        # Wait for the client's flow control window to open
+                        while conn.local_flow_control_window(stream_id) <= 0 and not closed.is_set():
+                            lock.wait()
+                        size = min(len(data), conn.local_flow_control_window(stream_id),
+                                   conn.max_outbound_frame_size)
+                        conn.send_data(stream_id, data[:size])
+                        data = data[size:]
+                        send_pending()
+                    conn.end_stream(stream_id)
+                    send_pending()
+                except (h2.exceptions.H2Error, OSError):
+                    pass  # Stream reset or connection gone: nothing left to answer
+
+        with lock:
+            conn.initiate_connection()
+            send_pending()
+        while True:
+            try:
+                received = sock.recv(65536)
+            except OSError:
+                received = b""
+            with lock:
+                try:
+                    events = conn.receive_data(received) if received else []
+                except h2.exceptions.ProtocolError:
+                    received = b""  # Malformed input (e.g. a corrupt header block): drop the connection
+                if not received:
+                    closed.set()
+                    lock.notify_all()
+                    return
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        streams[event.stream_id] = (dict(event.headers), bytearray())
+                    elif isinstance(event, h2.events.DataReceived):
+                        streams[event.stream_id][1].extend(event.data)
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        headers, body = streams.pop(event.stream_id)
+                        threading.Thread(target=respond, args=(event.stream_id, headers, bytes(body)),
+                                         daemon=True).start()
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        lock.notify_all()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        closed.set()
+                        lock.notify_all()
+                        return
+                send_pending()
+
+    def _respond(self, method: str, target: str, body: bytes):
+        """Handle one request; returns (status, headers, body bytes)."""
+        parsed = urllib.parse.urlparse(target)
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+
+        if self.latency:
+            time.sleep(random.uniform(0.5, 1.5) * self.latency)
+
+        group = f"{method} {_ID_PATTERN.sub('/{id}', parsed.path)}"
+        limited, remaining, reset_at = self._rate_limit(group)
+        with self._lock:
+            self.stats["requests"] += 1
+
+        if limited:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            status, payload = 429, {"title": "Too Many Requests", "detail": "Too Many Requests"}
+        elif self.error_rate and random.random() < self.error_rate:
+            with self._lock:
+                self.stats["errors"] += 1
+            status, payload = 503, {"title": "Service Unavailable", "detail": "Mock outage"}
+        else:
+            status, payload = self._route(method, parsed.path, query, body)
+
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        headers = [("Content-Type", "application/json"), ("Content-Length", str(len(data)))]
+        if remaining is not None:
+            headers += [
+                ("x-rate-limit-limit", str(self.rate_limit)),
+                ("x-rate-limit-remaining", str(remaining)),
+                ("x-rate-limit-reset", str(reset_at)),
+            ]
+        return status, headers, data
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.05
+    rate_limit = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    error_rate = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+    pages = int(sys.argv[5]) if len(sys.argv) > 5 else 0
+
+    server = MockXServer(port=port, latency=latency, rate_limit=rate_limit, error_rate=error_rate,
+                         pages=pages)
+    print(f"listening on {server.url}", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Batch - Run a list of client calls in one process, with references between steps
+
+Each step is one JSON object naming an XAPIClient method:
+
+    {"op": "post_tweet", "args": {"text": "Launching today"}}
+    {"op": "post_reply", "args": {"text": "Details below", "parent_post_link": "$1.data.id"}}
+    {"op": "post_quote", "args": ["Worth a read", "$1.data.id"]}
+    {"op": "send_dm", "args": ["friend", "Live: https://x.com/i/status/${1.data.id}"]}
+
+"args" is a dict of keyword arguments or a list of positional ones. A step
+can reference a field of an earlier step's result by number ($1.data.id,
+$1 is the first step) or by its "id" field ($launch.data.id); ${...} also
+embeds a reference inside a longer string, and ${1} is a whole result. Other
+$ text ("$AAPL", "$5.99", or $name.field when no earlier step has that id)
+is left as it is, and $$ is a literal $. A reference to a whole string is
+replaced by the value itself, so IDs, lists and dicts keep their type.
+
+Steps run as soon as the steps they reference have finished, so independent
+steps run concurrently; "after": [2, "launch"] adds ordering without a
+reference. When a step fails, the steps that depend on it are skipped and
+the rest still run (or nothing new starts, with fail_fast).
+"""
+
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+try:
+    from .x_api_client import XAPIClient, XAPIClientError
+except ImportError:
+    from x_api_client import XAPIClient, XAPIClientError
+
+
+# $$, ${path}, or $key.field... where the first field starts with a letter
+# (so "$5.99" is not a reference)
+_REFERENCE = re.compile(
+    r"\$\$|\$\{([^}]+)\}|\$([A-Za-z0-9_]+\.[A-Za-z_][A-Za-z0-9_-]*(?:\.[A-Za-z0-9_-]+)*)"
+)
+
+# Public client methods a batch may call
+OPERATIONS = frozenset(
+    name for name in dir(XAPIClient)
+    if not name.startswith("_") and callable(getattr(XAPIClient, name))
+)
+
+
+class BatchStep:
+    """One parsed batch line."""
+
+    def __init__(self, number: int, spec: Dict[str, Any]):
+        self.number = number
+        self.name = spec.get("id")
+        self.op = spec.get("op") or spec.get("method")
+        self.args = spec.get("args", {})
+        self.after = [str(dep) for dep in spec.get("after", [])]
+        if self.op not in OPERATIONS:
+            raise XAPIClientError(f"Step {number}: unknown operation: {self.op}")
+        if not isinstance(self.args, (dict, list)):
+            raise XAPIClientError(f"Step {number}: args must be an object or a list")
+        found = set(_references(self.args))
+        # ${...} must name an earlier step; $key.field only counts if it does
+        self.explicit = sorted({key for key, braced in found if braced})
+        self.references = sorted({key for key, _ in found})  # Narrowed by parse_batch
+        self.dependencies: List[int] = []  # Step numbers, set by parse_batch
+
+
+def _references(value) -> Iterable[Tuple[str, bool]]:
+    """Step keys ("1", "launch") referenced anywhere in a value, and whether braced."""
+    if isinstance(value, str):
+        for match in _REFERENCE.finditer(value):
+            path = match.group(1) or match.group(2)
+            if path:
+                yield path.split(".")[0], bool(match.group(1))
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _references(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _references(item)
+
+
+def _lookup(path: str, results: Dict[str, Any]):
+    """Resolve "1.data.id" against finished results."""
+    key, *fields = path.split(".")
+    value = results[key]
+    for field in fields:
+        if isinstance(value, list) and field.lstrip("-").isdigit():
+            value = value[int(field)]
+        elif isinstance(value, dict) and field in value:
+            value = value[field]
+        else:
+            raise XAPIClientError(f"Reference ${path}: no {field!r} in step {key}'s result")
+    return value
+
+
+def _resolve(value, results: Dict[str, Any], references: List[str]):
+    """Substitute references in args with values from finished steps."""
+    if isinstance(value, dict):
+        return {key: _resolve(item, results, references) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results, references) for item in value]
+    if not isinstance(value, str) or "$" not in value:
+        return value
+
+    def is_reference(match) -> bool:
+        return bool(match.group(1)) or (
+            bool(match.group(2)) and match.group(2).split(".")[0] in references)
+
+    match = _REFERENCE.fullmatch(value)
+    if match and is_reference(match):
+        return _lookup(match.group(1) or match.group(2), results)
+
+    def replace(match):
+        if match.group() == "$$":
+            return "$"
+        if not is_reference(match):
+            return match.group()
+        return str(_lookup(match.group(1) or match.group(2), results))
+    return _REFERENCE.sub(replace, value)
+
+
+def parse_batch(lines: Iterable[str]) -> List[BatchStep]:
+    """
+    Parse JSONL batch lines (blank lines and lines starting with # are ignored).
+
+    Raises:
+        XAPIClientError: On invalid JSON, unknown operations, or references to
+            steps that do not come earlier
+    """
+    steps: List[BatchStep] = []
+    keys: Dict[str, int] = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        number = len(steps) + 1
+        try:
+            spec = json.loads(line)
+        except ValueError as e:
+            raise XAPIClientError(f"Step {number}: invalid JSON: {e}")
+        step = BatchStep(number, spec)
+        for key in step.explicit + step.after:
+            if key not in keys:
+                raise XAPIClientError(f"Step {number}: ${key} does not name an earlier step")
+        step.references = [key for key in step.references if key in keys]
+        keys[str(number)] = number
+        if step.name:
+            if step.name in keys:
+                raise XAPIClientError(f"Step {number}: duplicate id {step.name!r}")
+            keys[step.name] = number
+        step.dependencies = sorted({keys[key] for key in step.references + step.after})
+        steps.append(step)
+    return steps
+
+
+def _jsonable(result):
+    """Materialize generator results (e.g. *_pages methods) so they can be referenced."""
+    if result is None or isinstance(result, (str, int, float, bool, dict, list)):
+        return result
+    if hasattr(result, "__iter__"):
+        return list(result)
+    return str(result)
+
+
+def run_batch(client, steps: List[BatchStep], max_workers: int = 8, fail_fast: bool = False,
+              on_result=None) -> List[Dict[str, Any]]:
+    """
+    Run batch steps, each as soon as the steps it depends on have finished.
+
+    Args:
+        client: XAPIClient (shared by all steps)
+        steps: Parsed steps (parse_batch)
+        max_workers: Maximum steps running at once
+        fail_fast: After a failure, start no new steps
+        on_result: Called with each step's outcome, in step order, as soon as
+            it and every earlier step are done
+
+    Returns:
+        Per step, in order: {"step", "id", "op", "status", "result", "error", "seconds"};
+        status is "ok", "error" or "skipped"
+    """
+    outcomes: Dict[int, Dict[str, Any]] = {}
+    results: Dict[str, Any] = {}  # step number and id -> result
+    pending = list(steps)
+    running: Dict[Any, BatchStep] = {}
+    emitted = 0
+    failed = False
+
+    def call(step: BatchStep, args):
+        method = getattr(client, step.op)
+        started = time.perf_counter()
+        result = method(**args) if isinstance(args, dict) else method(*args)
+        return _jsonable(result), time.perf_counter() - started
+
+    def finish(step: BatchStep, status: str, result=None, error: Optional[str] = None, seconds: float = 0.0):
+        outcomes[step.number] = {
+            "step": step.number, "id": step.name, "op": step.op, "status": status,
+            "result": result, "error": error, "seconds": round(seconds, 3),
+        }
+        if status == "ok":
+            results[str(step.number)] = result
+            if step.name:
+                results[step.name] = result
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for step in list(pending):
+                states = [outcomes.get(dep, {}).get("status") for dep in step.dependencies]
+                if any(state in ("error", "skipped") for state in states):
+                    pending.remove(step)
+                    blocked = [str(dep) for dep, state in zip(step.dependencies, states) if state != "ok"]
+                    finish(step, "skipped", error=f"Depends on failed step {', '.join(blocked)}")
+                elif failed and fail_fast:
+                    pending.remove(step)
+                    finish(step, "skipped", error="Batch stopped after a failure")
+                elif all(state == "ok" for state in states) and len(running) < max_workers:
+                    pending.remove(step)
+                    try:
+                        args = _resolve(step.args, results, step.references)
+                    except XAPIClientError as e:
+                        finish(step, "error", error=str(e))
+                        failed = True
+                        continue
+                    running[pool.submit(call, step, args)] = step
+
+            if running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        result, seconds = future.result()
+                    except TypeError as e:
+                        finish(step, "error", error=f"Invalid arguments: {e}")
+                        failed = True
+                    except Exception as e:
+                        finish(step, "error", error=str(e) or type(e).__name__)
+                        failed = True
+                    else:
+                        finish(step, "ok", result=result, seconds=seconds)
+
+            while emitted < len(steps) and steps[emitted].number in outcomes:
+                if on_result:
+                    on_result(outcomes[steps[emitted].number])
+                emitted += 1
+
+    return [outcomes[step.number] for step in steps]
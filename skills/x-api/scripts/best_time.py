@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Best Time - When do your posts get the most engagement?
+
+Pulls a user's post history (get_user_posts pages, the latest 3200 posts)
+and aggregates engagement by hour of week:
+
+    - each post is scored with the x-write weights
+      (20 x replies + 15 x retweets + 15 x quotes + 10 x likes)
+    - posts count only once they are past the 48h decay window, when
+      their metrics have settled; younger posts are picked up by a later run
+    - older posts weigh less (half-life of `half_life_days`, default 90),
+      so the schedule follows recent behaviour
+    - slot scores are means of log(1 + score), so one viral post does not
+      decide a slot, shrunk towards the overall mean for slots with few posts
+
+Aggregates are kept per 30-minute UTC slot in <data dir>/best_time/<user>.json
+(X_API_DATA_DIR, default ~/.x-api); reruns only fetch and add posts newer
+than the last settled one. numpy is used for the aggregation when
+installed, with a pure Python fallback.
+"""
+
+import json
+import math
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .x_api_client import XAPIClientError, get_data_dir, snowflake_time
+except ImportError:
+    from x_api_client import XAPIClientError, get_data_dir, snowflake_time
+
+
+SCORE_WEIGHTS = {"reply_count": 20, "retweet_count": 15, "quote_count": 15, "like_count": 10}
+SETTLE_SECONDS = 48 * 3600
+SLOTS = 7 * 48  # 30-minute slots per week, Monday 00:00 UTC first
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# Pseudo-count of posts at the overall mean added to every slot
+_PRIOR_POSTS = 3.0
+
+
+def engagement_score(metrics: Dict[str, int]) -> float:
+    """x-write engagement score of a post's public_metrics."""
+    return float(sum(weight * metrics.get(name, 0) for name, weight in SCORE_WEIGHTS.items()))
+
+
+def week_slot(timestamp: float) -> int:
+    """30-minute slot of the week (0 = Monday 00:00-00:30 UTC)."""
+    # The Unix epoch was a Thursday: shift so weeks start on Monday
+    return int((timestamp + 3 * 86400) // 1800) % SLOTS
+
+
+def _bincount(slots: List[int], values: List[float]) -> List[float]:
+    """Sum values per slot (pure Python np.bincount)."""
+    totals = [0.0] * SLOTS
+    for slot, value in zip(slots, values):
+        totals[slot] += value
+    return totals
+
+
+def _aggregate(timestamps: List[float], scores: List[float], now: float, half_life: float) -> Dict[str, List[float]]:
+    """Per-slot post counts, recency weights, and weighted sums of log scores."""
+    if np is not None:
+        ts = np.asarray(timestamps, dtype=np.float64)
+        slots = ((ts + 3 * 86400) // 1800).astype(np.int64) % SLOTS
+        weights = np.exp2(-(now - ts) / half_life)
+        logs = np.log1p(np.asarray(scores, dtype=np.float64))
+        count = lambda values: np.bincount(slots, weights=values, minlength=SLOTS).tolist()
+        return {
+            "posts": count(np.ones_like(ts)),
+            "weight": count(weights),
+            "sum": count(weights * logs),
+        }
+    slots = [week_slot(t) for t in timestamps]
+    weights = [2 ** (-(now - t) / half_life) for t in timestamps]
+    logs = [math.log1p(s) for s in scores]
+    return {
+        "posts": _bincount(slots, [1.0] * len(slots)),
+        "weight": _bincount(slots, weights),
+        "sum": _bincount(slots, [w * x for w, x in zip(weights, logs)]),
+    }
+
+
+class BestTimeAnalyzer:
+    """
+    Incrementally maintained engagement-by-time-of-week aggregates for one account.
+
+    Example:
+        analyzer = BestTimeAnalyzer("myhandle")
+        analyzer.update(client)
+        for slot in analyzer.schedule(posts_per_week=7, utc_offset=5.5):
+            print(slot["day"], slot["time"], slot["lift"])
+    """
+
+    def __init__(self, username: str, path: Optional[str] = None, half_life_days: float = 90,
+                 include_replies: bool = False):
+        """
+        Args:
+            username: X handle (with or without @)
+            path: Cache file (default: <data dir>/best_time/<username>.json)
+            half_life_days: Age at which a post counts half as much
+            include_replies: Count replies as well as original posts
+        """
+        self.username = username.lstrip("@")
+        self.path = Path(path) if path else get_data_dir() / "best_time" / f"{self.username.lower()}.json"
+        self.half_life = half_life_days * 86400
+        self.include_replies = include_replies
+        self.as_of = 0.0
+        self.newest_id: Optional[str] = None
+        # Range still to fetch when a sync was cut short by max_pages: {"since_id", "until_id"}
+        self.pending: Optional[Dict[str, Optional[str]]] = None
+        self.totals = {name: [0.0] * SLOTS for name in ("posts", "weight", "sum")}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("half_life") != self.half_life or state.get("include_replies") != self.include_replies:
+            # Aggregated with other settings: rebuild from scratch
+            return
+        self.as_of = state["as_of"]
+        self.newest_id = state["newest_id"]
+        self.pending = state.get("pending")
+        self.totals = state["totals"]
+
+    def save(self) -> None:
+        """Write the aggregates (atomically) to the cache file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "username": self.username,
+                "half_life": self.half_life,
+                "include_replies": self.include_replies,
+                "as_of": self.as_of,
+                "newest_id": self.newest_id,
+                "pending": self.pending,
+                "totals": self.totals,
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def add_posts(self, posts: List[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """
+        Add settled posts to the aggregates (younger ones are skipped).
+
+        Args:
+            posts: Posts with id, created_at and public_metrics
+            now: Current time (default: time.time())
+
+        Returns:
+            Number of posts added
+        """
+        return self._add_posts(posts, now, self.newest_id)
+
+    def _add_posts(self, posts: List[Dict[str, Any]], now: Optional[float], after_id: Optional[str]) -> int:
+        """add_posts, skipping posts up to after_id (already aggregated)."""
+        now = time.time() if now is None else now
+        timestamps, scores = [], []
+        for post in posts:
+            if after_id is not None and int(post["id"]) <= int(after_id):
+                continue
+            created = post.get("created_at")
+            timestamp = (datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp()
+                         if created else snowflake_time(post["id"]))
+            if now - timestamp < SETTLE_SECONDS or "public_metrics" not in post:
+                continue
+            timestamps.append(timestamp)
+            scores.append(engagement_score(post["public_metrics"]))
+            if self.newest_id is None or int(post["id"]) > int(self.newest_id):
+                self.newest_id = post["id"]
+        if not timestamps:
+            return 0
+
+        # Age the existing weights to the new reference time, then add the new posts
+        decay = 2 ** (-(now - self.as_of) / self.half_life) if self.as_of else 1.0
+        added = _aggregate(timestamps, scores, now, self.half_life)
+        for name, values in added.items():
+            factor = 1.0 if name == "posts" else decay
+            self.totals[name] = [old * factor + new for old, new in zip(self.totals[name], values)]
+        self.as_of = now
+        return len(timestamps)
+
+    def update(self, client, max_pages: Optional[int] = None) -> int:
+        """
+        Fetch posts newer than the last settled one and add them.
+
+        When max_pages stops a sync before it reaches the last settled post
+        (or the end of the history), the range of older posts left over is
+        kept in the cache and the next update continues paging backwards
+        through it before fetching newer posts.
+
+        Args:
+            client: XAPIClient
+            max_pages: Stop after this many pages of 100
+
+        Returns:
+            Number of posts added
+        """
+        exclude = ["retweets"] if self.include_replies else ["retweets", "replies"]
+        if self.pending:
+            since_id, until_id = self.pending["since_id"], self.pending["until_id"]
+        else:
+            since_id, until_id = self.newest_id, None
+
+        fetched = []
+        next_token = None
+        for page in client.get_user_posts_pages(self.username, since_id=since_id, until_id=until_id,
+                                                fields="metrics", exclude=exclude, max_pages=max_pages):
+            fetched.extend(page["data"])
+            next_token = page["meta"].get("next_token")
+        # Everything between since_id and until_id is new: newest_id may already be past it
+        added = self._add_posts(fetched, None, since_id)
+        if next_token and fetched:
+            self.pending = {"since_id": since_id, "until_id": min((post["id"] for post in fetched), key=int)}
+        else:
+            self.pending = None
+        self.save()
+        return added
+
+    def _slot_scores(self, utc_offset: float) -> List[Dict[str, Any]]:
+        """Shrunk mean log score per local 30-minute slot."""
+        totals = self.totals
+        total_weight = sum(totals["weight"])
+        if not total_weight:
+            return []
+        overall = sum(totals["sum"]) / total_weight
+        # Prior strength in weight units: _PRIOR_POSTS average-weight posts
+        prior = _PRIOR_POSTS * total_weight / max(1.0, sum(totals["posts"]))
+        shift = int(round(utc_offset * 2))
+        rows = []
+        for slot in range(SLOTS):
+            local = (slot + shift) % SLOTS
+            weight = totals["weight"][slot]
+            score = (totals["sum"][slot] + prior * overall) / (weight + prior)
+            rows.append({
+                "slot": local,
+                "posts": int(round(totals["posts"][slot])),
+                "score": score,
+                "lift": math.expm1(score) / math.expm1(overall) if overall > 0 else 1.0,
+            })
+        rows.sort(key=lambda row: row["slot"])
+        return rows
+
+    def heatmap(self, utc_offset: float = 0.0) -> List[List[Optional[float]]]:
+        """
+        Engagement lift by local day and hour (7 x 24; None for hours without posts).
+
+        Lift is the typical score in that hour relative to the overall typical
+        score (1.0 = average).
+        """
+        rows = self._slot_scores(utc_offset)
+        grid: List[List[Optional[float]]] = [[None] * 24 for _ in range(7)]
+        for hour_of_week in range(7 * 24):
+            halves = [row for row in rows[hour_of_week * 2:hour_of_week * 2 + 2] if row["posts"]]
+            if halves:
+                posts = sum(row["posts"] for row in halves)
+                lift = sum(row["lift"] * row["posts"] for row in halves) / posts
+                grid[hour_of_week // 24][hour_of_week % 24] = round(lift, 3)
+        return grid
+
+    def schedule(self, posts_per_week: int = 7, utc_offset: float = 0.0, min_gap_hours: float = 4,
+                 min_posts: int = 1) -> List[Dict[str, Any]]:
+        """
+        Rank posting slots, best first, spaced at least min_gap_hours apart.
+
+        Args:
+            posts_per_week: Slots to return
+            utc_offset: Local time offset from UTC in hours (e.g. 5.5 for IST)
+            min_gap_hours: Minimum spacing between chosen slots
+            min_posts: Only consider slots with at least this many posts
+
+        Returns:
+            [{"day", "time", "lift", "posts"}]; lift is the expected engagement
+            relative to an average slot
+        """
+        rows = [row for row in self._slot_scores(utc_offset) if row["posts"] >= min_posts]
+        rows.sort(key=lambda row: row["score"], reverse=True)
+        gap = int(min_gap_hours * 2)
+        chosen: List[Dict[str, Any]] = []
+        for row in rows:
+            if len(chosen) >= posts_per_week:
+                break
+            if any(min(abs(row["slot"] - other["slot"]), SLOTS - abs(row["slot"] - other["slot"])) < gap
+                   for other in chosen):
+                continue
+            chosen.append(row)
+        return [{
+            "day": DAYS[row["slot"] // 48],
+            "time": f"{row['slot'] % 48 // 2:02d}:{row['slot'] % 2 * 30:02d}",
+            "lift": round(row["lift"], 2),
+            "posts": row["posts"],
+        } for row in chosen]
+
+
+def parse_utc_offset(value: str) -> float:
+    """Parse "+5:30", "-8", "5.5" or "UTC+2" into hours."""
+    text = value.strip().upper().replace("UTC", "").replace("GMT", "") or "0"
+    sign = -1 if text.startswith("-") else 1
+    hours, _, minutes = text.lstrip("+-").partition(":")
+    try:
+        return sign * (float(hours) + float(minutes or 0) / 60)
+    except ValueError:
+        raise XAPIClientError(f"Invalid UTC offset: {value}")
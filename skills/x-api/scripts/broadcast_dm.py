@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Send one direct message to many recipients.
+
+Usage: python3 broadcast_dm.py <recipients|file> <message_text> [path_to_media] [workers]
+
+<recipients> is a comma-separated list of handles or a file with one handle
+per line. Recipients are resolved in bulk, media is uploaded once, and
+messages are delivered concurrently. Progress is saved as it goes: if the
+run is interrupted, run the same command again to resume it.
+
+Examples:
+    python3 broadcast_dm.py alice,bob,carol "Launch is live!"
+    python3 broadcast_dm.py beta_users.txt "v2 is out" /path/to/banner.png 4
+"""
+
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, read_list, XAPIClientError
+from dm_broadcast import DMBroadcast
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python3 broadcast_dm.py <recipients|file> <message_text> [path_to_media] [workers]")
+        sys.exit(1)
+
+    recipients = read_list(sys.argv[1])
+    text = sys.argv[2]
+    media = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] else None
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+    try:
+        client = get_client()
+        broadcast = DMBroadcast(recipients, text, media, max_workers=workers)
+        print(f"Broadcast {broadcast.name} to {len(broadcast.recipients)} recipient(s)")
+        results = broadcast.run(client)
+
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            if result["status"] != "sent":
+                detail = f": {result['error']}" if result["error"] else ""
+                print(f"   @{result['recipient']} [{result['status']}]{detail}")
+
+        print(f"\nSent: {counts.get('sent', 0)} | Failed: {counts.get('failed', 0)} | "
+              f"Unknown: {counts.get('unknown', 0)}")
+        print(f"State: {broadcast.state_path}")
+        if counts.get("sent", 0) < len(results):
+            print("Run the same command again to resume.")
+            sys.exit(1)
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
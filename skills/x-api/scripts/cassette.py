@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Cassette - Record and replay X API traffic for offline benchmarks
+
+Wraps the client's transport, which every API call (including media
+uploads) goes through:
+
+    record  - send requests for real and append each request/response pair
+              to a gzip-compressed JSONL cassette
+    replay  - serve responses from the cassette without network access,
+              optionally sleeping for the recorded latency
+
+Credentials never reach the cassette: the Authorization header and any
+oauth_* query parameters are redacted, and only content-type and
+x-rate-limit-* response headers are kept.
+
+Replay matches requests on method, path, query and body (OAuth nonces and
+timestamps are ignored). Identical requests are served in recorded order,
+repeating the last response once they run out, so a cassette can be
+replayed in a loop. A request with no recording fails as a connection error. Replay works the
+same whichever transport the client was recorded with.
+
+Enable for scripts with X_API_CASSETTE=path (and X_API_CASSETTE_MODE=record
+or replay; default replays when the file exists, records otherwise).
+"""
+
+import atexit
+import base64
+import gzip
+import json
+import threading
+import time
+import urllib.parse
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    from .x_api_client import Transport, TransportError, XAPIClientError
+except ImportError:
+    from x_api_client import Transport, TransportError, XAPIClientError
+
+
+MODES = ("record", "replay")
+
+REDACTED = "[REDACTED]"
+
+# Response headers worth keeping; everything else (cookies, tracing IDs) is dropped
+_KEPT_HEADER_PREFIXES = ("content-type", "x-rate-limit-")
+
+
+def _redact_query(query: List[List[str]]) -> List[List[str]]:
+    return [[k, REDACTED if k.lower().startswith("oauth_") else v] for k, v in query]
+
+
+def _request_key(method: str, path: str, query: List[List[str]], body: Any) -> str:
+    """Canonical form of a request used to match recordings."""
+    return json.dumps([method.upper(), path, sorted(query), body], sort_keys=True, default=str)
+
+
+def _normalize(method: str, url: str, params: Optional[Dict], json_body: Any,
+               data: Optional[Dict], files: Optional[Dict]) -> Dict[str, Any]:
+    """Split a request into the parts stored in (and matched against) a cassette."""
+    parsed = urllib.parse.urlparse(url)
+    query = [list(pair) for pair in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)]
+    for k, v in (params or {}).items():
+        for item in (v if isinstance(v, list) else [v]):
+            query.append([str(k), str(item)])
+    query = _redact_query(query)
+
+    if files:
+        # Multipart upload: match on the form fields and file names, not file bytes
+        body = {"data": data or {}, "files": sorted(
+            value[0] if isinstance(value, tuple) else name for name, value in files.items()
+        )}
+    elif json_body is not None:
+        body = json_body
+    else:
+        body = data
+
+    return {"method": method.upper(), "path": parsed.path, "query": query, "body": body}
+
+
+class Cassette:
+    """A recording of X API request/response pairs."""
+
+    def __init__(self, path: str, mode: Optional[str] = None,
+                 simulate_latency: bool = False, latency_scale: float = 1.0):
+        """
+        Args:
+            path: Cassette file (gzip-compressed JSONL)
+            mode: "record" or "replay" (default: replay if the file exists)
+            simulate_latency: In replay, sleep for each response's recorded latency
+            latency_scale: Multiplier applied to recorded latency
+        """
+        self.path = Path(path)
+        self.mode = mode or ("replay" if self.path.exists() else "record")
+        if self.mode not in MODES:
+            raise XAPIClientError(f"Unknown cassette mode: {self.mode} (use record or replay)")
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._recordings: Dict[str, deque] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+        if self.mode == "replay":
+            if not self.path.exists():
+                raise XAPIClientError(f"Cassette not found: {self.path}")
+            for entry in self.entries():
+                key = _request_key(entry["method"], entry["path"], entry["query"], entry["body"])
+                self._recordings.setdefault(key, deque()).append(entry)
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the recorded interactions in order."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def close(self) -> None:
+        """Flush and close the cassette file (record mode)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def record(self, request: Dict[str, Any], response, elapsed: float) -> None:
+        """Append one interaction to the cassette."""
+        entry = dict(request)
+        entry["headers"] = {"Authorization": REDACTED}
+        entry["status"] = response.status_code
+        entry["response_headers"] = {
+            k.lower(): v for k, v in response.headers.items()
+            if k.lower().startswith(_KEPT_HEADER_PREFIXES)
+        }
+        try:
+            entry["content"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["content_b64"] = base64.b64encode(response.content).decode("ascii")
+        entry["elapsed"] = round(elapsed, 6)
+        entry["recorded_at"] = time.time()
+
+        line = json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Appending adds a gzip member; readers see one continuous stream
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self.stats["recorded"] += 1
+
+    def replay(self, request: Dict[str, Any], url: str) -> "requests.Response":
+        """Build the recorded response for a request."""
+        key = _request_key(request["method"], request["path"], request["query"], request["body"])
+        with self._lock:
+            queue = self._recordings.get(key)
+            if not queue:
+                self.stats["misses"] += 1
+                raise TransportError(
+                    f"No recorded response for {request['method']} {request['path']}"
+                )
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+            self.stats["replayed"] += 1
+
+        if self.simulate_latency and entry.get("elapsed"):
+            time.sleep(entry["elapsed"] * self.latency_scale)
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry.get("response_headers", {}))
+        if "content_b64" in entry:
+            response._content = base64.b64decode(entry["content_b64"])
+        else:
+            response._content = entry.get("content", "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = url
+        response.elapsed = timedelta(seconds=entry.get("elapsed", 0))
+        return response
+
+    def wrap(self, transport: Transport) -> "CassetteTransport":
+        """
+        Wrap a client's transport.
+
+        Args:
+            transport: The transport that sends requests in record mode
+
+        Returns:
+            A transport recording through, or replaying instead of, it
+        """
+        return CassetteTransport(self, transport)
+
+
+class CassetteTransport(Transport):
+    """A transport that records another transport's traffic, or replays it."""
+
+    def __init__(self, cassette: Cassette, inner: Transport):
+        self.cassette = cassette
+        self.inner = inner
+        self.name = f"cassette({inner.name})"
+
+    def send(self, method: str, url: str, headers: Dict[str, str], params: Optional[Dict] = None,
+             json: Any = None, data: Optional[Dict] = None, files: Optional[Dict] = None,
+             timeout: Optional[float] = None):
+        request = _normalize(method, url, params, json, data, files)
+        if self.cassette.mode == "replay":
+            return self.cassette.replay(request, url)
+
+        started = time.perf_counter()
+        response = self.inner.send(method, url, headers, params=params, json=json, data=data,
+                                   files=files, timeout=timeout)
+        self.cassette.record(request, response, time.perf_counter() - started)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def install(client, path: str, mode: Optional[str] = None,
+            simulate_latency: bool = False, latency_scale: float = 1.0) -> Cassette:
+    """
+    Record or replay every HTTP request a client makes.
+
+    Args:
+        client: XAPIClient instance
+        path: Cassette file
+        mode: "record" or "replay" (default: replay if the file exists)
+        simulate_latency: In replay, sleep for each response's recorded latency
+        latency_scale: Multiplier applied to recorded latency
+
+    Returns:
+        The installed Cassette (see .stats, .close())
+    """
+    cassette = Cassette(path, mode, simulate_latency, latency_scale)
+    client.transport = cassette.wrap(client.transport)
+    client.cassette = cassette
+    if cassette.mode == "record":
+        atexit.register(cassette.close)
+    return cassette
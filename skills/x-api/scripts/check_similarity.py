@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Check drafts against your posted tweets for near-duplicates.
+
+Usage:
+    python3 check_similarity.py build <username> [max_pages]
+    python3 check_similarity.py import <file.jsonl>
+    python3 check_similarity.py check <draft> [draft...] [--threshold=0.7]
+
+    build    Index a user's posts (only posts newer than the index on later runs)
+    import   Index tweets from a JSONL file (one {"id", "text"} per line,
+             e.g. search_backfill.py output)
+    check    Report the diversity score and similar tweets for each draft;
+             use - to read drafts from stdin, one per line
+
+Exits with status 2 when any draft is a near-duplicate.
+
+Examples:
+    python3 check_similarity.py build myhandle
+    python3 check_similarity.py check "Shipping the new release today!"
+    cat drafts.txt | python3 check_similarity.py check - --threshold=0.6
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from similarity_index import SimilarityIndex, DEFAULT_THRESHOLD
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = [arg for arg in sys.argv[2:] if not arg.startswith("--threshold=")]
+    threshold = DEFAULT_THRESHOLD
+    for arg in sys.argv[2:]:
+        if arg.startswith("--threshold="):
+            threshold = float(arg.partition("=")[2])
+
+    try:
+        index = SimilarityIndex.load(threshold=threshold)
+
+        if command == "build":
+            username = args[0].lstrip("@")
+            max_pages = int(args[1]) if len(args) > 1 else None
+            added = index.update_from_user(get_client(), username, max_pages=max_pages)
+            index.save()
+            print(f"Indexed {added} new tweet(s) from @{username} ({len(index)} total)")
+
+        elif command == "import":
+            with open(args[0]) as f:
+                added = index.add_many(json.loads(line) for line in f if line.strip())
+            index.save()
+            print(f"Indexed {added} new tweet(s) from {args[0]} ({len(index)} total)")
+
+        elif command == "check":
+            drafts = [line.rstrip("\n") for line in sys.stdin] if args == ["-"] else args
+            drafts = [draft for draft in drafts if draft.strip()]
+            if not len(index):
+                print("Warning: the index is empty; run 'build' or 'import' first", file=sys.stderr)
+
+            started = time.perf_counter()
+            results = index.check(drafts)
+            elapsed = time.perf_counter() - started
+
+            for result in results:
+                status = "DUPLICATE" if result["duplicate"] else "ok"
+                print(f"[{status}] diversity {result['diversity']:.2f}: {result['text'][:80]}")
+                for match in result["matches"]:
+                    source = f"draft #{match['draft'] + 1}" if "draft" in match else f"tweet {match['id']}"
+                    print(f"    {match['similarity']:.0%} {source}: {match['text'][:80]}")
+            print(f"\nChecked {len(drafts)} draft(s) against {len(index)} tweet(s) "
+                  f"in {elapsed * 1000:.1f}ms", file=sys.stderr)
+            if any(result["duplicate"] for result in results):
+                sys.exit(2)
+
+        else:
+            print(f"Error: unknown command: {command}")
+            sys.exit(1)
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Conversation - Fetch a whole reply thread and index it as a tree
+
+Resolves a tweet's conversation_id, fetches every reply with a
+conversation_id: search (through ShardedSearch, so a large conversation is
+paginated in parallel time shards while a small one costs a single
+request), and links replies to their parents via referenced_tweets.
+
+The tree is indexed in memory:
+
+    - parent and children of every tweet
+    - depth (direct replies to the root are depth 1)
+    - per-subtree totals: tweets, likes, retweets, replies, quotes and the
+      x-write engagement score (see best_time.SCORE_WEIGHTS)
+
+so agents can rank branches and pick reply targets without more API calls.
+refresh() fetches only replies newer than the newest one seen.
+
+Recent search covers the last 7 days; older replies of long-running
+conversations are missing (the tree is marked truncated).
+"""
+
+import math
+import time
+from typing import Optional, Dict, Any, List, Iterator
+
+try:
+    from .x_api_client import XAPIClient, XAPIClientError, snowflake_time
+    from .search_planner import ShardedSearch
+    from .best_time import engagement_score
+except ImportError:
+    from x_api_client import XAPIClient, XAPIClientError, snowflake_time
+    from search_planner import ShardedSearch
+    from best_time import engagement_score
+
+
+# Oldest start_time recent search accepts (7 days, with a minute of margin)
+_SEARCH_WINDOW = 7 * 24 * 3600 - 60
+
+_METRICS = ("like_count", "retweet_count", "reply_count", "quote_count")
+
+
+def _parent_id(tweet: Dict[str, Any]) -> Optional[str]:
+    for ref in tweet.get("referenced_tweets") or []:
+        if ref.get("type") == "replied_to":
+            return ref["id"]
+    return None
+
+
+class ConversationTree:
+    """
+    An indexed reply tree.
+
+    Example:
+        tree = fetch_conversation(client, "https://x.com/user/status/123")
+        for branch in tree.branches(5):
+            print(branch["subtree"]["score"], branch["tweet"]["text"])
+    """
+
+    def __init__(self, root: Dict[str, Any], focus_id: Optional[str] = None):
+        """
+        Args:
+            root: The conversation's first tweet (or {"id": conversation_id,
+                "missing": True} when it could not be retrieved)
+            focus_id: The tweet the conversation was looked up from
+        """
+        self.root_id = root["id"]
+        self.focus_id = focus_id or self.root_id
+        self.tweets: Dict[str, Dict[str, Any]] = {self.root_id: root}
+        self.parent: Dict[str, Optional[str]] = {self.root_id: None}
+        self.children: Dict[str, List[str]] = {}
+        self.depth: Dict[str, int] = {}
+        self.subtree: Dict[str, Dict[str, float]] = {}
+        # Replies whose parent is not in the tree (deleted, protected or too old), attached to the root
+        self.orphans: List[str] = []
+        self.truncated = snowflake_time(self.root_id) < time.time() - _SEARCH_WINDOW
+        self._index()
+
+    def add(self, tweets: List[Dict[str, Any]]) -> int:
+        """
+        Add (or update) tweets of the conversation and re-index.
+
+        Returns:
+            Number of tweets not seen before
+        """
+        added = 0
+        for tweet in tweets:
+            if tweet["id"] not in self.tweets:
+                added += 1
+            self.tweets[tweet["id"]] = tweet
+        self._index()
+        return added
+
+    def _index(self) -> None:
+        """Rebuild links, depths and subtree totals (iterative; threads can be deep)."""
+        self.parent = {self.root_id: None}
+        self.children = {tweet_id: [] for tweet_id in self.tweets}
+        self.orphans = []
+        for tweet_id in sorted(self.tweets, key=int):
+            if tweet_id == self.root_id:
+                continue
+            parent = _parent_id(self.tweets[tweet_id])
+            if parent not in self.tweets:
+                self.orphans.append(tweet_id)
+                parent = self.root_id
+            self.parent[tweet_id] = parent
+            self.children[parent].append(tweet_id)
+
+        # Breadth-first from the root gives depths, and parents before children
+        order = [self.root_id]
+        self.depth = {self.root_id: 0}
+        for tweet_id in order:
+            for child in self.children[tweet_id]:
+                if child not in self.depth:
+                    self.depth[child] = self.depth[tweet_id] + 1
+                    order.append(child)
+
+        self.subtree = {}
+        for tweet_id in reversed(order):
+            metrics = self.tweets[tweet_id].get("public_metrics") or {}
+            totals = {"tweets": 1.0, "score": engagement_score(metrics)}
+            for name in _METRICS:
+                totals[name] = float(metrics.get(name, 0))
+            for child in self.children[tweet_id]:
+                for key, value in self.subtree[child].items():
+                    totals[key] += value
+            self.subtree[tweet_id] = totals
+
+    def __len__(self) -> int:
+        return len(self.tweets)
+
+    def __contains__(self, tweet_id: str) -> bool:
+        return tweet_id in self.tweets
+
+    @property
+    def root(self) -> Dict[str, Any]:
+        return self.tweets[self.root_id]
+
+    def newest_id(self) -> str:
+        return max(self.tweets, key=int)
+
+    def path(self, tweet_id: str) -> List[Dict[str, Any]]:
+        """Tweets from the root down to tweet_id."""
+        chain = []
+        while tweet_id is not None:
+            chain.append(self.tweets[tweet_id])
+            tweet_id = self.parent[tweet_id]
+        return chain[::-1]
+
+    def walk(self, tweet_id: Optional[str] = None, max_depth: Optional[int] = None,
+             sort: str = "score") -> Iterator[Dict[str, Any]]:
+        """
+        Depth-first traversal.
+
+        Args:
+            tweet_id: Subtree to walk (default: the root)
+            max_depth: Deepest level to include
+            sort: Sibling order: "score" (best subtree first) or "time"
+
+        Yields:
+            {"tweet", "depth", "subtree"}
+        """
+        stack = [tweet_id or self.root_id]
+        while stack:
+            current = stack.pop()
+            yield {"tweet": self.tweets[current], "depth": self.depth[current],
+                   "subtree": self.subtree[current]}
+            if max_depth is not None and self.depth[current] >= max_depth:
+                continue
+            children = self._sorted(self.children[current], sort)
+            stack.extend(reversed(children))
+
+    def _sorted(self, tweet_ids: List[str], sort: str) -> List[str]:
+        if sort == "time":
+            return sorted(tweet_ids, key=int)
+        return sorted(tweet_ids, key=lambda tweet_id: (-self.subtree[tweet_id]["score"], int(tweet_id)))
+
+    def branches(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Direct replies to the root, ranked by their subtree's engagement.
+
+        Returns:
+            [{"tweet", "depth", "subtree"}], best first
+        """
+        return [
+            {"tweet": self.tweets[tweet_id], "depth": 1, "subtree": self.subtree[tweet_id]}
+            for tweet_id in self._sorted(self.children[self.root_id], "score")[:limit]
+        ]
+
+    def reply_targets(self, limit: int = 10, exclude_author_id: Optional[str] = None,
+                      min_depth: int = 1, max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Tweets worth replying under: ranked by subtree engagement, so a reply
+        lands in the most active part of the conversation.
+
+        Args:
+            limit: Number of targets
+            exclude_author_id: Skip tweets by this author (e.g. your own)
+            min_depth: Skip shallower tweets (default 1: the root, whose
+                subtree is the whole conversation, is left out)
+            max_depth: Skip tweets deeper than this
+
+        Returns:
+            [{"tweet", "depth", "subtree"}], best first
+        """
+        candidates = [
+            tweet_id for tweet_id, tweet in self.tweets.items()
+            if not tweet.get("missing")
+            and (exclude_author_id is None or tweet.get("author_id") != exclude_author_id)
+            and self.depth[tweet_id] >= min_depth
+            and (max_depth is None or self.depth[tweet_id] <= max_depth)
+        ]
+        return [
+            {"tweet": self.tweets[tweet_id], "depth": self.depth[tweet_id], "subtree": self.subtree[tweet_id]}
+            for tweet_id in self._sorted(candidates, "score")[:limit]
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and shape of the conversation."""
+        widths: Dict[int, int] = {}
+        for depth in self.depth.values():
+            widths[depth] = widths.get(depth, 0) + 1
+        return {
+            "conversation_id": self.root_id,
+            "tweets": len(self.tweets),
+            "replies": len(self.tweets) - 1,
+            "max_depth": max(self.depth.values()),
+            "width_by_depth": [widths[depth] for depth in sorted(widths)],
+            "participants": len({tweet.get("author_id") for tweet in self.tweets.values()} - {None}),
+            "orphans": len(self.orphans),
+            "truncated": self.truncated,
+            "engagement": self.subtree[self.root_id],
+        }
+
+    def to_dict(self, tweet_id: Optional[str] = None) -> Dict[str, Any]:
+        """Nested {"tweet", "depth", "subtree", "replies": [...]} (built iteratively)."""
+        tweet_id = tweet_id or self.root_id
+        nodes = {}
+        for node in self.walk(tweet_id):
+            current = node["tweet"]["id"]
+            nodes[current] = dict(node, replies=[])
+            if current != tweet_id:
+                nodes[self.parent[current]]["replies"].append(nodes[current])
+        return nodes[tweet_id]
+
+    def refresh(self, client: XAPIClient, max_workers: int = 4) -> int:
+        """
+        Fetch replies posted since the newest one in the tree.
+
+        Returns:
+            Number of new tweets
+        """
+        newest = self.newest_id()
+        start = max(math.floor(snowflake_time(newest)), time.time() - _SEARCH_WINDOW)
+        replies = [
+            tweet for tweet in _search_replies(client, self.root_id, start, max_workers)
+            if int(tweet["id"]) > int(newest)
+        ]
+        return self.add(replies)
+
+
+def _search_replies(client: XAPIClient, conversation_id: str, start: float, max_workers: int,
+                    max_tweets: Optional[int] = None) -> List[Dict[str, Any]]:
+    search = ShardedSearch(
+        client, f"conversation_id:{conversation_id}", start_time=start,
+        max_workers=max_workers, max_tweets=max_tweets, fields="full",
+    )
+    return list(search)
+
+
+def fetch_conversation(client: XAPIClient, tweet: str, max_workers: int = 4,
+                       max_tweets: Optional[int] = None) -> ConversationTree:
+    """
+    Fetch the conversation a tweet belongs to and index it.
+
+    Args:
+        client: XAPIClient
+        tweet: Tweet URL or ID (any tweet of the conversation)
+        max_workers: Concurrent search shards for large conversations
+        max_tweets: Stop after this many replies (newest first)
+
+    Returns:
+        ConversationTree
+
+    Raises:
+        XAPIClientError: If the tweet cannot be retrieved
+    """
+    focus = client.get_tweets([tweet], fields="full")[0]
+    if "error" in focus:
+        raise XAPIClientError(f"Tweet {focus['id']}: {focus['error']}")
+
+    conversation_id = focus.get("conversation_id") or focus["id"]
+    if conversation_id == focus["id"]:
+        root = focus
+    else:
+        root = client.get_tweets([conversation_id], fields="full")[0]
+        if "error" in root:
+            root = {"id": conversation_id, "missing": True, "error": root["error"]}
+
+    tree = ConversationTree(root, focus_id=focus["id"])
+    start = max(math.floor(snowflake_time(conversation_id)), time.time() - _SEARCH_WINDOW)
+    replies = _search_replies(client, conversation_id, start, max_workers, max_tweets)
+    if focus is not root:
+        replies.append(focus)  # In case it is older than the search window
+    tree.add(replies)
+    return tree
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+DM Broadcast - Send one message to many recipients
+
+Compared to calling send_dm once per recipient, a broadcast:
+
+    - resolves all recipients with bulk user lookups (100 per request)
+    - uploads the attachment once and reuses its media_id
+    - delivers through a bounded concurrent pool that pauses every worker
+      until the window resets when the DM endpoint returns 429
+
+Every delivery is logged to a JSONL state file in the data directory
+(X_API_DATA_DIR, default ~/.x-api) before and after it is sent. Running
+the same broadcast again resumes it: delivered recipients are skipped,
+and deliveries whose outcome is unknown (connection lost or a 5xx
+mid-request) are checked against the conversation before being retried.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+try:
+    from .x_api_client import (
+        XAPIClientError, XAPIConnectionError, XAPIRateLimitError, get_data_dir,
+    )
+except ImportError:
+    from x_api_client import (
+        XAPIClientError, XAPIConnectionError, XAPIRateLimitError, get_data_dir,
+    )
+
+
+# Uploaded media expires after 24 hours; re-upload before that
+MEDIA_REUSE_WINDOW = 23 * 3600
+
+
+def broadcast_name(recipients: List[str], text: str, media_path: Optional[str] = None) -> str:
+    """Derive a stable broadcast name, so re-running the same command resumes it."""
+    key = json.dumps([sorted(r.lower() for r in recipients), text, media_path or ""])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+class DMBroadcast:
+    """A resumable broadcast of one message to many recipients."""
+
+    def __init__(
+        self,
+        recipients: List[str],
+        text: str,
+        media_path: Optional[str] = None,
+        name: Optional[str] = None,
+        state_dir: Optional[str] = None,
+        max_workers: int = 4,
+        min_interval: float = 0.0,
+        max_rate_limit_wait: float = 900,
+    ):
+        """
+        Args:
+            recipients: Handles (with or without @); duplicates are sent once
+            text: Message text
+            media_path: Optional image sent with every message
+            name: Broadcast name (default: derived from recipients, text and media)
+            state_dir: Directory for state files (default: <data dir>/broadcasts)
+            max_workers: Concurrent deliveries
+            min_interval: Minimum seconds between delivery starts
+            max_rate_limit_wait: Longest 429 pause to wait out before giving up
+        """
+        seen = set()
+        self.recipients = []
+        for handle in recipients:
+            handle = handle.strip().lstrip("@")
+            if handle and handle.lower() not in seen:
+                seen.add(handle.lower())
+                self.recipients.append(handle)
+        if not self.recipients:
+            raise XAPIClientError("No recipients")
+        if not text and not media_path:
+            raise XAPIClientError("A broadcast needs text or media")
+
+        self.text = text
+        self.media_path = media_path
+        self.name = name or broadcast_name(self.recipients, text, media_path)
+        state_dir = Path(state_dir) if state_dir else get_data_dir() / "broadcasts"
+        state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = state_dir / f"{self.name}.jsonl"
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+
+    # ---------- state log ----------
+
+    def _log(self, record: Dict[str, Any]) -> None:
+        record["at"] = time.time()
+        with self._lock:
+            with open(self.state_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _load(self) -> Dict[str, Any]:
+        """Replay the state log: latest media upload and latest record per recipient."""
+        state: Dict[str, Any] = {"media": None, "recipients": {}}
+        if not self.state_path.exists():
+            return state
+        with open(self.state_path) as f:
+            lines = f.readlines()
+        if lines and not lines[-1].endswith("\n"):
+            # Torn last line after a crash: terminate it so new records start cleanly
+            with self._lock, open(self.state_path, "a") as f:
+                f.write("\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record["type"] == "media":
+                state["media"] = record
+            elif record["type"] == "delivery":
+                state["recipients"][record["recipient"].lower()] = record
+        return state
+
+    def results(self) -> List[Dict[str, Any]]:
+        """
+        Get the latest outcome per recipient, in recipient order.
+
+        Returns:
+            List of {"recipient", "status", "user_id", "dm_event_id", "error"};
+            status is "sent", "failed", "unknown" (sent, outcome not confirmed)
+            or "pending"
+        """
+        recorded = self._load()["recipients"]
+        results = []
+        for handle in self.recipients:
+            record = recorded.get(handle.lower(), {})
+            status = record.get("status", "pending")
+            results.append({
+                "recipient": handle,
+                "status": "unknown" if status == "sending" else status,
+                "user_id": record.get("user_id"),
+                "dm_event_id": record.get("dm_event_id"),
+                "error": record.get("error"),
+            })
+        return results
+
+    # ---------- delivery ----------
+
+    def _delivery(self, handle: str, status: str, **fields) -> Dict[str, Any]:
+        record = {"type": "delivery", "recipient": handle, "status": status}
+        record.update(fields)
+        self._log(record)
+        return record
+
+    def _wait_for_slot(self) -> None:
+        """Pace delivery starts and honour a shared 429 pause."""
+        with self._lock:
+            slot = max(time.time(), self._next_slot, self._paused_until)
+            self._next_slot = slot + self.min_interval
+        time.sleep(max(0.0, slot - time.time()))
+
+    def _deliver(self, client, target: Dict[str, Any], media_id: Optional[str]) -> Dict[str, Any]:
+        handle, user_id = target["recipient"], target["user_id"]
+        while True:
+            self._wait_for_slot()
+            self._delivery(handle, "sending", user_id=user_id)
+            try:
+                result = client.send_dm_to_id(user_id, self.text, media_id=media_id)
+            except XAPIRateLimitError as e:
+                wait = (e.reset_at or time.time() + 60) - time.time()
+                if wait > self.max_rate_limit_wait:
+                    return self._delivery(handle, "failed", user_id=user_id, error=str(e))
+                with self._lock:
+                    self._paused_until = max(self._paused_until, time.time() + max(0.0, wait) + 1)
+                continue
+            except XAPIClientError as e:
+                if isinstance(e, XAPIConnectionError) or (e.status_code or 0) >= 500:
+                    # Outcome unknown (connection lost, or a server error that may have
+                    # come after delivery): left as "sending", verified on the next run
+                    return {"type": "delivery", "recipient": handle, "status": "sending",
+                            "user_id": user_id, "error": str(e)}
+                return self._delivery(handle, "failed", user_id=user_id, error=str(e))
+            return self._delivery(handle, "sent", user_id=user_id,
+                                  dm_event_id=result.get("data", {}).get("dm_event_id"))
+
+    def run(self, client, retry_failed: bool = True) -> List[Dict[str, Any]]:
+        """
+        Send (or resume) the broadcast.
+
+        Args:
+            client: XAPIClient
+            retry_failed: Retry recipients that failed on an earlier run
+
+        Returns:
+            Per-recipient results (see results())
+        """
+        state = self._load()
+        recorded = state["recipients"]
+
+        pending = []
+        for handle in self.recipients:
+            record = recorded.get(handle.lower())
+            if record is None:
+                pending.append(handle)
+            elif record["status"] == "sending":
+                try:
+                    dm_event_id = client.find_sent_dm(record["user_id"], self.text, record["at"])
+                except XAPIClientError:
+                    continue  # Could not check: left unresolved until the next run
+                if dm_event_id:
+                    self._delivery(handle, "sent", user_id=record["user_id"], dm_event_id=dm_event_id)
+                else:
+                    pending.append(handle)
+            elif record["status"] == "failed" and retry_failed:
+                pending.append(handle)
+
+        if not pending:
+            return self.results()
+
+        targets = []
+        for user in client.get_users(pending):
+            if "error" in user:
+                self._delivery(user["username"], "failed", error=user["error"])
+            else:
+                handle = next(h for h in pending if h.lower() == user["username"].lower())
+                targets.append({"recipient": handle, "user_id": user["id"]})
+
+        media_id = None
+        if self.media_path and targets:
+            media = state["media"]
+            if media and time.time() - media["at"] < MEDIA_REUSE_WINDOW:
+                media_id = media["media_id"]
+            else:
+                media_id = client.upload_media(self.media_path, media_category="dm_image")
+                self._log({"type": "media", "media_id": media_id, "path": self.media_path})
+
+        client.map_concurrent(lambda target: self._deliver(client, target, media_id),
+                               targets, self.max_workers)
+        return self.results()
+
+
+def broadcast_dm(client, recipients: List[str], text: str, media_path: Optional[str] = None,
+                 **kwargs) -> List[Dict[str, Any]]:
+    """
+    Send one DM to many recipients (resumable, see DMBroadcast).
+
+    Args:
+        client: XAPIClient
+        recipients: Handles (with or without @)
+        text: Message text
+        media_path: Optional image sent with every message
+        **kwargs: DMBroadcast options (name, state_dir, max_workers,
+            min_interval, max_rate_limit_wait)
+
+    Returns:
+        Per-recipient results: {"recipient", "status", "user_id", "dm_event_id", "error"}
+    """
+    return DMBroadcast(recipients, text, media_path, **kwargs).run(client)
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Engagement Tracker - Time-series metrics for your own tweets
+
+Tracks public_metrics of tweets during the decay window. Polling is dense
+while a tweet is young (the golden 0-5 minute window) and backs off as its
+score potential decays, following the x-write decay table:
+
+    0h→100%  6h→91%  12h→83%  24h→71%  48h→50%
+
+All due tweets share batched GET /2/tweets lookups, and each tick makes at
+most `max_requests_per_tick` requests, so the API cost per hour is fixed no
+matter how many tweets are tracked.
+
+Samples are stored in a compact SQLite database (integer columns, one row
+per sample) in the data directory (X_API_DATA_DIR, default ~/.x-api).
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+try:
+    from .x_api_client import XAPIClientError, get_data_dir, snowflake_time
+except ImportError:
+    from x_api_client import XAPIClientError, get_data_dir, snowflake_time
+
+
+# (max tweet age in seconds, poll interval in seconds)
+DECAY_SCHEDULE = [
+    (5 * 60, 60),             # 0-5 min: golden window, every minute
+    (15 * 60, 150),           # 5-15 min: momentum window
+    (30 * 60, 300),           # 15-30 min: engagement window
+    (2 * 3600, 900),          # 30 min - 2h
+    (6 * 3600, 1800),         # 2h - 6h: end of the 91% window
+    (24 * 3600, 3 * 3600),    # 6h - 24h
+    (48 * 3600, 6 * 3600),    # 24h - 48h: 50% decay
+]
+
+# Tweets older than this stop being polled
+TRACKING_HORIZON = DECAY_SCHEDULE[-1][0]
+
+METRICS = [
+    "like_count",
+    "retweet_count",
+    "reply_count",
+    "quote_count",
+    "bookmark_count",
+    "impression_count",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked (
+    tweet_id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    next_poll REAL NOT NULL,
+    samples INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tracked_due ON tracked (done, next_poll);
+CREATE TABLE IF NOT EXISTS samples (
+    tweet_id INTEGER NOT NULL,
+    age INTEGER NOT NULL,
+    like_count INTEGER,
+    retweet_count INTEGER,
+    reply_count INTEGER,
+    quote_count INTEGER,
+    bookmark_count INTEGER,
+    impression_count INTEGER,
+    PRIMARY KEY (tweet_id, age)
+) WITHOUT ROWID;
+"""
+
+
+def poll_interval(age: float) -> Optional[float]:
+    """
+    Get the polling interval for a tweet of the given age.
+
+    Args:
+        age: Tweet age in seconds
+
+    Returns:
+        Seconds until the next poll, or None once past the tracking horizon
+    """
+    for max_age, interval in DECAY_SCHEDULE:
+        if age < max_age:
+            return interval
+    return None
+
+
+class EngagementTracker:
+    """Registers tweets and polls their metrics on a decay-based schedule."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_requests_per_tick: int = 1,
+        batch_size: int = 100,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            db_path: SQLite file path (default: <data dir>/engagement.db)
+            max_requests_per_tick: Batch lookups allowed per poll tick
+            batch_size: Tweets per batch lookup (max 100)
+        """
+        self.db_path = Path(db_path) if db_path else get_data_dir() / "engagement.db"
+        self.max_requests_per_tick = max_requests_per_tick
+        self.batch_size = min(batch_size, 100)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        self._conn.close()
+
+    def register(self, tweet_id: str, created_at: Optional[float] = None) -> None:
+        """
+        Start tracking a tweet. Registering a tracked tweet is a no-op.
+
+        Args:
+            tweet_id: Tweet ID
+            created_at: Unix creation time (default: derived from the ID)
+        """
+        if created_at is None:
+            created_at = snowflake_time(tweet_id)
+        next_poll = created_at + DECAY_SCHEDULE[0][1]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO tracked (tweet_id, created_at, next_poll) VALUES (?, ?, ?)",
+                (int(tweet_id), created_at, next_poll),
+            )
+
+    def due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Get tweets to include in the next tick, most overdue first.
+
+        Tweets due within one minute are included early so they share the
+        batch with overdue ones instead of costing a request of their own.
+
+        Args:
+            now: Current Unix time (default: time.time())
+            limit: Maximum number of tweets
+
+        Returns:
+            List of tweet IDs
+        """
+        now = time.time() if now is None else now
+        limit = limit or self.batch_size * self.max_requests_per_tick
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tweet_id FROM tracked WHERE done = 0 AND next_poll <= ? "
+                "ORDER BY next_poll LIMIT ?",
+                (now + DECAY_SCHEDULE[0][1], limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def poll_once(self, client, now: Optional[float] = None) -> int:
+        """
+        Fetch metrics for due tweets and store one sample for each.
+
+        Args:
+            client: XAPIClient used for batched lookups
+            now: Current Unix time (default: time.time())
+
+        Returns:
+            Number of samples stored
+        """
+        now = time.time() if now is None else now
+        tweet_ids = self.due(now)
+        if not tweet_ids:
+            return 0
+
+        tweets = client.get_tweets(
+            [str(tweet_id) for tweet_id in tweet_ids],
+            tweet_fields="public_metrics",
+            max_workers=self.max_requests_per_tick,
+        )
+
+        stored = 0
+        with self._lock, self._conn:
+            for tweet in tweets:
+                tweet_id = int(tweet["id"])
+                if "error" in tweet:
+                    # Deleted or no longer visible: nothing more to measure
+                    self._conn.execute("UPDATE tracked SET done = 1 WHERE tweet_id = ?", (tweet_id,))
+                    continue
+
+                created_at = self._conn.execute(
+                    "SELECT created_at FROM tracked WHERE tweet_id = ?", (tweet_id,)
+                ).fetchone()[0]
+                age = max(0, now - created_at)
+                metrics = tweet.get("public_metrics", {})
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO samples (tweet_id, age, {}) VALUES (?, ?, {})".format(
+                        ", ".join(METRICS), ", ".join("?" * len(METRICS))
+                    ),
+                    [tweet_id, int(age)] + [metrics.get(name) for name in METRICS],
+                )
+
+                interval = poll_interval(age)
+                if interval is None:
+                    self._conn.execute(
+                        "UPDATE tracked SET samples = samples + 1, done = 1 WHERE tweet_id = ?",
+                        (tweet_id,),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE tracked SET samples = samples + 1, next_poll = ? WHERE tweet_id = ?",
+                        (now + interval, tweet_id),
+                    )
+                stored += 1
+        return stored
+
+    def run(self, client, tick_interval: float = 60, max_ticks: Optional[int] = None) -> None:
+        """
+        Poll forever (or for max_ticks), one tick every tick_interval seconds.
+
+        API cost is at most max_requests_per_tick * 3600 / tick_interval
+        requests per hour.
+
+        Args:
+            client: XAPIClient used for batched lookups
+            tick_interval: Seconds between ticks
+            max_ticks: Stop after this many ticks (default: run forever)
+        """
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            started = time.time()
+            try:
+                self.poll_once(client, started)
+            except XAPIClientError as e:
+                print(f"Warning: engagement poll failed: {e}", file=sys.stderr)
+            ticks += 1
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            time.sleep(max(0.0, tick_interval - (time.time() - started)))
+
+    def tracked(self, include_done: bool = False) -> List[Dict[str, Any]]:
+        """
+        List tracked tweets.
+
+        Args:
+            include_done: Include tweets past the horizon or deleted
+
+        Returns:
+            List of {"id", "created_at", "next_poll", "samples", "done"}
+        """
+        query = "SELECT tweet_id, created_at, next_poll, samples, done FROM tracked"
+        if not include_done:
+            query += " WHERE done = 0"
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at DESC").fetchall()
+        return [
+            {
+                "id": str(row[0]),
+                "created_at": row[1],
+                "next_poll": row[2],
+                "samples": row[3],
+                "done": bool(row[4]),
+            }
+            for row in rows
+        ]
+
+    def samples(self, tweet_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the stored time series for a tweet.
+
+        Args:
+            tweet_id: Tweet ID
+
+        Returns:
+            Samples ordered by age, each {"age": seconds, <metric>: count, ...}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT age, {} FROM samples WHERE tweet_id = ? ORDER BY age".format(", ".join(METRICS)),
+                (int(tweet_id),),
+            ).fetchall()
+        return [dict(zip(["age"] + METRICS, row)) for row in rows]
+
+    def velocity(self, tweet_id: str, metric: str = "like_count") -> List[Dict[str, float]]:
+        """
+        Get the engagement velocity curve of a tweet.
+
+        Args:
+            tweet_id: Tweet ID
+            metric: Metric name from METRICS
+
+        Returns:
+            One entry per sample interval:
+            {"age": seconds at end of interval, "value": count, "per_minute": rate}
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        curve = []
+        prev_age, prev_value = 0, 0
+        for sample in self.samples(tweet_id):
+            value = sample[metric]
+            if value is None:
+                continue
+            elapsed = sample["age"] - prev_age
+            rate = (value - prev_value) * 60.0 / elapsed if elapsed > 0 else 0.0
+            curve.append({"age": sample["age"], "value": value, "per_minute": rate})
+            prev_age, prev_value = sample["age"], value
+        return curve
+
+
+_default_tracker: Optional[EngagementTracker] = None
+
+
+def get_tracker() -> EngagementTracker:
+    """Get the shared tracker backed by the default database."""
+    global _default_tracker
+    if _default_tracker is None:
+        _default_tracker = EngagementTracker()
+    return _default_tracker
+
+
+def attach(client) -> None:
+    """
+    Register every tweet posted through client.post_tweet with the tracker.
+
+    Args:
+        client: XAPIClient instance
+    """
+    client.add_post_listener(lambda result: get_tracker().register(result["data"]["id"]))
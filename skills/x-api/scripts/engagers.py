@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Engagers - Who quoted, retweeted and liked a post, and how far that reached
+
+public_metrics only counts engagement. This fetches the engagers behind the
+counts for one post or a batch:
+
+    - quote tweets (with their authors and their own engagement)
+    - users who retweeted
+    - users who liked
+
+All lists of all posts are fetched concurrently (one job per post and
+kind, paginated). Every user returned is stored in the client's user cache,
+so later lookups of the same accounts cost no requests.
+
+The summary groups engagers by follower count. Retweeters' and quoters'
+followers are the audience a post was redistributed to, so their follower
+total ("amplifier_reach") approximates the post's out-of-network reach.
+"""
+
+from typing import Optional, Dict, Any, List, Iterable
+
+try:
+    from .x_api_client import XAPIClient, XAPIClientError, percentile
+    from .best_time import engagement_score
+except ImportError:
+    from x_api_client import XAPIClient, XAPIClientError, percentile
+    from best_time import engagement_score
+
+
+KINDS = ("quotes", "retweets", "likes")
+
+# Lower bounds of the follower-count buckets
+FOLLOWER_BUCKETS = [(0, "<100"), (100, "100-1K"), (1_000, "1K-10K"), (10_000, "10K-100K"),
+                    (100_000, "100K-1M"), (1_000_000, "1M+")]
+
+# public_metrics field counting each kind, for coverage
+_METRIC = {"quotes": "quote_count", "retweets": "retweet_count", "likes": "like_count"}
+
+
+def _followers(user: Dict[str, Any]) -> int:
+    return (user.get("public_metrics") or {}).get("followers_count", 0)
+
+
+def follower_distribution(users: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Follower-count distribution of a set of users.
+
+    Returns:
+        {"users", "buckets": {label: count}, "p50", "p90", "p99", "max",
+         "total", "verified_share"}
+    """
+    users = list(users)
+    counts = sorted(_followers(user) for user in users)
+    buckets = {label: 0 for _, label in FOLLOWER_BUCKETS}
+    for count in counts:
+        label = next(label for bound, label in reversed(FOLLOWER_BUCKETS) if count >= bound)
+        buckets[label] += 1
+    return {
+        "users": len(users),
+        "buckets": buckets,
+        "p50": percentile(counts, 0.50),
+        "p90": percentile(counts, 0.90),
+        "p99": percentile(counts, 0.99),
+        "max": counts[-1] if counts else 0,
+        "total": sum(counts),
+        "verified_share": sum(1 for user in users if user.get("verified")) / len(users) if users else 0.0,
+    }
+
+
+def fetch_engagers(
+    client: XAPIClient,
+    posts: List[str],
+    kinds: Iterable[str] = KINDS,
+    limit: Optional[int] = 1000,
+    max_workers: int = 6,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch quote tweets, retweeters and likers of posts concurrently.
+
+    Args:
+        client: XAPIClient
+        posts: Tweet URLs or IDs
+        kinds: Any of "quotes", "retweets", "likes"
+        limit: Maximum items per post and kind (None: every page)
+        max_workers: Concurrent list fetches across all posts and kinds
+
+    Returns:
+        One entry per distinct post, in input order:
+        {"id", "tweet" (lookup with public_metrics, or an {"id", "error"}),
+         "kinds", "quotes": [tweets], "retweets": [users], "likes": [users],
+         "errors": {kind: message}} (a failed kind is left out of the lists;
+         likers are only listed for your own posts by most apps)
+    """
+    kinds = list(kinds)
+    for kind in kinds:
+        if kind not in KINDS:
+            raise XAPIClientError(f"Unknown engagement kind: {kind} (choose from {', '.join(KINDS)})")
+
+    ids = list(dict.fromkeys(client.extract_tweet_id(str(post)) for post in posts))
+    if not ids:
+        return []
+    tweets = client.get_tweets(ids, tweet_fields="created_at,public_metrics,author_id")
+
+    fetchers = {
+        "quotes": lambda tweet_id: client.get_quote_tweets(tweet_id, limit=limit,
+                                                      fields="created_at,public_metrics,author_id"),
+        "retweets": lambda tweet_id: client.get_retweeted_by(tweet_id, limit=limit),
+        "likes": lambda tweet_id: client.get_liking_users(tweet_id, limit=limit),
+    }
+
+    def fetch(job):
+        tweet_id, kind = job
+        try:
+            return fetchers[kind](tweet_id)
+        except XAPIClientError as e:
+            return e
+
+    entries = {
+        tweet["id"]: {"id": tweet["id"], "tweet": tweet, "kinds": kinds,
+                      "quotes": [], "retweets": [], "likes": [], "errors": {}}
+        for tweet in tweets
+    }
+    # Deleted or protected posts have no lists to fetch
+    jobs = [(tweet["id"], kind) for tweet in tweets if "error" not in tweet for kind in kinds]
+    for (tweet_id, kind), result in zip(jobs, client.map_concurrent(fetch, jobs, max_workers)):
+        if isinstance(result, XAPIClientError):
+            entries[tweet_id]["errors"][kind] = str(result)
+        else:
+            entries[tweet_id][kind] = result
+    return [entries[tweet_id] for tweet_id in ids]
+
+
+def summarize(entries: List[Dict[str, Any]], top: int = 5) -> Dict[str, Any]:
+    """
+    Aggregate fetch_engagers entries (one post or a batch).
+
+    Engagers are deduplicated by user ID across kinds and posts, quotes by tweet ID.
+
+    Returns:
+        {"posts", "counts": {kind: fetched}, "coverage": {kind: fetched /
+         public_metrics count, or None}, "engagers", "multi_kind" (users in more
+         than one kind), "followers": distribution of all engagers,
+         "followers_by_kind": {kind: distribution}, "amplifier_reach" (follower
+         total of retweeters and quoters), "top_engagers", "top_quotes"}
+    """
+    users: Dict[str, Dict[str, Any]] = {}
+    user_kinds: Dict[str, set] = {}
+    by_kind: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in KINDS}
+    counts = {kind: 0 for kind in KINDS}
+    expected = {kind: 0 for kind in KINDS}
+    quotes: Dict[str, Dict[str, Any]] = {}
+
+    for entry in entries:
+        metrics = entry["tweet"].get("public_metrics") or {}
+        for kind in KINDS:
+            if kind not in entry["kinds"] or kind in entry["errors"]:
+                continue
+            expected[kind] += metrics.get(_METRIC[kind], 0)
+            counts[kind] += len(entry[kind])
+            for item in entry[kind]:
+                user = item.get("author") if kind == "quotes" else item
+                if not user or "id" not in user:
+                    continue
+                users[user["id"]] = user
+                by_kind[kind][user["id"]] = user
+                user_kinds.setdefault(user["id"], set()).add(kind)
+        quotes.update((tweet["id"], tweet) for tweet in entry["quotes"])
+
+    amplifiers = {**by_kind["retweets"], **by_kind["quotes"]}
+    ranked = sorted(users.values(), key=_followers, reverse=True)[:top]
+    best_quotes = sorted(quotes.values(), key=lambda tweet: engagement_score(tweet.get("public_metrics") or {}),
+                         reverse=True)[:top]
+    return {
+        "posts": len(entries),
+        "counts": counts,
+        "coverage": {kind: round(counts[kind] / expected[kind], 3) if expected[kind] else None for kind in KINDS},
+        "engagers": len(users),
+        "multi_kind": sum(1 for kinds in user_kinds.values() if len(kinds) > 1),
+        "followers": follower_distribution(users.values()),
+        "followers_by_kind": {kind: follower_distribution(by_kind[kind].values()) for kind in KINDS},
+        "amplifier_reach": sum(_followers(user) for user in amplifiers.values()),
+        "top_engagers": [
+            {"username": user.get("username"), "followers": _followers(user),
+             "kinds": sorted(user_kinds[user["id"]])}
+            for user in ranked
+        ],
+        "top_quotes": [
+            {"id": tweet["id"], "username": (tweet.get("author") or {}).get("username"),
+             "text": tweet.get("text", ""), "score": engagement_score(tweet.get("public_metrics") or {})}
+            for tweet in best_quotes
+        ],
+    }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Export a user's posts or a search to gzip JSONL shards, resumably.
+
+Pages are written to disk as they arrive and checkpointed, so an export
+that is interrupted picks up where it stopped when run again with the same
+directory. Rate limits are waited out.
+
+Usage:
+    python3 export_history.py user <username> <out_dir>
+    python3 export_history.py search <query> <out_dir> [timeframe]
+    python3 export_history.py resume <out_dir>
+    python3 export_history.py status <out_dir>
+    python3 export_history.py cat <out_dir>
+
+    user       Export a user's posts (their latest 3200)
+    search     Export recent search results (timeframe like "2d"; default: 7d,
+               the most recent search covers)
+    resume     Continue an interrupted export
+    status     Print the checkpoint
+    cat        Print the exported tweets as JSON lines
+
+Options:
+    --max-pages=N     Stop after N pages (resume later)
+    --shard-mb=N      Start a new shard every N MB (default: 64)
+
+Examples:
+    python3 export_history.py user nasa exports/nasa
+    python3 export_history.py search "#python lang:en" exports/python 2d
+    python3 export_history.py resume exports/python
+    python3 export_history.py cat exports/nasa | head
+"""
+
+import sys
+import os
+import json
+from datetime import datetime, timedelta, timezone
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, parse_timeframe, XAPIClientError
+from history_export import HistoryExport, read_export, CHECKPOINT
+
+
+def progress(state):
+    shard = state["shards"][-1] if state["shards"] else {"file": "-", "bytes": 0}
+    print(f"\r{state['pages']} page(s), {state['tweets']} tweet(s), "
+          f"{len(state['shards'])} shard(s), {shard['bytes'] / 1e6:.1f} MB in {shard['file']}",
+          end="", file=sys.stderr, flush=True)
+
+
+def open_export(command, args, options):
+    """Build the HistoryExport for a command, reusing the checkpoint if there is one."""
+    shard_bytes = int(float(options.get("shard-mb", 64)) * 1024 * 1024)
+
+    if command == "resume":
+        return HistoryExport.open(args[0], shard_bytes=shard_bytes)
+    if command == "user":
+        source = {"type": "user", "username": args[0].lstrip("@")}
+        return HistoryExport(args[1], source, shard_bytes=shard_bytes)
+
+    query, out_dir = args[0], args[1]
+    if os.path.exists(os.path.join(out_dir, CHECKPOINT)):
+        export = HistoryExport.open(out_dir, shard_bytes=shard_bytes)
+        if export.source.get("query") != query:
+            raise XAPIClientError(f"{out_dir} holds an export of another query; use another directory")
+        return export
+
+    # Fix the window now so a resumed export pages the same results
+    delta = parse_timeframe(args[2]) if len(args) > 2 else timedelta(days=7)
+    if delta is None:
+        raise XAPIClientError(f"Invalid timeframe: {args[2]}")
+    now = datetime.now(timezone.utc)
+    # Recent search rejects a start_time at (or before) exactly 7 days ago
+    start = now - min(delta, timedelta(days=7) - timedelta(minutes=1))
+    source = {
+        "type": "search",
+        "query": query,
+        "start_time": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "end_time": (now - timedelta(seconds=30)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    return HistoryExport(out_dir, source, shard_bytes=shard_bytes)
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].partition("=")[::2] for arg in sys.argv[1:] if arg.startswith("--"))
+    required = {"user": 3, "search": 3, "resume": 2, "status": 2, "cat": 2}
+    if not args or args[0] not in required or len(args) < required[args[0]]:
+        print(__doc__)
+        sys.exit(1)
+
+    command = args[0]
+    try:
+        if command == "status":
+            print(json.dumps(HistoryExport.open(args[1]).state, indent=2))
+            return
+        if command == "cat":
+            for tweet in read_export(args[1]):
+                print(json.dumps(tweet, ensure_ascii=False))
+            return
+
+        export = open_export(command, args[1:], options)
+        max_pages = int(options["max-pages"]) if options.get("max-pages") else None
+        try:
+            state = export.run(get_client(), max_pages=max_pages, on_page=progress)
+        finally:
+            print(file=sys.stderr)
+
+        status = "complete" if state["complete"] else f"paused; continue with: resume {export.out_dir}"
+        print(f"{state['tweets']} tweet(s) in {len(state['shards'])} shard(s) under {export.out_dir} ({status})")
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Fetch a conversation and show where the engagement is.
+
+Resolves the tweet's conversation, fetches every reply (in parallel for
+large conversations), and prints the conversation's shape, its
+highest-engagement branches and the best tweets to reply under.
+
+Usage: python3 get_conversation.py <post_url_or_id> [limit] [--tree] [--json]
+
+    limit    Branches and reply targets to list (default: 5)
+    --tree   Print the whole reply tree, best branches first
+    --json   Print {"stats", "tree"} as JSON (nested replies)
+
+Examples:
+    python3 get_conversation.py "https://x.com/user/status/1234567890123456789"
+    python3 get_conversation.py 1234567890123456789 10 --tree
+"""
+
+import sys
+import os
+import json
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from conversation import fetch_conversation
+
+
+def describe(node) -> str:
+    tweet = node["tweet"]
+    if tweet.get("missing"):
+        return f"[unavailable] ID: {tweet['id']}"
+    author = tweet.get("author", {}).get("username", "unknown")
+    text = " ".join(tweet.get("text", "").split())
+    subtree = node["subtree"]
+    return (f"@{author}: {text[:80]}{'...' if len(text) > 80 else ''}\n"
+            f"   Subtree: {int(subtree['tweets'])} tweet(s), score {subtree['score']:.0f} | "
+            f"Likes: {int(subtree['like_count'])} | Retweets: {int(subtree['retweet_count'])} | "
+            f"Quotes: {int(subtree['quote_count'])}\n"
+            f"   URL: https://x.com/i/status/{tweet['id']}")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = {arg for arg in sys.argv[1:] if arg.startswith("--")}
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    limit = int(args[1]) if len(args) > 1 else 5
+
+    try:
+        tree = fetch_conversation(get_client(), args[0])
+        stats = tree.stats()
+
+        if "--json" in flags:
+            print(json.dumps({"stats": stats, "tree": tree.to_dict()}, indent=2, ensure_ascii=False))
+            return
+
+        print(f"\nConversation {stats['conversation_id']}: {stats['replies']} repl(ies) from "
+              f"{stats['participants']} account(s), depth {stats['max_depth']}")
+        print(f"Replies per level: {stats['width_by_depth'][1:]}")
+        if stats["truncated"]:
+            print("Older than 7 days: replies before the search window are missing")
+        if stats["orphans"]:
+            print(f"{stats['orphans']} repl(ies) to unavailable tweets attached to the root")
+
+        if "--tree" in flags:
+            print()
+            for node in tree.walk():
+                indent = "  " * node["depth"]
+                print(indent + describe(node).replace("\n", "\n" + indent))
+            return
+
+        print("\nTop branches:")
+        for i, node in enumerate(tree.branches(limit), 1):
+            print(f"{i}. {describe(node)}")
+
+        print("\nBest tweets to reply under:")
+        for i, node in enumerate(tree.reply_targets(limit), 1):
+            print(f"{i}. (depth {node['depth']}) {describe(node)}")
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Break down who engaged with posts: quote tweets, retweeters and likers.
+
+Fetches all three lists for every post concurrently and summarizes the
+engagers: follower-count distribution, the largest accounts, the best
+performing quotes, and the follower total of retweeters and quoters (an
+approximation of out-of-network reach).
+
+Usage: python3 get_engagers.py <post_url_or_id> [post_url_or_id ...] [--limit=N] [--kinds=...] [--json]
+
+    --limit=N   Maximum engagers per post and kind (default: 1000)
+    --kinds=... Comma-separated subset of quotes,retweets,likes (default: all)
+    --json      Print {"summary", "posts"} as JSON (with the full lists)
+
+Likers are only listed for your own posts by most apps; other kinds still
+work when likes are refused.
+
+Examples:
+    python3 get_engagers.py "https://x.com/user/status/1234567890123456789"
+    python3 get_engagers.py 1234567890123456789 1234567890123456790 --kinds=quotes,retweets
+"""
+
+import sys
+import os
+import json
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from engagers import KINDS, fetch_engagers, summarize
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].partition("=")[::2] for arg in sys.argv[1:] if arg.startswith("--"))
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    limit = int(options["limit"]) if options.get("limit") else 1000
+    kinds = options["kinds"].split(",") if options.get("kinds") else KINDS
+
+    try:
+        entries = fetch_engagers(get_client(), args, kinds=kinds, limit=limit)
+        summary = summarize(entries)
+
+        if "json" in options:
+            print(json.dumps({"summary": summary, "posts": entries}, indent=2, ensure_ascii=False))
+            return
+
+        for entry in entries:
+            if "error" in entry["tweet"]:
+                print(f"Post {entry['id']}: {entry['tweet']['error']}")
+            for kind, error in entry["errors"].items():
+                print(f"Post {entry['id']}: {kind} unavailable: {error}")
+
+        print(f"\n{summary['posts']} post(s), {summary['engagers']} distinct engager(s) "
+              f"({summary['multi_kind']} engaged more than one way)")
+        for kind in kinds:
+            coverage = summary["coverage"][kind]
+            of_total = f" ({coverage:.0%} of the public count)" if coverage is not None else ""
+            print(f"   {kind:<9} {summary['counts'][kind]:>6}{of_total}")
+
+        followers = summary["followers"]
+        print(f"\nEngager followers: median {followers['p50']:,} | p90 {followers['p90']:,} | "
+              f"max {followers['max']:,} | verified {followers['verified_share']:.0%}")
+        for label, count in followers["buckets"].items():
+            share = count / followers["users"] if followers["users"] else 0
+            print(f"   {label:>9} {count:>6}  {'#' * round(share * 40)}")
+        print(f"\nAmplifier reach (followers of retweeters and quoters): {summary['amplifier_reach']:,}")
+
+        if summary["top_engagers"]:
+            print("\nLargest engagers:")
+            for user in summary["top_engagers"]:
+                print(f"   @{user['username']}  {user['followers']:,} followers  ({', '.join(user['kinds'])})")
+        if summary["top_quotes"]:
+            print("\nTop quotes:")
+            for quote in summary["top_quotes"]:
+                text = " ".join(quote["text"].split())
+                print(f"   @{quote['username']} (score {quote['score']:.0f}): "
+                      f"{text[:80]}{'...' if len(text) > 80 else ''}")
+                print(f"   URL: https://x.com/i/status/{quote['id']}")
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -16,7 +16,7 @@ import os
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from x_api_client import get_client, XAPIClientError
+from x_api_client import get_client, profile_from_argv, XAPIClientError
 
 
 def main():
@@ -61,4 +61,5 @@ def main():
 
 
 if __name__ == "__main__":
+    profile_from_argv()
     main()
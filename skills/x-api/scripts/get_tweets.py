@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Look up tweets by ID or URL (batched, up to 100 per request).
+
+Usage: python3 get_tweets.py <post_url_or_id> [post_url_or_id ...]
+
+Examples:
+    python3 get_tweets.py 1234567890123456789
+    python3 get_tweets.py "https://x.com/user/status/1234567890123456789" 1234567890123456790
+"""
+
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 get_tweets.py <post_url_or_id> [post_url_or_id ...]")
+        sys.exit(1)
+
+    ids = sys.argv[1:]
+
+    try:
+        client = get_client()
+        tweets = client.get_tweets(ids)
+
+        missing = sum(1 for tweet in tweets if "error" in tweet)
+        print(f"\nLooked up {len(tweets)} post(s), {missing} unavailable\n")
+
+        for i, tweet in enumerate(tweets, 1):
+            tweet_id = tweet.get("id", "")
+
+            if "error" in tweet:
+                print(f"{i}. ID: {tweet_id}")
+                print(f"   Error: {tweet['error']}")
+                print()
+                continue
+
+            created_at = tweet.get("created_at", "N/A")
+            text = tweet.get("text", "")
+            metrics = tweet.get("public_metrics", {})
+
+            print(f"{i}. [{created_at}] ID: {tweet_id}")
+            print(f"   {text[:100]}{'...' if len(text) > 100 else ''}")
+            print(f"   Likes: {metrics.get('like_count', 0)} | "
+                  f"Retweets: {metrics.get('retweet_count', 0)} | "
+                  f"Replies: {metrics.get('reply_count', 0)} | "
+                  f"Quotes: {metrics.get('quote_count', 0)} | "
+                  f"Impressions: {metrics.get('impression_count', 0)}")
+            print(f"   URL: https://x.com/i/status/{tweet_id}")
+            print()
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
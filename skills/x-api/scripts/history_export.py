@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+History Export - Resumable export of posts or search results to gzip JSONL shards
+
+Streams pages from the client's pagination straight to disk, so memory
+stays at one page however long the history is:
+
+    - every page is appended to the current shard as its own gzip member
+      (concatenated members are one valid .gz file for gzip, zcat and
+      Python's gzip module)
+    - a new shard starts once the current one reaches `shard_bytes`
+      (compressed size)
+    - after each page, checkpoint.json records the shard, its byte length
+      and the next pagination token
+
+An interrupted export (crash, Ctrl-C, lost connection) resumes exactly
+where it stopped: the current shard is cut back to the checkpointed length,
+dropping any partly written page, and paging restarts from the saved token.
+Rate limits are waited out in process.
+
+The user posts endpoint serves a user's latest 3200 posts; recent search
+covers the last 7 days.
+"""
+
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+try:
+    from .x_api_client import XAPIClientError, XAPIConnectionError, XAPIRateLimitError
+except ImportError:
+    from x_api_client import XAPIClientError, XAPIConnectionError, XAPIRateLimitError
+
+
+CHECKPOINT = "checkpoint.json"
+
+
+class HistoryExport:
+    """
+    A resumable export into a directory of shards.
+
+    Example:
+        export = HistoryExport("exports/nasa", {"type": "user", "username": "nasa"})
+        export.run(client)
+        print(export.state["tweets"], export.shard_paths())
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        source: Dict[str, Any],
+        shard_bytes: int = 64 * 1024 * 1024,
+        fields: str = "full",
+        max_rate_limit_wait: float = 900,
+        max_retries: int = 5,
+    ):
+        """
+        Args:
+            out_dir: Output directory (created if missing)
+            source: {"type": "user", "username": ...} or
+                {"type": "search", "query": ..., "start_time": ..., "end_time": ...}
+                (ISO 8601 times; fixed, so a resumed export pages the same results)
+            shard_bytes: Compressed size at which a new shard is started
+            fields: Field profile or tweet.fields list for every page
+            max_rate_limit_wait: Longest 429 pause to wait out before stopping
+            max_retries: Consecutive connection failures before stopping
+        """
+        if source.get("type") not in ("user", "search"):
+            raise XAPIClientError(f"Unknown export source: {source.get('type')}")
+        self.out_dir = Path(out_dir)
+        self.source = source
+        self.shard_bytes = shard_bytes
+        self.fields = fields
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.max_retries = max_retries
+        self.checkpoint_path = self.out_dir / CHECKPOINT
+        self.state = self._load()
+
+    @classmethod
+    def open(cls, out_dir: str, **kwargs) -> "HistoryExport":
+        """Reopen an existing export from its checkpoint (to resume or inspect it)."""
+        path = Path(out_dir) / CHECKPOINT
+        if not path.exists():
+            raise XAPIClientError(f"No export in {out_dir}")
+        with open(path) as f:
+            state = json.load(f)
+        return cls(out_dir, state["source"], fields=state["fields"], **kwargs)
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.checkpoint_path.exists():
+            return {
+                "source": self.source,
+                "fields": self.fields,
+                "next_token": None,
+                "pages": 0,
+                "tweets": 0,
+                "shards": [],  # [{"file", "bytes", "tweets"}]
+                "newest_id": None,
+                "oldest_id": None,
+                "complete": False,
+                "updated_at": None,
+            }
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        if state["source"] != self.source or state["fields"] != self.fields:
+            raise XAPIClientError(
+                f"{self.out_dir} holds a different export ({json.dumps(state['source'])}); "
+                f"use another directory"
+            )
+        return state
+
+    def _save(self) -> None:
+        self.state["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def shard_paths(self) -> List[Path]:
+        """Paths of the shards written so far, in order."""
+        return [self.out_dir / shard["file"] for shard in self.state["shards"]]
+
+    def _pages(self, client, token: Optional[str]):
+        source = self.source
+        if source["type"] == "user":
+            return client.get_user_posts_pages(source["username"], fields=self.fields,
+                                               pagination_token=token)
+        return client.search_tweets_pages(source["query"], start_time=source.get("start_time"),
+                                          end_time=source.get("end_time"), fields=self.fields,
+                                          next_token=token)
+
+    def _append(self, tweets: List[Dict[str, Any]], next_token: Optional[str]) -> None:
+        """Write one page as a gzip member, then checkpoint it."""
+        shards = self.state["shards"]
+        if not shards or shards[-1]["bytes"] >= self.shard_bytes:
+            shards.append({"file": f"part-{len(shards) + 1:05d}.jsonl.gz", "bytes": 0, "tweets": 0})
+        shard = shards[-1]
+
+        if tweets:
+            lines = "".join(json.dumps(tweet, ensure_ascii=False) + "\n" for tweet in tweets)
+            member = gzip.compress(lines.encode("utf-8"))
+            with open(self.out_dir / shard["file"], "ab") as f:
+                f.write(member)
+                f.flush()
+                os.fsync(f.fileno())
+            shard["bytes"] += len(member)
+            shard["tweets"] += len(tweets)
+            ids = [int(tweet["id"]) for tweet in tweets]
+            state = self.state
+            state["newest_id"] = str(max(ids + ([int(state["newest_id"])] if state["newest_id"] else [])))
+            state["oldest_id"] = str(min(ids + ([int(state["oldest_id"])] if state["oldest_id"] else [])))
+
+        self.state["pages"] += 1
+        self.state["tweets"] += len(tweets)
+        self.state["next_token"] = next_token
+        self.state["complete"] = not next_token
+        self._save()
+
+    def _truncate(self) -> None:
+        """Cut the current shard back to its checkpointed length (drops a torn page)."""
+        shards = self.state["shards"]
+        if not shards:
+            return
+        path = self.out_dir / shards[-1]["file"]
+        if path.exists() and path.stat().st_size != shards[-1]["bytes"]:
+            with open(path, "r+b") as f:
+                f.truncate(shards[-1]["bytes"])
+
+    def run(self, client, max_pages: Optional[int] = None, on_page=None) -> Dict[str, Any]:
+        """
+        Export (or resume) until the last page, or max_pages more pages.
+
+        Args:
+            client: XAPIClient
+            max_pages: Stop after this many pages in this run
+            on_page: Called with the state after each page (for progress)
+
+        Returns:
+            The checkpoint state ("complete" is True once every page is written)
+        """
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if self.state["complete"]:
+            return self.state
+        self._truncate()
+
+        pages = 0
+        failures = 0
+        while not self.state["complete"] and (max_pages is None or pages < max_pages):
+            try:
+                # The last page has no next_token, which marks the export complete
+                for page in self._pages(client, self.state["next_token"]):
+                    self._append(page["data"], page["meta"].get("next_token"))
+                    pages += 1
+                    failures = 0
+                    if on_page:
+                        on_page(self.state)
+                    if max_pages is not None and pages >= max_pages:
+                        break
+            except XAPIRateLimitError as e:
+                wait = (e.reset_at or time.time() + 60) - time.time()
+                if wait > self.max_rate_limit_wait:
+                    raise
+                time.sleep(max(0.0, wait) + 1)
+            except XAPIConnectionError:
+                failures += 1
+                if failures > self.max_retries:
+                    raise
+                time.sleep(min(60, 2 ** failures))
+        return self.state
+
+
+class _BoundedReader:
+    """Read-only view of the first `limit` bytes of a file."""
+
+    def __init__(self, f, limit: int):
+        self._f = f
+        self._left = limit
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self._left:
+            size = self._left
+        data = self._f.read(size)
+        self._left -= len(data)
+        return data
+
+
+def read_export(out_dir: str):
+    """
+    Iterate over an export's tweets, shard by shard (newest first).
+
+    Args:
+        out_dir: Export directory
+
+    Yields:
+        Tweet dicts
+    """
+    with open(Path(out_dir) / CHECKPOINT) as f:
+        state = json.load(f)
+    for shard in state["shards"]:
+        # Only the checkpointed bytes: a page torn by a crash is not part of the export
+        with open(Path(out_dir) / shard["file"], "rb") as raw:
+            with gzip.GzipFile(fileobj=_BoundedReader(raw, shard["bytes"])) as f:
+                for line in f:
+                    yield json.loads(line)
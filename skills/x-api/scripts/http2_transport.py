@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+HTTP/2 Transport - Multiplex concurrent API calls over one connection
+
+The default transport (requests) speaks HTTP/1.1, one request at a time per
+connection, with a connection per thread. HTTPXTransport shares a single
+httpx.Client between all threads: with HTTP/2, concurrent requests become
+streams on one TLS connection per host, so 64 threads need one handshake
+instead of 64, and the server sees one connection.
+
+HTTP/2 is negotiated with ALPN over https; plain-http servers are spoken
+to over HTTP/1.1 from the same pool. With http1=False (the h2c transport)
+HTTP/2 is used with prior knowledge, also over plain http, as
+benchmarks/mock_server.py accepts: that is how the benchmark measures
+multiplexing locally.
+
+Requires httpx with HTTP/2 support:
+    pip3 install 'httpx[http2]'
+
+Enable for scripts with X_API_TRANSPORT=http2 (or httpx for httpx over
+HTTP/1.1, h2c for HTTP/2 only), or pass make_transport("http2") to
+XAPIClient(transport=...).
+"""
+
+from typing import Optional, Dict, Any
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from .x_api_client import Transport, TransportError, XAPIClientError
+except ImportError:
+    from x_api_client import Transport, TransportError, XAPIClientError
+
+
+class _Response:
+    """An httpx response with the requests.Response attributes the client reads."""
+
+    __slots__ = ("status_code", "headers", "content", "http_version")
+
+    def __init__(self, response: "httpx.Response"):
+        self.status_code = response.status_code
+        self.headers = response.headers  # Case-insensitive
+        self.content = response.content
+        self.http_version = response.http_version
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class HTTPXTransport(Transport):
+    """
+    One thread-safe httpx connection pool shared by every thread.
+
+    Example:
+        client = XAPIClient(transport=HTTPXTransport())
+    """
+
+    def __init__(self, http2: bool = True, max_connections: int = 16, http1: bool = True):
+        """
+        Args:
+            http2: Negotiate HTTP/2 (https only); False uses HTTP/1.1
+            max_connections: Pool size (with HTTP/2, extra connections only
+                open once a connection's concurrent stream limit is reached)
+            http1: False (with http2) speaks HTTP/2 with prior knowledge,
+                over plain http too, and never falls back to HTTP/1.1
+        """
+        if httpx is None:
+            raise XAPIClientError("The http2 transport requires httpx: pip3 install 'httpx[http2]'")
+        if not http1 and not http2:
+            raise XAPIClientError("HTTPXTransport needs http1 or http2")
+        self.name = "http2" if http2 and http1 else "h2c" if http2 else "httpx"
+        try:
+            self._client = httpx.Client(
+                http1=http1,
+                http2=http2,
+                limits=httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections),
+            )
+        except ImportError:
+            raise XAPIClientError("HTTP/2 support requires the h2 package: pip3 install 'httpx[http2]'")
+
+    def send(self, method: str, url: str, headers: Dict[str, str], params: Optional[Dict] = None,
+             json: Any = None, data: Optional[Dict] = None, files: Optional[Dict] = None,
+             timeout: Optional[float] = None) -> _Response:
+        if params:
+            # requests drops None-valued params; do the same so the query matches the signature
+            params = {k: v for k, v in params.items() if v is not None}
+        try:
+            response = self._client.request(
+                method, url, headers=headers, params=params or None, json=json,
+                data=data or None, files=files, timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            raise TransportError(f"{type(e).__name__}: {e}")
+        return _Response(response)
+
+    def close(self) -> None:
+        self._client.close()
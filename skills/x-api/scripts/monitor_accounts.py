@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Monitor many accounts and keywords with packed search queries.
+
+Packs "from:user" and keyword clauses into as few OR'd searches as the query
+length limit allows (instead of a lookup plus a timeline call per account),
+then prints each monitor's new tweets. Only tweets newer than the previous
+run are fetched.
+
+Usage: python3 monitor_accounts.py <accounts> [keywords] [interval_seconds]
+
+<accounts> is a comma-separated list of handles or a file with one handle per line.
+[keywords] is a comma-separated list of keywords/hashtags ("" for none).
+With [interval_seconds], keeps polling at that interval.
+
+Examples:
+    python3 monitor_accounts.py nasa,esa,spacex
+    python3 monitor_accounts.py accounts.txt "#ai,machine learning"
+    python3 monitor_accounts.py accounts.txt "" 300
+
+Set X_SEARCH_QUERY_MAX_LENGTH=4096 on the Pro tier for fewer, longer queries.
+"""
+
+import sys
+import os
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, read_list, XAPIClientError
+from monitor_planner import MonitorPlanner, DEFAULT_MAX_QUERY_LENGTH
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    accounts = read_list(sys.argv[1])
+    keywords = read_list(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2] else []
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    max_length = int(os.getenv("X_SEARCH_QUERY_MAX_LENGTH", DEFAULT_MAX_QUERY_LENGTH))
+
+    try:
+        client = get_client()
+        planner = MonitorPlanner(accounts, keywords, max_query_length=max_length)
+        print(f"Monitoring {len(accounts)} account(s) and {len(keywords)} keyword(s) "
+              f"with {len(planner.queries)} packed quer{'y' if len(planner.queries) == 1 else 'ies'}")
+
+        while True:
+            requests_before = planner.stats["requests"]
+            results = planner.poll(client)
+            new_total = sum(len(tweets) for tweets in results.values())
+            print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] {new_total} new post(s), "
+                  f"{planner.stats['requests'] - requests_before} request(s) "
+                  f"(per-account polling: {2 * len(accounts)})\n")
+
+            for monitor, tweets in results.items():
+                if not tweets:
+                    continue
+                print(f"{monitor}: {len(tweets)} new")
+                for tweet in tweets:
+                    text = tweet.get("text", "")
+                    author = tweet.get("author", {}).get("username", "unknown")
+                    print(f"   [{tweet.get('created_at', 'N/A')}] @{author}: "
+                          f"{text[:100]}{'...' if len(text) > 100 else ''}")
+                    print(f"   URL: https://x.com/i/status/{tweet['id']}")
+                print()
+
+            if interval is None:
+                break
+            time.sleep(interval)
+
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Monitor Planner - Pack many account/keyword monitors into few search queries
+
+Watching N accounts with get_user_posts costs 2N requests per cycle (a
+username lookup plus a timeline call each). The planner instead packs
+"from:user" and keyword clauses into OR'd recent-search queries, each as
+long as the query length limit allows, then demultiplexes the results
+back to every monitor:
+
+    - account monitors by the tweet author's username
+    - keyword monitors by a case-insensitive match on the tweet text
+
+Each packed query keeps its own since_id, persisted between runs, so every
+cycle only fetches tweets newer than the last one seen. A cycle that hits
+its page cap keeps the token of the remaining pages and finishes them on
+the next cycle, so no tweets are skipped.
+
+State is stored as JSON in the data directory (X_API_DATA_DIR, default ~/.x-api).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+try:
+    from .x_api_client import HANDLE_PATTERN, XAPIClientError, get_data_dir
+except ImportError:
+    from x_api_client import HANDLE_PATTERN, XAPIClientError, get_data_dir
+
+
+# Query length limit of recent search (512 on self-serve tiers, 4096 on Pro)
+DEFAULT_MAX_QUERY_LENGTH = 512
+
+def _keyword_clause(keyword: str) -> str:
+    """Quote multi-word keywords so they match as a phrase."""
+    keyword = keyword.strip()
+    if " " in keyword and not keyword.startswith('"'):
+        return f'"{keyword}"'
+    return keyword
+
+
+def _keyword_matches(keyword: str, text: str) -> bool:
+    """Approximate X's keyword matching on tweet text (case-insensitive)."""
+    return keyword.strip().strip('"').lower() in text.lower()
+
+
+def pack_clauses(clauses: List[str], max_length: int, suffix: str = "") -> List[str]:
+    """
+    Pack clauses into as few OR'd queries as fit max_length.
+
+    Uses first-fit decreasing bin packing.
+
+    Args:
+        clauses: Query clauses (e.g. "from:nasa", "#python")
+        max_length: Maximum query length in characters
+        suffix: Operators appended to every query (e.g. "-is:retweet");
+            clauses are then grouped in parentheses
+
+    Returns:
+        List of query strings
+    """
+    overhead = len(f"() {suffix}") if suffix else 0
+    budget = max_length - overhead
+    bins: List[List[str]] = []
+    sizes: List[int] = []
+
+    for clause in sorted(set(clauses), key=len, reverse=True):
+        if len(clause) > budget:
+            raise XAPIClientError(f"Clause longer than the query limit: {clause}")
+        for i, size in enumerate(sizes):
+            if size + len(" OR ") + len(clause) <= budget:
+                bins[i].append(clause)
+                sizes[i] += len(" OR ") + len(clause)
+                break
+        else:
+            bins.append([clause])
+            sizes.append(len(clause))
+
+    queries = []
+    for group in bins:
+        query = " OR ".join(sorted(group))
+        if suffix:
+            query = f"({query}) {suffix}"
+        queries.append(query)
+    return queries
+
+
+class MonitorPlanner:
+    """Polls many account and keyword monitors through packed search queries."""
+
+    def __init__(
+        self,
+        accounts: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        suffix: str = "",
+        max_query_length: int = DEFAULT_MAX_QUERY_LENGTH,
+        state_path: Optional[str] = None,
+        initial_lookback: float = 8 * 3600,
+    ):
+        """
+        Args:
+            accounts: Handles to monitor (with or without @)
+            keywords: Keywords, phrases or hashtags to monitor
+            suffix: Operators applied to every query (e.g. "-is:retweet lang:en")
+            max_query_length: Query length limit of your API tier
+            state_path: since_id state file (default: <data dir>/monitors.json)
+            initial_lookback: Seconds to look back the first time a query runs
+        """
+        self.accounts = []
+        for handle in accounts or []:
+            handle = handle.strip().lstrip("@")
+            if not HANDLE_PATTERN.match(handle):
+                raise XAPIClientError(f"Invalid handle: {handle}")
+            self.accounts.append(handle)
+        self.keywords = [keyword.strip() for keyword in keywords or [] if keyword.strip()]
+        self.initial_lookback = initial_lookback
+        self.state_path = Path(state_path) if state_path else get_data_dir() / "monitors.json"
+        self._lock = threading.Lock()
+
+        clauses = [f"from:{handle}" for handle in self.accounts]
+        clauses += [_keyword_clause(keyword) for keyword in self.keywords]
+        self.queries = pack_clauses(clauses, max_query_length, suffix) if clauses else []
+        self.stats: Dict[str, int] = {"queries": len(self.queries), "requests": 0, "tweets": 0}
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+    def _poll_query(self, client, query: str, entry: Dict[str, Any], max_pages: int) -> Dict[str, Any]:
+        """
+        Fetch tweets newer than the query's since_id, up to max_pages.
+
+        since_id only advances once every page down to it has been fetched.
+        When max_pages cuts a cycle short, the next_token of the remaining
+        pages is kept as "pending" (with the old since_id) and the next cycle
+        finishes that backlog before moving on to newer tweets.
+        """
+        since_id = entry.get("since_id")
+        pending = entry.get("pending")
+        if pending:
+            start_time = pending.get("start_time")
+            next_token = pending["next_token"]
+            newest_id = pending["newest_id"]
+        else:
+            start_time = None
+            if not since_id:
+                start_time = time.strftime(
+                    "%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - self.initial_lookback)
+                )
+            next_token = None
+            newest_id = None
+
+        tweets: List[Dict[str, Any]] = []
+        pages = 0
+        try:
+            for page in client.search_tweets_pages(
+                query,
+                since_id=since_id,
+                start_time=start_time,
+                fields="full",
+                next_token=next_token,
+                max_pages=max_pages,
+            ):
+                pages += 1
+                if newest_id is None:
+                    newest_id = page["meta"].get("newest_id")
+                next_token = page["meta"].get("next_token")
+                tweets.extend(page["data"])
+        except XAPIClientError as e:
+            if not pending or e.status_code != 400:
+                raise
+            # Expired pagination token: drop the backlog and poll from since_id again
+            return self._poll_query(client, query, {"since_id": since_id}, max_pages)
+
+        if pages and next_token:
+            state = {
+                "since_id": since_id,
+                "pending": {"next_token": next_token, "newest_id": newest_id, "start_time": start_time},
+            }
+        else:
+            state = {"since_id": newest_id or since_id}
+        return {"tweets": tweets, "state": state, "pages": pages}
+
+    def demux(self, tweets: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Route tweets back to the monitors they match.
+
+        Returns:
+            {"@handle" or keyword: tweets, newest first} for every monitor
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {f"@{handle}": [] for handle in self.accounts}
+        results.update({keyword: [] for keyword in self.keywords})
+        accounts = {handle.lower(): f"@{handle}" for handle in self.accounts}
+
+        for tweet in sorted(tweets, key=lambda t: int(t["id"]), reverse=True):
+            username = tweet.get("author", {}).get("username", "").lower()
+            if username in accounts:
+                results[accounts[username]].append(tweet)
+            text = tweet.get("text", "")
+            for keyword in self.keywords:
+                if _keyword_matches(keyword, text):
+                    results[keyword].append(tweet)
+        return results
+
+    def poll(self, client, max_workers: int = 4, max_pages: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run one monitoring cycle.
+
+        Args:
+            client: XAPIClient
+            max_workers: Packed queries to run concurrently
+            max_pages: Page cap per query and cycle (older pages left over are
+                fetched on the next cycle)
+
+        Returns:
+            New tweets per monitor ({"@handle" or keyword: tweets, newest first})
+        """
+        with self._lock:
+            state = self._load_state()
+            queries = state.setdefault("queries", {})
+
+            def run(query: str) -> Dict[str, Any]:
+                return self._poll_query(client, query, queries.get(self._query_key(query), {}), max_pages)
+
+            outcomes = client.map_concurrent(run, self.queries, max_workers)
+
+            tweets: Dict[str, Dict[str, Any]] = {}
+            for query, outcome in zip(self.queries, outcomes):
+                self.stats["requests"] += outcome["pages"]
+                for tweet in outcome["tweets"]:
+                    tweets[tweet["id"]] = tweet
+                if outcome["state"]["since_id"] or outcome["state"].get("pending"):
+                    queries[self._query_key(query)] = {
+                        "query": query,
+                        **outcome["state"],
+                        "updated_at": time.time(),
+                    }
+
+            self.stats["tweets"] += len(tweets)
+            self._save_state(state)
+
+        return self.demux(list(tweets.values()))
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Post Queue - Durable scheduled posting with idempotent delivery
+
+A SQLite-backed queue of posts, replies, quotes and DMs with scheduled
+times, and a scheduler loop that dispatches them through one warm client.
+
+Delivery is idempotent:
+    - Every item has an idempotency key; enqueueing the same key twice
+      returns the existing item instead of adding a duplicate.
+    - An item is marked "dispatching" (with its dispatch time) before the
+      API call. If the call times out, the connection drops, the API
+      answers 5xx or reports duplicate content, or the process crashes
+      mid-call, the outcome is unknown and the item becomes "unknown".
+    - Unknown items are verified against the account's actual posts (or
+      the DM conversation) before any retry. If the post landed it is
+      marked sent with the found ID; only otherwise is it sent again.
+
+Dispatch latency (API call time minus scheduled time) is recorded for each
+item and summarized by PostQueue.latency_stats().
+
+The database lives in the data directory (X_API_DATA_DIR, default ~/.x-api).
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+try:
+    from .x_api_client import (
+        XAPIClientError,
+        XAPIConnectionError,
+        XAPIRateLimitError,
+        _env_enabled,
+        check_tweet,
+        get_data_dir,
+        normalize_text,
+        parse_timeframe,
+        percentile,
+        snowflake_id,
+    )
+except ImportError:
+    from x_api_client import (
+        XAPIClientError,
+        XAPIConnectionError,
+        XAPIRateLimitError,
+        _env_enabled,
+        check_tweet,
+        get_data_dir,
+        normalize_text,
+        parse_timeframe,
+        percentile,
+        snowflake_id,
+    )
+
+
+KINDS = ("post", "reply", "quote", "dm")
+
+# Item states
+PENDING = "pending"
+DISPATCHING = "dispatching"
+UNKNOWN = "unknown"
+SENT = "sent"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    scheduled_at REAL NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL,
+    created_at REAL NOT NULL,
+    dispatched_at REAL,
+    completed_at REAL,
+    result_id TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS queue_due ON queue (status, scheduled_at);
+"""
+
+_COLUMNS = [
+    "id", "kind", "payload", "scheduled_at", "idempotency_key", "status", "attempts",
+    "not_before", "created_at", "dispatched_at", "completed_at", "result_id", "error",
+]
+
+
+class PostQueue:
+    """Persistent queue of scheduled posts, replies, quotes and DMs."""
+
+    def __init__(self, db_path: Optional[str] = None, max_attempts: int = 3):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            db_path: SQLite file path (default: <data dir>/post_queue.db)
+            max_attempts: Dispatch attempts before an item is marked failed
+        """
+        self.db_path = Path(db_path) if db_path else get_data_dir() / "post_queue.db"
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        self._conn.close()
+
+    # ============== QUEUE MANAGEMENT ==============
+
+    def enqueue(
+        self,
+        kind: str,
+        scheduled_at: float,
+        idempotency_key: Optional[str] = None,
+        **payload,
+    ) -> int:
+        """
+        Add an item to the queue.
+
+        Args:
+            kind: "post", "reply", "quote" or "dm"
+            scheduled_at: Unix time to dispatch at
+            idempotency_key: Unique key (default: hash of kind, payload and time)
+            **payload: Item fields:
+                post:  text, media_paths=None, reply_settings=None
+                reply: text, parent (URL or ID), media_paths=None
+                quote: text, quoted (URL or ID), media_paths=None
+                dm:    recipient (handle), text, media_path=None
+
+        Returns:
+            Queue item ID (the existing one if the key was already queued)
+        """
+        if kind not in KINDS:
+            raise XAPIClientError(f"Unknown queue item kind: {kind}")
+        required = {"post": ["text"], "reply": ["text", "parent"], "quote": ["text", "quoted"],
+                    "dm": ["recipient", "text"]}[kind]
+        missing = [name for name in required if not payload.get(name)]
+        if missing:
+            raise XAPIClientError(f"Missing {', '.join(missing)} for {kind}")
+        if kind != "dm" and _env_enabled("X_API_VALIDATE"):
+            # Reject posts X would refuse now, not at dispatch time
+            check_tweet(payload["text"], media_ids=payload.get("media_paths"),
+                        reply_to_id=payload.get("parent"), quote_tweet_id=payload.get("quoted"))
+
+        payload_json = json.dumps(payload, sort_keys=True)
+        if idempotency_key is None:
+            digest = hashlib.sha256(f"{kind}|{payload_json}|{scheduled_at:.0f}".encode("utf-8"))
+            idempotency_key = digest.hexdigest()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO queue (kind, payload, scheduled_at, idempotency_key, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, payload_json, scheduled_at, idempotency_key, time.time()),
+            )
+            row = self._conn.execute(
+                "SELECT id FROM queue WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+        return row[0]
+
+    def cancel(self, item_id: int) -> bool:
+        """
+        Cancel a pending item.
+
+        Returns:
+            True if the item was pending and is now cancelled
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE queue SET status = ? WHERE id = ? AND status = ?",
+                (CANCELLED, item_id, PENDING),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Get a queue item by ID."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM queue WHERE id = ?", (item_id,)
+            ).fetchone()
+        return self._to_item(row) if row else None
+
+    def items(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List queue items ordered by scheduled time.
+
+        Args:
+            status: Only items in this state (default: all)
+        """
+        query = f"SELECT {', '.join(_COLUMNS)} FROM queue"
+        args: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            args = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY scheduled_at", args).fetchall()
+        return [self._to_item(row) for row in rows]
+
+    def _to_item(self, row) -> Dict[str, Any]:
+        item = dict(zip(_COLUMNS, row))
+        item["payload"] = json.loads(item["payload"])
+        return item
+
+    def _update(self, item_id: int, **fields) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE queue SET {assignments} WHERE id = ?", list(fields.values()) + [item_id]
+            )
+
+    def next_due_at(self) -> Optional[float]:
+        """Get the earliest time at which a pending item becomes dispatchable."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(MAX(scheduled_at, COALESCE(not_before, 0))) FROM queue WHERE status = ?",
+                (PENDING,),
+            ).fetchone()
+        return row[0]
+
+    def claim_due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Atomically move due pending items to "dispatching".
+
+        Only one scheduler can claim a given item, so several schedulers may
+        share the database safely.
+
+        Returns:
+            Claimed items, earliest first
+        """
+        now = time.time() if now is None else now
+        claimed = []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM queue WHERE status = ? AND scheduled_at <= ? "
+                "AND COALESCE(not_before, 0) <= ? ORDER BY scheduled_at",
+                (PENDING, now, now),
+            ).fetchall()
+            for row in rows:
+                cursor = self._conn.execute(
+                    "UPDATE queue SET status = ?, dispatched_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ? AND status = ?",
+                    (DISPATCHING, now, row[0], PENDING),
+                )
+                if cursor.rowcount == 1:
+                    claimed.append(self._to_item(row))
+        return claimed
+
+    def recover(self, stale_after: float = 120) -> int:
+        """
+        Mark items left in "dispatching" by a crashed scheduler as unknown.
+
+        Args:
+            stale_after: Only items dispatched more than this many seconds ago
+                (longer than any in-flight request of a live scheduler)
+
+        Returns:
+            Number of recovered items
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE queue SET status = ? WHERE status = ? AND dispatched_at <= ?",
+                (UNKNOWN, DISPATCHING, time.time() - stale_after),
+            )
+        return cursor.rowcount
+
+    # ============== DISPATCH ==============
+
+    def dispatch(self, client, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send one claimed item and record the outcome.
+
+        Args:
+            client: XAPIClient
+            item: Item returned by claim_due
+
+        Returns:
+            The updated item
+        """
+        payload = item["payload"]
+        dispatched_at = time.time()
+        self._update(item["id"], dispatched_at=dispatched_at)
+
+        try:
+            result_id = self._send(client, item["kind"], payload)
+        except XAPIRateLimitError as e:
+            # Not applied: retry after the window resets
+            self._update(item["id"], status=PENDING, not_before=e.reset_at or time.time() + 60,
+                         error=str(e))
+        except XAPIConnectionError as e:
+            self._update(item["id"], status=UNKNOWN, error=str(e))
+        except XAPIClientError as e:
+            duplicate = "duplicate" in str(e).lower()
+            if duplicate or (e.status_code or 0) >= 500:
+                self._update(item["id"], status=UNKNOWN, error=str(e))
+            else:
+                self._update(item["id"], status=FAILED, completed_at=time.time(), error=str(e))
+        else:
+            self._update(item["id"], status=SENT, completed_at=time.time(), result_id=result_id,
+                         error=None)
+        return self.get(item["id"])
+
+    def resolve_unknown(self, client, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Settle an item whose last dispatch has an unknown outcome.
+
+        Looks for the post (or DM) created since the last dispatch. If it
+        exists the item is marked sent; otherwise it goes back to pending
+        (or failed once max_attempts is reached).
+
+        Returns:
+            The updated item
+        """
+        try:
+            found_id = self._find_existing(client, item)
+        except XAPIClientError as e:
+            # Cannot verify right now; try again on the next cycle
+            self._update(item["id"], error=f"Verification failed: {e}")
+            return self.get(item["id"])
+
+        if found_id:
+            self._update(item["id"], status=SENT, completed_at=time.time(), result_id=found_id,
+                         error=None)
+        elif item["attempts"] >= self.max_attempts:
+            self._update(item["id"], status=FAILED, completed_at=time.time())
+        else:
+            self._update(item["id"], status=PENDING)
+        return self.get(item["id"])
+
+    def _send(self, client, kind: str, payload: Dict[str, Any]) -> str:
+        """Perform the API call for an item and return the created ID."""
+        if kind == "dm":
+            result = client.send_dm(payload["recipient"], payload["text"], payload.get("media_path"))
+            return result["data"]["dm_event_id"]
+
+        media_ids = None
+        if payload.get("media_paths"):
+            media_ids = [client.upload_media(path) for path in payload["media_paths"]]
+
+        kwargs: Dict[str, Any] = {"media_ids": media_ids}
+        if kind == "reply":
+            kwargs["reply_to_id"] = client.extract_tweet_id(payload["parent"])
+        elif kind == "quote":
+            kwargs["quote_tweet_id"] = client.extract_tweet_id(payload["quoted"])
+        if payload.get("reply_settings"):
+            kwargs["reply_settings"] = payload["reply_settings"]
+
+        result = client.post_tweet(payload["text"], **kwargs)
+        if "data" not in result:
+            raise XAPIClientError(f"Unexpected response: {result}")
+        return result["data"]["id"]
+
+    def _find_existing(self, client, item: Dict[str, Any]) -> Optional[str]:
+        """Find a post or DM created by an earlier dispatch of this item."""
+        payload = item["payload"]
+        sent_at = item["dispatched_at"] or item["scheduled_at"]
+
+        if item["kind"] == "dm":
+            participant_id = client.get_user_id_from_username(payload["recipient"])
+            return client.find_sent_dm(participant_id, payload["text"], sent_at)
+
+        text = normalize_text(payload["text"])
+        since_id = snowflake_id(sent_at - client.SENT_LOOKUP_SKEW)
+        pages = client.get_user_posts_pages(None, since_id=since_id, fields="created_at,referenced_tweets",
+                                            max_pages=1)
+        recent = next(pages, {"data": []})["data"]
+
+        target = None
+        if item["kind"] == "reply":
+            target = ("replied_to", client.extract_tweet_id(payload["parent"]))
+        elif item["kind"] == "quote":
+            target = ("quoted", client.extract_tweet_id(payload["quoted"]))
+
+        for tweet in recent:
+            if normalize_text(tweet.get("text")) != text:
+                continue
+            references = {(ref["type"], ref["id"]) for ref in tweet.get("referenced_tweets", [])}
+            if target is None or target in references:
+                return tweet["id"]
+        return None
+
+    def warm_up(self, client, items: List[Dict[str, Any]]) -> None:
+        """
+        Pre-resolve what upcoming items need so dispatch is a single call.
+
+        Opens the connection, caches the authenticated user ID and resolves
+        DM recipients ahead of their scheduled time.
+        """
+        client.get_my_user_id()
+        for item in items:
+            if item["kind"] == "dm":
+                client.get_user_id_from_username(item["payload"]["recipient"])
+
+    def run(
+        self,
+        client,
+        poll_interval: float = 1.0,
+        warmup_lead: float = 30.0,
+        verify_delay: float = 15.0,
+        max_cycles: Optional[int] = None,
+    ) -> None:
+        """
+        Dispatch items as they come due, forever (or for max_cycles).
+
+        Sleeps until the next scheduled item (at most poll_interval, so
+        items queued by other processes are picked up promptly).
+
+        Args:
+            client: XAPIClient kept warm across dispatches
+            poll_interval: Longest sleep between queue checks
+            warmup_lead: Seconds before an item's time to pre-resolve its needs
+            verify_delay: Seconds to wait after an unknown outcome before
+                verifying (new posts take a moment to show up)
+            max_cycles: Stop after this many cycles (default: run forever)
+        """
+        warmed = set()
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            self.recover()
+            for item in self.items(UNKNOWN):
+                if (item["dispatched_at"] or 0) <= time.time() - verify_delay:
+                    self.resolve_unknown(client, item)
+
+            upcoming = [
+                item for item in self.items(PENDING)
+                if item["scheduled_at"] <= time.time() + warmup_lead and item["id"] not in warmed
+            ]
+            if upcoming:
+                try:
+                    self.warm_up(client, upcoming)
+                    warmed.update(item["id"] for item in upcoming)
+                except XAPIClientError as e:
+                    print(f"Warning: warm-up failed: {e}", file=sys.stderr)
+
+            for item in self.claim_due():
+                self.dispatch(client, item)
+
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+
+            next_due = self.next_due_at()
+            sleep_for = poll_interval
+            if next_due is not None:
+                sleep_for = min(poll_interval, max(0.0, next_due - time.time()))
+            time.sleep(sleep_for)
+
+    # ============== METRICS ==============
+
+    def latency_stats(self) -> Dict[str, float]:
+        """
+        Summarize dispatch latency (API call time minus scheduled time).
+
+        Returns:
+            {"count", "mean", "p50", "p95", "p99", "max"} in seconds over sent items
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dispatched_at - scheduled_at FROM queue WHERE status = ? "
+                "AND dispatched_at IS NOT NULL",
+                (SENT,),
+            ).fetchall()
+        latencies = sorted(max(0.0, row[0]) for row in rows)
+        if not latencies:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "count": len(latencies),
+            "mean": sum(latencies) / len(latencies),
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1],
+        }
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of items in each state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM queue GROUP BY status").fetchall()
+        return dict(rows)
+
+
+def parse_when(when: str) -> float:
+    """
+    Parse a schedule time.
+
+    Args:
+        when: "now", a relative time like "+30min" / "+2hrs", or an
+            ISO 8601 datetime (UTC if no offset, e.g. "2026-01-01T14:00:00Z")
+
+    Returns:
+        Unix timestamp
+    """
+    when = when.strip()
+    if when == "now":
+        return time.time()
+    if when.startswith("+"):
+        delta = parse_timeframe(when[1:])
+        if delta is None:
+            raise XAPIClientError(f"Could not parse relative time: {when}")
+        return time.time() + delta.total_seconds()
+
+    try:
+        dt = datetime.fromisoformat(when.replace("Z", "+00:00"))
+    except ValueError:
+        raise XAPIClientError(f"Could not parse time: {when}")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
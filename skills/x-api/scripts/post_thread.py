@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Post a thread (each tweet replies to the previous one).
+
+All media is uploaded in parallel before the first tweet is posted.
+
+Usage: python3 post_thread.py <thread_file> [resume_index] [reply_to_url_or_id] [--media-ids=JSON]
+
+    --media-ids=JSON  Media already uploaded per segment (a JSON list with a
+                      list of IDs or null per segment), reused instead of
+                      uploading again; the resume command printed on failure
+                      includes it
+
+Thread file format (use "-" to read from stdin):
+    Segments are separated by a line containing only "---".
+    Lines starting with "media:" attach a file to that segment.
+
+    Or a .json file with a list of strings or {"text": ..., "media": [...]} objects.
+
+Example thread file:
+    First tweet of the thread
+    media: /path/to/image.jpg
+    ---
+    Second tweet
+    ---
+    Third tweet
+
+Examples:
+    python3 post_thread.py thread.txt
+    python3 post_thread.py thread.txt 3 https://x.com/user/status/123456789
+"""
+
+import sys
+import os
+import json
+import shlex
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError, XAPIThreadError
+
+
+def parse_thread(content: str, is_json: bool = False):
+    """
+    Parse a thread file into segment texts and media paths.
+
+    Args:
+        content: File content
+        is_json: Whether content is a JSON list
+
+    Returns:
+        Tuple of (texts, media) where media holds a list of paths per segment
+    """
+    texts, media = [], []
+
+    if is_json:
+        for segment in json.loads(content):
+            if isinstance(segment, str):
+                segment = {"text": segment}
+            texts.append(segment["text"])
+            media.append(segment.get("media") or None)
+        return texts, media
+
+    for block in content.split("\n---\n"):
+        lines, paths = [], []
+        for line in block.strip("\n").splitlines():
+            if line.startswith("media:"):
+                paths.append(line[len("media:"):].strip())
+            else:
+                lines.append(line)
+        text = "\n".join(lines).strip()
+        if text or paths:
+            texts.append(text)
+            media.append(paths or None)
+    return texts, media
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].partition("=")[::2] for arg in sys.argv[1:] if arg.startswith("--"))
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    thread_file = args[0]
+    start_index = int(args[1]) - 1 if len(args) > 1 else 0
+    reply_to = args[2] if len(args) > 2 else None
+    media_ids = json.loads(options["media-ids"]) if options.get("media-ids") else None
+
+    if thread_file == "-":
+        content = sys.stdin.read()
+    else:
+        with open(thread_file) as f:
+            content = f.read()
+
+    texts, media = parse_thread(content, is_json=thread_file.endswith(".json"))
+    if not texts:
+        print("Error: thread file has no segments")
+        sys.exit(1)
+
+    try:
+        client = get_client()
+        results = client.post_thread(texts, media=media, reply_to_id=reply_to, start_index=start_index,
+                                     media_ids=media_ids)
+
+        print(f"Thread posted successfully! ({len(results)} tweet(s))")
+        for i, result in enumerate(results, start_index + 1):
+            tweet_id = result["data"]["id"]
+            print(f"{i}. https://x.com/i/status/{tweet_id}")
+
+    except XAPIThreadError as e:
+        print(f"Error: {e}")
+        for i, result in enumerate(e.posted, start_index + 1):
+            print(f"{i}. https://x.com/i/status/{result['data']['id']} (posted)")
+        resume = f"python3 post_thread.py {shlex.quote(thread_file)} {e.failed_index + 1}"
+        if e.last_tweet_id:
+            resume += f" {e.last_tweet_id}"
+        if any(e.media_ids[e.failed_index:]):
+            # Uploaded media stays usable for 24 hours
+            print(f"Uploaded media IDs: {json.dumps(e.media_ids)}")
+            resume += " " + shlex.quote(f"--media-ids={json.dumps(e.media_ids, separators=(',', ':'))}")
+        if e.unknown_outcome:
+            if e.failed_index + 1 < len(texts):
+                skip = f"resume from segment {e.failed_index + 2} replying to it instead"
+            else:
+                skip = "the thread is complete"
+            print(f"The connection was lost while posting segment {e.failed_index + 1}: it may have "
+                  f"been posted. Check the timeline before resuming; if it was posted, {skip}.")
+        print(f"Resume from segment {e.failed_index + 1} with:")
+        print(f"   {resume}")
+        sys.exit(1)
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Find the best times to post from your own engagement history.
+
+Fetches your posts (only new ones after the first run), scores them with
+the x-write engagement weights once they are past the 48h decay window,
+and prints an hour-of-week heatmap and a ranked posting schedule.
+
+Usage: python3 posting_times.py <username> [posts_per_week] [utc_offset] [--replies] [--json]
+
+    posts_per_week  Slots to schedule (default: 7)
+    utc_offset      Local time, e.g. +5:30, -8 or UTC+2 (default: +0)
+    --replies       Include replies (default: original posts only)
+    --json          Print {"schedule", "heatmap"} as JSON
+
+Examples:
+    python3 posting_times.py myhandle
+    python3 posting_times.py myhandle 14 +5:30
+    python3 posting_times.py myhandle 7 -5 --json
+"""
+
+import sys
+import os
+import json
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from best_time import BestTimeAnalyzer, DAYS, parse_utc_offset
+
+_SHADES = " .:-=+*#%@"
+
+
+def render_heatmap(grid) -> str:
+    """Render a 7 x 24 lift grid with one character per hour."""
+    values = [value for row in grid for value in row if value is not None]
+    top = max(values) if values else 1.0
+    lines = ["     " + "".join(str(hour % 10) for hour in range(24))]
+    for day, row in zip(DAYS, grid):
+        cells = []
+        for value in row:
+            if value is None:
+                cells.append(" ")
+            else:
+                cells.append(_SHADES[max(1, min(len(_SHADES) - 1, int(value / top * (len(_SHADES) - 1))))])
+        lines.append(f"{day}  {''.join(cells)}")
+    return "\n".join(lines)
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = {arg for arg in sys.argv[1:] if arg.startswith("--")}
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    username = args[0].lstrip("@")
+    posts_per_week = int(args[1]) if len(args) > 1 else 7
+
+    try:
+        utc_offset = parse_utc_offset(args[2]) if len(args) > 2 else 0.0
+        analyzer = BestTimeAnalyzer(username, include_replies="--replies" in flags)
+        added = analyzer.update(get_client())
+        schedule = analyzer.schedule(posts_per_week=posts_per_week, utc_offset=utc_offset)
+        heatmap = analyzer.heatmap(utc_offset)
+
+        if "--json" in flags:
+            print(json.dumps({"schedule": schedule, "heatmap": heatmap}, indent=2))
+            return
+
+        total = int(sum(analyzer.totals["posts"]))
+        print(f"@{username}: {total} settled post(s) analyzed ({added} new this run)")
+        if not total:
+            print("No posts older than 48 hours yet.")
+            return
+        print(f"\nEngagement by hour (UTC{utc_offset:+g}, darker = better):\n")
+        print(render_heatmap(heatmap))
+        print(f"\nBest {len(schedule)} slot(s):")
+        for i, slot in enumerate(schedule, 1):
+            print(f"{i:>3}. {slot['day']} {slot['time']}  {slot['lift']:.2f}x average  ({slot['posts']} post(s))")
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Profiling - Phase breakdown of a script run
+
+When enabled, times where a run spends its wall clock:
+
+    import        - importing the client (requests, codecs)
+    client_init   - get_client(): .env loading, client setup, attachments
+    auth          - OAuth 1.0a signing
+    request_wait  - waiting on the network (send to last response byte)
+    decode        - JSON decoding of responses
+    client_other  - remaining time inside API calls (params, error handling)
+    render        - everything else: script logic and output formatting
+
+Phases inside API calls are summed across threads, so with concurrent
+requests they can add up to more than the wall time.
+
+Enable with X_API_PROFILE=1 (report on stderr) or X_API_PROFILE=<path>
+(report written to a file), or by passing --profile / --profile=<path> to
+any script; scripts call profile_from_argv(), which removes the flag before
+they parse their arguments. Importing the client never reads sys.argv.
+Boolean words are never taken as paths: 1/true/yes/on mean stderr, and
+0/false/no/off leave profiling off (a --profile flag then reports on stderr).
+The report is a single JSON object, so stdout stays unchanged.
+
+Optional extras:
+    X_API_PROFILE_CPROFILE=<path>  - cProfile stats (open with pstats or snakeviz)
+    X_API_PROFILE_MEMORY=1         - tracemalloc peak memory (slows the run)
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Optional, Dict, Any
+
+try:
+    from . import x_api_client
+except ImportError:
+    import x_api_client
+
+
+PHASES = ("import", "client_init", "auth", "request_wait", "decode", "client_other", "render")
+
+
+class Profiler:
+    """Accumulates phase timings for one process."""
+
+    def __init__(self, started: float, output: Optional[str] = None,
+                 cprofile_path: Optional[str] = None, memory: bool = False):
+        """
+        Args:
+            started: perf_counter() value when the client import began
+            output: Report file path (default: stderr)
+            cprofile_path: Write cProfile stats here
+            memory: Track peak memory with tracemalloc
+        """
+        self.started = started
+        self.output = output
+        self.cprofile_path = cprofile_path
+        self.memory = memory
+        self.phases: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.requests = 0
+        self.slowest: list = []  # (seconds, method, endpoint), longest 5 requests
+        self._client_time = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cprofile = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] += seconds
+
+    def start(self) -> None:
+        """Start optional collectors and register the exit report."""
+        self.phases["import"] = time.perf_counter() - self.started
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        atexit.register(self.report)
+
+    def _timed_call(self, fn, label):
+        """Wrap a client call: nested phases are subtracted to get client_other."""
+        @functools.wraps(fn)
+        def wrapper(client, *args, **kwargs):
+            outer = getattr(self._local, "depth", 0) == 0
+            if not outer:
+                return fn(client, *args, **kwargs)
+            self._local.depth = 1
+            self._local.nested = 0.0
+            start = time.perf_counter()
+            try:
+                return fn(client, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._local.depth = 0
+                endpoint = args[1] if label == "request" and len(args) > 1 else label
+                method = args[0] if label == "request" and args else "POST"
+                with self._lock:
+                    self._client_time += elapsed
+                    self.phases["client_other"] += max(0.0, elapsed - self._local.nested)
+                    self.requests += 1
+                    self.slowest = sorted(self.slowest + [(elapsed, method, endpoint)], reverse=True)[:5]
+        return wrapper
+
+    def _timed_phase(self, fn, phase):
+        """Wrap fn so its time counts towards phase (only the outermost of nested wrappers)."""
+        flag = f"in_{phase}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if getattr(self._local, flag, False):
+                return fn(*args, **kwargs)
+            setattr(self._local, flag, True)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                setattr(self._local, flag, False)
+                self.add(phase, elapsed)
+                self._local.nested = getattr(self._local, "nested", 0.0) + elapsed
+        return wrapper
+
+    def instrument(self) -> None:
+        """Wrap XAPIClient methods and get_client with phase timers."""
+        cls = x_api_client.XAPIClient
+        cls._send_request = self._timed_call(cls._send_request, "request")
+        cls.upload_media = self._timed_call(cls.upload_media, "/2/media/upload")
+        cls._create_oauth_header = self._timed_phase(cls._create_oauth_header, "auth")
+        cls._send = self._timed_phase(cls._send, "request_wait")
+
+        init = cls.__init__
+
+        @functools.wraps(init)
+        def timed_init(client, *args, **kwargs):
+            init(client, *args, **kwargs)
+            codec = client.codec
+            client.codec = x_api_client.JSONCodec(
+                codec.name, self._timed_phase(codec.loads, "decode"), codec.dumps
+            )
+        cls.__init__ = timed_init
+
+        get_client = x_api_client.get_client
+
+        @functools.wraps(get_client)
+        def timed_get_client():
+            start = time.perf_counter()
+            try:
+                # Transport wrappers installed by get_client (e.g. cassette replay)
+                # run inside _send, so they count as request wait
+                return get_client()
+            finally:
+                self.add("client_init", time.perf_counter() - start)
+        x_api_client.get_client = timed_get_client
+        # Scripts import get_client by name before profile_from_argv() runs
+        script = sys.modules.get("__main__")
+        if getattr(script, "get_client", None) is get_client:
+            script.get_client = timed_get_client
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Build the report."""
+        wall = time.perf_counter() - self.started
+        with self._lock:
+            phases = dict(self.phases)
+            client_time = self._client_time
+            requests_made = self.requests
+            slowest = list(self.slowest)
+        phases["render"] = max(0.0, wall - phases["import"] - phases["client_init"] - client_time)
+
+        report = {
+            "script": os.path.basename(sys.argv[0]),
+            "pid": os.getpid(),
+            "wall": round(wall, 6),
+            "phases": {phase: round(seconds, 6) for phase, seconds in phases.items()},
+            "requests": requests_made,
+            "slowest_requests": [
+                {"method": method, "endpoint": endpoint, "seconds": round(seconds, 6)}
+                for seconds, method, endpoint in slowest
+            ],
+        }
+        if self.memory:
+            import tracemalloc
+            report["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        if self.cprofile_path:
+            report["cprofile"] = self.cprofile_path
+        return report
+
+    def report(self) -> None:
+        """Write the report (and cProfile stats) at exit."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+        line = json.dumps(self.snapshot())
+        if self.output:
+            with open(self.output, "a") as f:
+                f.write(line + "\n")
+        else:
+            sys.stderr.write(line + "\n")
+
+
+_profiler: Optional[Profiler] = None
+
+
+def _take_flag() -> Optional[str]:
+    """Remove --profile[=path] from sys.argv; returns "" or the path, None if absent."""
+    for i, arg in enumerate(sys.argv[1:], 1):
+        if arg == "--profile" or arg.startswith("--profile="):
+            del sys.argv[i]
+            return arg.partition("=")[2]
+    return None
+
+
+def enable(started: Optional[float] = None) -> Profiler:
+    """
+    Turn on profiling for this process (idempotent).
+
+    Args:
+        started: perf_counter() value when startup began (default: now)
+
+    Returns:
+        The active Profiler
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+
+    flag = _take_flag()
+    output = os.getenv("X_API_PROFILE", "")
+    if flag:
+        output = flag
+    if output.strip().lower() in ("", "1", "true", "yes", "on", "stderr", "0", "false", "no", "off"):
+        output = None
+
+    _profiler = Profiler(
+        started if started is not None else time.perf_counter(),
+        output=output,
+        cprofile_path=os.getenv("X_API_PROFILE_CPROFILE") or None,
+        memory=x_api_client._env_enabled("X_API_PROFILE_MEMORY", default=False),
+    )
+    _profiler.instrument()
+    _profiler.start()
+    return _profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Get the active Profiler, or None when profiling is off."""
+    return _profiler
@@ -1,32 +1,37 @@
 #!/usr/bin/env python3
 """
-Get recent posts from a user within a specific timeframe.
+Get recent posts from a user (or many users) within a specific timeframe.
 
 Usage: python3 recent_activity.py <username> <timeframe> [count]
 
+<username> can also be a comma-separated list of handles or a file with one
+handle per line. Accounts are then resolved in bulk, fetched concurrently and
+merged in time order; accounts that fail are reported without failing the rest.
+
 Examples:
     python3 recent_activity.py elonmusk 2hrs 20
     python3 recent_activity.py nasa 8hrs
     python3 recent_activity.py github 1d 50
+    python3 recent_activity.py nasa,esa,spacex 8hrs
+    python3 recent_activity.py accounts.txt 8hrs 20
 """
 
 import sys
 import os
-import json
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from x_api_client import get_client, XAPIClientError
+from x_api_client import get_client, profile_from_argv, read_list, XAPIClientError
 
 
 def main():
     if len(sys.argv) < 3:
-        print("Usage: python3 recent_activity.py <username> <timeframe> [count]")
+        print("Usage: python3 recent_activity.py <username|user1,user2|file> <timeframe> [count]")
         print("Timeframe examples: 2hrs, 8hrs, 1d, 1w")
         sys.exit(1)
 
-    username = sys.argv[1]
+    usernames = read_list(sys.argv[1])
     timeframe = sys.argv[2]
     count = int(sys.argv[3]) if len(sys.argv) > 3 else 10
 
@@ -34,11 +39,17 @@ def main():
     if count < 5:
         count = 5
 
+    multi = len(usernames) > 1
+
     try:
         client = get_client()
-        posts = client.get_user_posts(username, timeframe, max_results=count)
-
-        print(f"\nRecent posts from @{username} (last {timeframe}):")
+        errors = {}
+        if multi:
+            posts = client.get_user_posts(usernames, timeframe, max_results=count, errors=errors)
+            print(f"\nRecent posts from {len(usernames)} accounts (last {timeframe}):")
+        else:
+            posts = client.get_user_posts(usernames[0], timeframe, max_results=count)
+            print(f"\nRecent posts from @{usernames[0].lstrip('@')} (last {timeframe}):")
         print(f"Found {len(posts)} post(s)\n")
 
         for i, post in enumerate(posts, 1):
@@ -47,7 +58,11 @@ def main():
             metrics = post.get("public_metrics", {})
             tweet_id = post.get("id", "")
 
-            print(f"{i}. [{created_at}] ID: {tweet_id}")
+            if multi:
+                author = post.get("author", {}).get("username", "unknown")
+                print(f"{i}. [{created_at}] @{author} ID: {tweet_id}")
+            else:
+                print(f"{i}. [{created_at}] ID: {tweet_id}")
             print(f"   {text[:100]}{'...' if len(text) > 100 else ''}")
             print(f"   Likes: {metrics.get('like_count', 0)} | "
                   f"Retweets: {metrics.get('retweet_count', 0)} | "
@@ -55,10 +70,16 @@ def main():
             print(f"   URL: https://x.com/i/status/{tweet_id}")
             print()
 
+        if errors:
+            print(f"Failed for {len(errors)} account(s):")
+            for username, error in errors.items():
+                print(f"   @{username}: {error}")
+
     except XAPIClientError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    profile_from_argv()
     main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Run a JSONL batch of client calls in one process.
+
+Each line names an XAPIClient method and its arguments; later lines can use
+earlier results ($1.data.id, or $name.data.id for steps with an "id").
+Independent steps run concurrently. One JSON result per step is printed
+in step order as soon as it is known.
+
+Usage: python3 run_batch.py <file.jsonl|-> [max_workers] [--fail-fast]
+
+Exits with status 1 if any step failed or was skipped.
+
+Example batch:
+    {"id": "launch", "op": "post_tweet", "args": {"text": "We just launched!"}}
+    {"op": "post_reply", "args": {"text": "How it works:", "parent_post_link": "$launch.data.id"}}
+    {"op": "post_quote", "args": ["Proud of the team", "$launch.data.id"]}
+    {"op": "send_dm", "args": ["friend", "It's live: https://x.com/i/status/${launch.data.id}"]}
+
+Examples:
+    python3 run_batch.py launch.jsonl
+    cat steps.jsonl | python3 run_batch.py - 4 --fail-fast
+"""
+
+import sys
+import os
+import json
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from batch import parse_batch, run_batch
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    max_workers = int(args[1]) if len(args) > 1 else 8
+
+    try:
+        if args[0] == "-":
+            steps = parse_batch(sys.stdin)
+        else:
+            with open(args[0]) as f:
+                steps = parse_batch(f)
+
+        client = get_client()
+        outcomes = run_batch(
+            client, steps, max_workers=max_workers, fail_fast="--fail-fast" in sys.argv,
+            on_result=lambda outcome: print(json.dumps(outcome, ensure_ascii=False), flush=True),
+        )
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if any(outcome["status"] != "ok" for outcome in outcomes):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Schedule posts, replies, quotes and DMs, and run the scheduler.
+
+Usage:
+    python3 schedule_post.py post <when> "Tweet text" [path_to_media]
+    python3 schedule_post.py reply <when> "Reply text" <parent_post_url_or_id>
+    python3 schedule_post.py quote <when> "Quote text" <post_url_or_id_to_quote>
+    python3 schedule_post.py dm <when> <recipient_handle> "Message text" [path_to_media]
+    python3 schedule_post.py list [status]
+    python3 schedule_post.py cancel <item_id>
+    python3 schedule_post.py run
+    python3 schedule_post.py stats
+
+<when> is "now", a relative time ("+30min", "+2hrs", "+1d") or an ISO 8601
+datetime ("2026-01-01T14:00:00Z"; UTC if no offset is given).
+
+Examples:
+    python3 schedule_post.py post 2026-01-01T14:00:00Z "Happy new year!"
+    python3 schedule_post.py reply +30min "Follow-up" https://x.com/user/status/123456789
+    python3 schedule_post.py run
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from post_queue import PostQueue, parse_when
+
+
+def _format_time(timestamp: float) -> str:
+    """Format a Unix timestamp as UTC."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def _enqueue(queue: PostQueue, args) -> int:
+    """Enqueue an item from command line arguments."""
+    kind, when = args[0], parse_when(args[1])
+
+    if kind == "post" and len(args) >= 3:
+        media = [args[3]] if len(args) > 3 else None
+        return queue.enqueue("post", when, text=args[2], media_paths=media)
+    if kind == "reply" and len(args) >= 4:
+        return queue.enqueue("reply", when, text=args[2], parent=args[3])
+    if kind == "quote" and len(args) >= 4:
+        return queue.enqueue("quote", when, text=args[2], quoted=args[3])
+    if kind == "dm" and len(args) >= 4:
+        media = args[4] if len(args) > 4 else None
+        return queue.enqueue("dm", when, recipient=args[2], text=args[3], media_path=media)
+
+    print(__doc__)
+    sys.exit(1)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    try:
+        queue = PostQueue()
+
+        if command in ("post", "reply", "quote", "dm"):
+            if len(sys.argv) < 4:
+                print(__doc__)
+                sys.exit(1)
+            item = queue.get(_enqueue(queue, sys.argv[1:]))
+            print(f"Scheduled {item['kind']} #{item['id']} for {_format_time(item['scheduled_at'])}")
+            print(f"Idempotency key: {item['idempotency_key']}")
+
+        elif command == "list":
+            status = sys.argv[2] if len(sys.argv) > 2 else None
+            items = queue.items(status)
+            print(f"\n{len(items)} queued item(s)\n")
+            for item in items:
+                text = item["payload"].get("text", "")
+                print(f"#{item['id']} [{item['status']}] {item['kind']} at {_format_time(item['scheduled_at'])}")
+                print(f"   {text[:100]}{'...' if len(text) > 100 else ''}")
+                if item["result_id"]:
+                    print(f"   Result ID: {item['result_id']}")
+                if item["error"]:
+                    print(f"   Last error: {item['error']}")
+                print()
+
+        elif command == "cancel":
+            if len(sys.argv) < 3:
+                print("Usage: python3 schedule_post.py cancel <item_id>")
+                sys.exit(1)
+            if queue.cancel(int(sys.argv[2])):
+                print(f"Cancelled #{sys.argv[2]}")
+            else:
+                print(f"Error: #{sys.argv[2]} is not pending")
+                sys.exit(1)
+
+        elif command == "run":
+            client = get_client()
+            print("Scheduler running. Ctrl+C to stop.")
+            try:
+                queue.run(client)
+            except KeyboardInterrupt:
+                print("\nStopped.")
+
+        elif command == "stats":
+            counts = queue.counts()
+            latency = queue.latency_stats()
+            print("\nQueue items:")
+            for status, count in sorted(counts.items()):
+                print(f"   {status}: {count}")
+            print(f"\nDispatch latency over {latency['count']} sent item(s):")
+            print(f"   mean {latency['mean'] * 1000:.0f}ms | p50 {latency['p50'] * 1000:.0f}ms | "
+                  f"p95 {latency['p95'] * 1000:.0f}ms | p99 {latency['p99'] * 1000:.0f}ms | "
+                  f"max {latency['max'] * 1000:.0f}ms")
+
+        else:
+            print(f"Unknown command: {command}")
+            print(__doc__)
+            sys.exit(1)
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
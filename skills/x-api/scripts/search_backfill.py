@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Backfill all search results over a large window using parallel time shards.
+
+Writes one tweet per line as JSON (newest first, deduplicated) to stdout;
+progress and a summary go to stderr.
+
+Usage: python3 search_backfill.py <query> [timeframe] [max_tweets] [workers]
+
+Examples:
+    python3 search_backfill.py "#python" 7d > python.jsonl
+    python3 search_backfill.py "from:nasa OR from:esa" 3d 5000
+    python3 search_backfill.py "machine learning lang:en" 24hrs 20000 8
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, parse_timeframe, XAPIClientError
+from search_planner import ShardedSearch
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    query = sys.argv[1]
+    timeframe = sys.argv[2] if len(sys.argv) > 2 else "7d"
+    max_tweets = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+    delta = parse_timeframe(timeframe)
+    if delta is None:
+        print(f"Error: could not parse timeframe: {timeframe}")
+        sys.exit(1)
+
+    try:
+        client = get_client()
+        search = ShardedSearch(
+            client,
+            query,
+            start_time=time.time() - delta.total_seconds(),
+            max_workers=workers,
+            max_tweets=max_tweets,
+            fields="full",
+        )
+
+        started = time.time()
+        for tweet in search:
+            print(json.dumps(tweet, ensure_ascii=False))
+
+        stats = search.stats
+        print(f"Fetched {stats['tweets']} tweet(s) in {time.time() - started:.1f}s "
+              f"({stats['pages']} pages across {stats['shards']} shards)", file=sys.stderr)
+
+    except XAPIClientError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
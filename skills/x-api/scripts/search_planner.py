@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Search Planner - Time-sharded parallel search across large windows
+
+Splits a recent-search window into time shards and paginates them
+concurrently instead of following one long chain of next_tokens.
+
+    1. A probe page over the whole window measures tweet density
+       (tweets per second among the newest results).
+    2. The rest of the window is cut into shards expected to hold about
+       pages_per_shard pages each.
+    3. Shards are paginated concurrently (bounded by max_workers and the
+       remaining rate limit budget). A shard that turns out denser than
+       planned hands its unfetched remainder back as finer sub-shards,
+       re-sized from the density it observed. A shard that hits the rate
+       limit waits for the window to reset and resumes from its next_token.
+    4. Results are streamed newest first in tweet ID order, deduplicated,
+       as soon as every earlier shard has completed.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Iterator, Union
+
+try:
+    from .x_api_client import XAPIRateLimitError, snowflake_time
+except ImportError:
+    from x_api_client import XAPIRateLimitError, snowflake_time
+
+
+SEARCH_ENDPOINT = "/2/tweets/search/recent"
+PAGE_SIZE = 100
+
+# Recent search covers the last 7 days and needs end_time at least 10s in the past
+_RECENT_WINDOW = 7 * 24 * 3600 - 60
+_END_TIME_MARGIN = 15
+
+
+def _to_timestamp(value: Union[str, float, datetime]) -> float:
+    """Convert an ISO 8601 string, datetime or Unix time to a Unix timestamp."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _iso(timestamp: float) -> str:
+    """Format a Unix timestamp as an API datetime (second precision)."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _Shard:
+    """A time window [start, end) to paginate, optionally bounded by until_id."""
+
+    def __init__(self, start: float, end: float, until_id: Optional[str] = None):
+        self.start = start
+        self.end = end
+        self.until_id = until_id
+        self.tweets: List[Dict[str, Any]] = []
+        self.children: List["_Shard"] = []  # Remainder sub-shards, newest first
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class ShardedSearch:
+    """
+    Iterable over all search results in a window, fetched in parallel shards.
+
+    Example:
+        search = ShardedSearch(client, "#python", start_time="2026-01-01T00:00:00Z")
+        for tweet in search:
+            ...
+        print(search.stats)
+    """
+
+    def __init__(
+        self,
+        client,
+        query: str,
+        start_time: Optional[Union[str, float, datetime]] = None,
+        end_time: Optional[Union[str, float, datetime]] = None,
+        max_workers: int = 4,
+        pages_per_shard: int = 3,
+        max_shards: int = 64,
+        max_tweets: Optional[int] = None,
+        fields: Optional[str] = None,
+        max_rate_limit_wait: float = 900,
+    ):
+        """
+        Args:
+            client: XAPIClient
+            query: Search query
+            start_time: Oldest time, inclusive (default: 7 days ago)
+            end_time: Newest time, exclusive (default: now)
+            max_workers: Maximum concurrent shard requests
+            pages_per_shard: Target pages per shard; shards fetching more
+                split their remainder into new shards
+            max_shards: Upper bound on shards created per split
+            max_tweets: Stop after yielding this many tweets
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
+            max_rate_limit_wait: Longest 429 pause to wait out before giving up
+        """
+        now = time.time()
+        self.client = client
+        self.query = query
+        end = min(_to_timestamp(end_time), now - _END_TIME_MARGIN) if end_time else now - _END_TIME_MARGIN
+        self.end = math.floor(end)
+        self.start = math.ceil(_to_timestamp(start_time) if start_time else now - _RECENT_WINDOW)
+        self.max_workers = max_workers
+        self.pages_per_shard = max(1, pages_per_shard)
+        self.max_shards = max_shards
+        self.max_tweets = max_tweets
+        self.fields = fields
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.stats: Dict[str, Any] = {"pages": 0, "shards": 0, "tweets": 0, "duplicates": 0,
+                                      "density": None}
+
+    def _pages(self, shard: _Shard, max_pages: int, next_token: Optional[str] = None):
+        return self.client.search_tweets_pages(
+            self.query,
+            start_time=_iso(shard.start),
+            end_time=_iso(shard.end),
+            until_id=shard.until_id,
+            max_results=PAGE_SIZE,
+            fields=self.fields,
+            next_token=next_token,
+            max_pages=max_pages,
+        )
+
+    def _wait_for_reset(self, error: XAPIRateLimitError) -> None:
+        """Sleep until the rate limit window resets, or re-raise if that is too long."""
+        wait = (error.reset_at or time.time() + 60) - time.time()
+        if wait > self.max_rate_limit_wait:
+            raise error
+        time.sleep(max(0.0, wait) + 1)
+
+    def _split(self, start: float, end: float, density: float,
+               until_id: Optional[str] = None) -> List[_Shard]:
+        """Cut [start, end) into shards of about pages_per_shard pages, newest first."""
+        start, end = math.floor(start), math.ceil(end)
+        span = max(1, end - start)
+        shard_seconds = self.pages_per_shard * PAGE_SIZE / max(density, 1e-9)
+        count = max(1, min(self.max_shards, span, math.ceil(span / shard_seconds)))
+
+        # Whole-second boundaries so adjacent shards neither overlap nor leave gaps
+        bounds = sorted({start, end} | {round(end - i * span / count) for i in range(1, count)},
+                        reverse=True)
+        shards = [
+            _Shard(bounds[i + 1], bounds[i], until_id if i == 0 else None)
+            for i in range(len(bounds) - 1)
+        ]
+        with self._lock:
+            self.stats["shards"] += len(shards)
+        return shards
+
+    def _fetch(self, shard: _Shard, max_pages: Optional[int] = None) -> Optional[str]:
+        """Paginate a shard; returns next_token if pages remain past max_pages."""
+        remaining = max_pages or self.pages_per_shard
+        next_token = None
+        while remaining > 0:
+            try:
+                for page in self._pages(shard, remaining, next_token):
+                    if self._stopped:
+                        return None
+                    shard.tweets.extend(page["data"])
+                    next_token = page["meta"].get("next_token")
+                    remaining -= 1
+                    with self._lock:
+                        self.stats["pages"] += 1
+                return next_token
+            except XAPIRateLimitError as e:
+                # Resume from the last page fetched once the window resets
+                self._wait_for_reset(e)
+                if self._stopped:
+                    return None
+        return next_token
+
+    def _remainder(self, shard: _Shard) -> List[_Shard]:
+        """Split what is left of a partially fetched shard using its observed density."""
+        oldest = shard.tweets[-1]
+        oldest_time = snowflake_time(oldest["id"])
+        density = len(shard.tweets) / max(1.0, shard.end - oldest_time)
+        # Keep the oldest tweet's whole second; until_id excludes what was already fetched
+        return self._split(shard.start, math.floor(oldest_time) + 1, density, until_id=oldest["id"])
+
+    def _run(self, shard: _Shard) -> None:
+        try:
+            if self._fetch(shard) and shard.tweets and not self._stopped:
+                shard.children = self._remainder(shard)
+                for child in shard.children:
+                    self._submit(child)
+        except BaseException as e:
+            shard.error = e
+        finally:
+            shard.done.set()
+
+    def _submit(self, shard: _Shard) -> None:
+        if self._stopped:
+            shard.done.set()
+            return
+        self._pool.submit(self._run, shard)
+
+    def _emit(self, shard: _Shard) -> Iterator[Dict[str, Any]]:
+        """Yield a shard's tweets, then its remainder shards', in order."""
+        shard.done.wait()
+        if shard.error is not None:
+            raise shard.error
+        yield from shard.tweets
+        shard.tweets = []  # Release memory once streamed
+        for child in shard.children:
+            yield from self._emit(child)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        probe = _Shard(self.start, self.end)
+        with self._lock:
+            self.stats["shards"] += 1
+        next_token = self._fetch(probe, max_pages=1)
+
+        shards: List[_Shard] = []
+        if next_token and probe.tweets:
+            oldest_time = snowflake_time(probe.tweets[-1]["id"])
+            density = len(probe.tweets) / max(1.0, self.end - oldest_time)
+            self.stats["density"] = density
+            shards = self._split(self.start, math.floor(oldest_time) + 1, density,
+                                 until_id=probe.tweets[-1]["id"])
+
+        workers = self.max_workers
+        limit = self.client.get_rate_limit(SEARCH_ENDPOINT)
+        if limit and limit["remaining"] == 0 and shards:
+            self._wait_for_reset(XAPIRateLimitError("Rate limit exceeded", reset_at=limit["reset_at"]))
+        elif limit:
+            workers = max(1, min(workers, limit["remaining"]))
+
+        probe.done.set()
+        last_id = None
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Keep a bounded number of top-level shards ahead of the consumer
+            lookahead = workers * 2
+            for shard in shards[:lookahead]:
+                self._submit(shard)
+
+            for index, shard in enumerate([probe] + shards):
+                if index > 0 and index - 1 + lookahead < len(shards):
+                    self._submit(shards[index - 1 + lookahead])
+                for tweet in self._emit(shard):
+                    tweet_id = int(tweet["id"])
+                    if last_id is not None and tweet_id >= last_id:
+                        self.stats["duplicates"] += 1
+                        continue
+                    last_id = tweet_id
+                    self.stats["tweets"] += 1
+                    yield tweet
+                    if self.max_tweets is not None and self.stats["tweets"] >= self.max_tweets:
+                        return
+        finally:
+            self._stopped = True
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def sharded_search(client, query: str, **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every search result in a window using parallel time shards.
+
+    Args:
+        client: XAPIClient
+        query: Search query
+        **kwargs: ShardedSearch options (start_time, end_time, max_workers,
+            pages_per_shard, max_shards, max_tweets, fields, max_rate_limit_wait)
+
+    Returns:
+        Iterator of tweets, newest first, without duplicates
+    """
+    return iter(ShardedSearch(client, query, **kwargs))
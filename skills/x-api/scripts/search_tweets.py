@@ -35,7 +35,7 @@ from datetime import datetime, timedelta, timezone
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from x_api_client import get_client, XAPIClientError
+from x_api_client import get_client, profile_from_argv, XAPIClientError
 
 
 def main():
@@ -134,4 +134,5 @@ def main():
 
 
 if __name__ == "__main__":
+    profile_from_argv()
     main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Seen Filter - Memory-bounded "already processed?" check for tweet IDs
+
+Pollers that loop over search_tweets / get_timeline see the same tweets on
+page after page. A set of every seen ID grows without bound; this filter
+keeps memory fixed:
+
+    - an exact window of the most recent IDs (set lookup, no hashing),
+      which answers the common case of overlapping consecutive pages
+    - two generations of Bloom filters behind it for long-term memory;
+      when the current one holds `capacity` IDs, the older one is dropped,
+      so at least the last `capacity` IDs are always remembered
+
+A new ID is wrongly reported as seen with probability at most `error_rate`;
+a seen ID within the last `capacity` is never reported as new.
+
+State is saved to the data directory (X_API_DATA_DIR, default ~/.x-api)
+and reloaded on start, so pollers keep their memory across restarts.
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+
+try:
+    from .x_api_client import XAPIClientError, get_data_dir
+except ImportError:
+    from x_api_client import XAPIClientError, get_data_dir
+
+
+_MAGIC = b"XSEEN1\n"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, backed by a bytearray."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+            capacity: Items it is sized for
+            error_rate: False positive probability at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        # One 32-bit word per hash straight from a single digest when it fits
+        # (blake2b digests are at most 64 bytes); double hashing otherwise
+        if self.num_hashes <= 16 and self.num_bits < 2 ** 32:
+            self._words = struct.Struct(f"<{self.num_hashes}I")
+        else:
+            self._words = None
+
+    def positions(self, item: str) -> List[int]:
+        """Bit positions of an item (filters of the same size share them)."""
+        m = self.num_bits
+        if self._words is not None:
+            digest = hashlib.blake2b(item.encode("utf-8"), digest_size=self._words.size).digest()
+            return [word % m for word in self._words.unpack(digest)]
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def has_positions(self, positions: List[int]) -> bool:
+        bits = self.bits
+        for pos in positions:
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add_positions(self, positions: List[int]) -> bool:
+        """Set an item's bits; returns True if any was unset (the item was new)."""
+        bits = self.bits
+        added = False
+        for pos in positions:
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return self.has_positions(self.positions(item))
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns True if it was (probably) not present."""
+        return self.add_positions(self.positions(item))
+
+
+class SeenFilter:
+    """
+    Remembers which tweet IDs were already processed, in fixed memory.
+
+    Example:
+        seen = SeenFilter("mentions-poller")
+        for tweet in seen.filter_new(client.search_tweets("@me", max_results=100)):
+            handle(tweet)
+        seen.save()
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        path: Optional[str] = None,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        window: int = 50_000,
+    ):
+        """
+        Args:
+            name: Filter name; state is kept in <data dir>/seen/<name>.bin
+            path: Explicit state file (instead of name); None with no name keeps
+                the filter in memory only
+            capacity: IDs remembered for sure (memory is about
+                2 * capacity * 1.44 * log2(1 / error_rate) bits)
+            error_rate: Maximum probability of reporting a new ID as seen
+            window: Most recent IDs kept exactly
+        """
+        if path:
+            self.path: Optional[Path] = Path(path)
+        elif name:
+            self.path = get_data_dir() / "seen" / f"{name}.bin"
+        else:
+            self.path = None
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.window = window
+        self._lock = threading.Lock()
+        self._recent: deque = deque()
+        self._recent_set = set()
+        # Two generations each at error_rate / 2 keep the combined rate under error_rate
+        self._current = BloomFilter(capacity, error_rate / 2)
+        self._previous: Optional[BloomFilter] = None
+        self.stats = {"checked": 0, "new": 0, "window_hits": 0, "rotations": 0}
+
+        if self.path and self.path.exists():
+            self._load()
+
+    def _remember(self, key: str) -> None:
+        self._recent.append(key)
+        self._recent_set.add(key)
+        if len(self._recent) > self.window:
+            self._recent_set.discard(self._recent.popleft())
+
+    def _seen(self, positions: List[int]) -> bool:
+        """Check the Bloom generations (the exact window is checked by callers)."""
+        return self._current.has_positions(positions) or (
+            self._previous is not None and self._previous.has_positions(positions)
+        )
+
+    def __contains__(self, tweet_id) -> bool:
+        key = str(tweet_id)
+        with self._lock:
+            return key in self._recent_set or self._seen(self._current.positions(key))
+
+    def add(self, tweet_id) -> bool:
+        """
+        Mark an ID as seen.
+
+        Args:
+            tweet_id: Tweet ID (str or int)
+
+        Returns:
+            True if the ID was new
+        """
+        key = str(tweet_id)
+        with self._lock:
+            self.stats["checked"] += 1
+            if key in self._recent_set:
+                self.stats["window_hits"] += 1
+                return False
+            positions = self._current.positions(key)
+            if self._seen(positions):
+                return False
+            if self._current.count >= self.capacity:
+                self._previous = self._current
+                self._current = BloomFilter(self.capacity, self.error_rate / 2)
+                self.stats["rotations"] += 1
+            self._current.add_positions(positions)
+            self._remember(key)
+            self.stats["new"] += 1
+            return True
+
+    def filter_new(self, items: Iterable[Dict[str, Any]], key: str = "id") -> List[Dict[str, Any]]:
+        """
+        Keep only items not seen before, and mark them as seen.
+
+        Args:
+            items: Tweets (or any dicts) from search, timeline or lookup results
+            key: Field holding the ID
+
+        Returns:
+            The new items, in their original order
+        """
+        return [item for item in items if self.add(item[key])]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory used by the filters and the exact window."""
+        blooms = len(self._current.bits) + (len(self._previous.bits) if self._previous else 0)
+        # Each window entry costs a str (~60 bytes), a set slot and a deque slot
+        return blooms + len(self._recent) * 100
+
+    def save(self) -> None:
+        """Write the filter state (atomically) to its file."""
+        if self.path is None:
+            raise XAPIClientError("SeenFilter has no state file (pass name or path)")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            generations = [self._current] + ([self._previous] if self._previous else [])
+            header = json.dumps({
+                "capacity": self.capacity,
+                "error_rate": self.error_rate,
+                "generations": [{"count": g.count, "bytes": len(g.bits)} for g in generations],
+                "recent": list(self._recent),
+            }).encode("utf-8")
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(_MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                for generation in generations:
+                    f.write(generation.bits)
+            os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise XAPIClientError(f"Not a seen filter file: {self.path}")
+            header = json.loads(f.read(struct.unpack("<I", f.read(4))[0]))
+            if header["capacity"] != self.capacity or header["error_rate"] != self.error_rate:
+                # Sized differently: start over rather than misread the bit arrays
+                return
+            generations = []
+            for info in header["generations"]:
+                generation = BloomFilter(self.capacity, self.error_rate / 2)
+                generation.bits = bytearray(f.read(info["bytes"]))
+                generation.count = info["count"]
+                generations.append(generation)
+
+        self._current = generations[0]
+        self._previous = generations[1] if len(generations) > 1 else None
+        for key in header["recent"][-self.window:]:
+            self._remember(key)
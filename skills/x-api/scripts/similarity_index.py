@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Similarity Index - Near-duplicate detection over your posted tweets
+
+x-write penalizes repeated content (0.5x on repeat impressions). This
+index answers "have I posted something like this before?" for a draft in
+well under a millisecond, even over a 100k-tweet history:
+
+    - each tweet is reduced to character 5-gram shingles of its
+      normalized text (lowercased, links and punctuation removed)
+    - shingles are summarized in a 64-value MinHash signature, built with
+      one-permutation hashing (one hash per shingle, not one per value)
+    - signatures are split into LSH bands; a draft is only compared with
+      tweets sharing at least one band, never with the whole history
+
+Similarity is the estimated Jaccard similarity of shingle sets (0-1); the
+diversity score of a draft is 1 minus its highest similarity.
+
+The index is stored as gzip JSONL in the data directory (X_API_DATA_DIR,
+default ~/.x-api) and refreshed incrementally from get_user_posts pages.
+Tweets indexed as they are posted are appended to a small journal next to
+it, folded into the gzip file every JOURNAL_COMPACT_RECORDS tweets.
+Set X_API_DUPLICATE_CHECK=1 to have get_client() block posts that nearly
+duplicate an indexed tweet (X_API_DUPLICATE_THRESHOLD, default 0.7).
+"""
+
+import base64
+import gzip
+import json
+import os
+import re
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+
+try:
+    from .x_api_client import XAPIClientError, XAPIDuplicateContentError, get_data_dir
+except ImportError:
+    from x_api_client import XAPIClientError, XAPIDuplicateContentError, get_data_dir
+
+
+NUM_PERM = 64
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.7
+JOURNAL_COMPACT_RECORDS = 1000  # Journal size at which it is folded into the index file
+
+_URL = re.compile(r"https?://\S+")
+_NON_WORD = re.compile(r"[\W_]+")
+
+_BUCKET_BITS = NUM_PERM.bit_length() - 1  # NUM_PERM is a power of two
+_VALUE_BITS = 32 - _BUCKET_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 1 << 32
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop links and punctuation, collapse whitespace."""
+    return " ".join(_NON_WORD.sub(" ", _URL.sub(" ", text.lower())).split())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Character n-grams of the normalized text (the whole text if shorter)."""
+    text = normalize(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def signature(text: str) -> Optional[array]:
+    """
+    MinHash signature of a text (one-permutation hashing with densification).
+
+    Each shingle is hashed once: the top bits pick a bin, the rest is the value
+    kept if it is the bin's minimum. Empty bins borrow the next non-empty bin's
+    value (plus an offset per step), so every position stays comparable.
+
+    Returns:
+        array of NUM_PERM unsigned ints, or None for text without shingles
+    """
+    values = [_EMPTY] * NUM_PERM
+    for shingle in shingles(text):
+        # Multiplicative mixing spreads crc32's bits before splitting them
+        h = (zlib.crc32(shingle.encode("utf-8")) * 0x9E3779B1) & 0xFFFFFFFF
+        b = h >> _VALUE_BITS
+        v = h & _VALUE_MASK
+        if v < values[b]:
+            values[b] = v
+    if values.count(_EMPTY) == NUM_PERM:
+        return None
+
+    if _EMPTY in values:
+        filled = list(values)
+        for i in range(NUM_PERM):
+            if values[i] == _EMPTY:
+                step = 1
+                while values[(i + step) % NUM_PERM] == _EMPTY:
+                    step += 1
+                filled[i] = (values[(i + step) % NUM_PERM] + step * (1 << _VALUE_BITS)) & 0xFFFFFFFF
+        values = filled
+    return array("I", values)
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def _lsh_params(threshold: float) -> tuple:
+    """
+    Pick (bands, rows) for a threshold, minimizing the summed false positive and
+    false negative probability mass (integrated numerically).
+    """
+    def probability(s, bands, rows):
+        return 1 - (1 - s ** rows) ** bands
+
+    steps = 200
+    best, best_error = (NUM_PERM // 4, 4), float("inf")
+    for bands in range(1, NUM_PERM + 1):
+        if NUM_PERM % bands:
+            continue
+        rows = NUM_PERM // bands
+        false_positive = sum(probability(threshold * (i + 0.5) / steps, bands, rows)
+                             for i in range(steps)) * threshold / steps
+        false_negative = sum(1 - probability(threshold + (1 - threshold) * (i + 0.5) / steps, bands, rows)
+                             for i in range(steps)) * (1 - threshold) / steps
+        if false_positive + false_negative < best_error:
+            best, best_error = (bands, rows), false_positive + false_negative
+    return best
+
+
+class SimilarityIndex:
+    """
+    MinHash/LSH index of tweets for near-duplicate lookups.
+
+    Example:
+        index = SimilarityIndex.load()
+        index.update_from_user(client, "myhandle")
+        matches = index.query("Draft tweet text")
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD):
+        """
+        Args:
+            path: Index file (default: <data dir>/similarity.jsonl.gz)
+            threshold: Similarity at or above which tweets count as near-duplicates;
+                also tunes the LSH banding
+        """
+        self.path = Path(path) if path else get_data_dir() / "similarity.jsonl.gz"
+        self.journal_path = self.path.with_suffix(".journal")
+        self.threshold = threshold
+        self.bands, self.rows = _lsh_params(threshold)
+        self.newest_id: Optional[str] = None
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._signatures: List[array] = []
+        self._positions: Dict[str, int] = {}
+        # One dict per band: band hash -> doc position, or list of positions on collision
+        self._tables: List[Dict[int, Any]] = [{} for _ in range(self.bands)]
+        self._journaled = 0  # Records in the journal, not yet in the index file
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _band_keys(self, sig: array) -> List[int]:
+        rows = self.rows
+        return [hash(tuple(sig[i * rows:(i + 1) * rows])) for i in range(self.bands)]
+
+    def _insert(self, tweet_id: str, text: str, sig: array) -> None:
+        position = len(self._ids)
+        self._ids.append(tweet_id)
+        self._texts.append(text)
+        self._signatures.append(sig)
+        self._positions[tweet_id] = position
+        for table, key in zip(self._tables, self._band_keys(sig)):
+            existing = table.get(key)
+            if existing is None:
+                table[key] = position
+            elif isinstance(existing, list):
+                existing.append(position)
+            else:
+                table[key] = [existing, position]
+        if self.newest_id is None or int(tweet_id) > int(self.newest_id):
+            self.newest_id = tweet_id
+
+    def add(self, tweet_id, text: str) -> bool:
+        """
+        Index a tweet.
+
+        Args:
+            tweet_id: Tweet ID (str or int)
+            text: Tweet text
+
+        Returns:
+            True if added (False if already indexed or the text has no content)
+        """
+        tweet_id = str(tweet_id)
+        sig = signature(text or "")
+        with self._lock:
+            if sig is None or tweet_id in self._positions:
+                return False
+            self._insert(tweet_id, text, sig)
+            return True
+
+    def record(self, tweet_id, text: str) -> bool:
+        """
+        Index a tweet and persist it by appending to the journal.
+
+        Costs one small append instead of rewriting the index file; the
+        journal is compacted into the file once it holds
+        JOURNAL_COMPACT_RECORDS tweets.
+
+        Returns:
+            True if added (False if already indexed or the text has no content)
+        """
+        if not self.add(tweet_id, text):
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"id": str(tweet_id), "text": text}) + "\n")
+            self._journaled += 1
+            compact = self._journaled >= JOURNAL_COMPACT_RECORDS
+        if compact:
+            self.save()
+        return True
+
+    def add_many(self, tweets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index tweets from API results or an export.
+
+        Args:
+            tweets: Dicts with "id" and "text"; retweets ("RT @...") are skipped
+
+        Returns:
+            Number of tweets added
+        """
+        added = 0
+        for tweet in tweets:
+            text = tweet.get("text") or ""
+            if text.startswith("RT @"):
+                continue
+            added += self.add(tweet["id"], text)
+        return added
+
+    def _candidates(self, sig: array) -> set:
+        candidates = set()
+        for table, key in zip(self._tables, self._band_keys(sig)):
+            found = table.get(key)
+            if found is None:
+                continue
+            if isinstance(found, list):
+                candidates.update(found)
+            else:
+                candidates.add(found)
+        return candidates
+
+    def query(self, text: str, threshold: Optional[float] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find indexed tweets similar to a text.
+
+        Args:
+            text: Draft text
+            threshold: Minimum similarity (default: the index threshold); lower
+                values can miss pairs the LSH banding was not tuned for
+            limit: Maximum matches
+
+        Returns:
+            [{"id", "text", "similarity"}], most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        sig = signature(text or "")
+        if sig is None:
+            return []
+        with self._lock:
+            scored = []
+            for position in self._candidates(sig):
+                score = similarity(sig, self._signatures[position])
+                if score >= threshold:
+                    scored.append((score, position))
+            scored.sort(reverse=True)
+            return [
+                {"id": self._ids[position], "text": self._texts[position], "similarity": round(score, 3)}
+                for score, position in scored[:limit]
+            ]
+
+    def diversity_score(self, text: str) -> float:
+        """
+        Content diversity of a draft: 1 minus its highest similarity to an
+        indexed tweet (1.0 when nothing comes close).
+        """
+        matches = self.query(text, threshold=0.0, limit=1)
+        return round(1 - matches[0]["similarity"], 3) if matches else 1.0
+
+    def check(self, drafts: List[str], threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Check a batch of drafts against the index and against each other.
+
+        Args:
+            drafts: Draft texts
+            threshold: Minimum similarity to report (default: the index threshold)
+
+        Returns:
+            Per draft: {"text", "diversity", "duplicate", "matches"}; matches
+            include earlier drafts in the batch as {"draft": index, ...}
+        """
+        threshold = self.threshold if threshold is None else threshold
+        results = []
+        signatures = []
+        for i, text in enumerate(drafts):
+            matches = self.query(text, threshold=0.0, limit=5)
+            sig = signature(text or "")
+            if sig is not None:
+                for j, other in enumerate(signatures):
+                    if other is not None:
+                        score = similarity(sig, other)
+                        if score >= threshold:
+                            matches.append({"draft": j, "text": drafts[j], "similarity": round(score, 3)})
+            signatures.append(sig)
+            matches.sort(key=lambda match: match["similarity"], reverse=True)
+            best = matches[0]["similarity"] if matches else 0.0
+            results.append({
+                "text": text,
+                "diversity": round(1 - best, 3),
+                "duplicate": best >= threshold,
+                "matches": [match for match in matches if match["similarity"] >= threshold],
+            })
+        return results
+
+    def update_from_user(self, client, username: str, max_pages: Optional[int] = None) -> int:
+        """
+        Add a user's posts newer than the newest indexed one.
+
+        Args:
+            client: XAPIClient
+            username: X handle (with or without @)
+            max_pages: Stop after this many pages of 100
+
+        Returns:
+            Number of tweets added
+        """
+        added = 0
+        for page in client.get_user_posts_pages(username, since_id=self.newest_id,
+                                                fields="minimal", exclude=["retweets"],
+                                                max_pages=max_pages):
+            added += self.add_many(page["data"])
+        return added
+
+    # ---------- persistence ----------
+
+    def save(self) -> None:
+        """Write the index (atomically) to its file; the journal is folded in."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with self._lock:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(json.dumps({"version": 1, "num_perm": NUM_PERM, "shingle_size": SHINGLE_SIZE}) + "\n")
+                for tweet_id, text, sig in zip(self._ids, self._texts, self._signatures):
+                    f.write(json.dumps({
+                        "id": tweet_id,
+                        "text": text,
+                        "sig": base64.b64encode(sig.tobytes()).decode("ascii"),
+                    }) + "\n")
+            os.replace(tmp_path, self.path)
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journaled = 0
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD) -> "SimilarityIndex":
+        """
+        Load an index from its file (an empty index if there is none yet).
+
+        Args:
+            path: Index file (default: <data dir>/similarity.jsonl.gz)
+            threshold: Near-duplicate threshold
+        """
+        index = cls(path, threshold)
+        if index.path.exists():
+            index._load_file()
+        if index.journal_path.exists():
+            with open(index.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line of an interrupted append
+                    index.add(record["id"], record["text"])
+                    index._journaled += 1
+        return index
+
+    def _load_file(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("num_perm") != NUM_PERM or header.get("shingle_size") != SHINGLE_SIZE:
+                # Built with other parameters: recompute signatures from the texts
+                for line in f:
+                    record = json.loads(line)
+                    self.add(record["id"], record["text"])
+                return
+            for line in f:
+                record = json.loads(line)
+                sig = array("I")
+                sig.frombytes(base64.b64decode(record["sig"]))
+                self._insert(record["id"], record["text"], sig)
+
+
+def attach(client, index: Optional[SimilarityIndex] = None, threshold: Optional[float] = None) -> SimilarityIndex:
+    """
+    Block posts that nearly duplicate an indexed tweet, and index what is posted.
+
+    post_tweet raises XAPIDuplicateContentError (with the matches) instead of
+    sending. Replies are checked too; thread segments are checked one by one.
+
+    Args:
+        client: XAPIClient instance
+        index: Index to check against (default: the stored index, loaded
+            with threshold)
+        threshold: Blocking threshold (default: the index threshold)
+
+    Returns:
+        The attached index
+    """
+    if index is None:
+        index = SimilarityIndex.load(threshold=threshold or DEFAULT_THRESHOLD)
+
+    def check(data: Dict[str, Any]) -> None:
+        matches = index.query(data.get("text") or "", threshold=threshold)
+        if matches:
+            best = matches[0]
+            raise XAPIDuplicateContentError(
+                f"Post is {best['similarity']:.0%} similar to tweet {best['id']}: {best['text'][:80]!r}",
+                matches,
+            )
+
+    def remember(result: Dict[str, Any]) -> None:
+        data = result.get("data", {})
+        if data.get("id"):
+            index.record(data["id"], data.get("text", ""))
+
+    client.add_pre_post_check(check)
+    client.add_post_listener(remember)
+    return index
+
+
+def default_threshold() -> float:
+    """Blocking threshold from X_API_DUPLICATE_THRESHOLD (default 0.7)."""
+    value = os.getenv("X_API_DUPLICATE_THRESHOLD")
+    try:
+        return float(value) if value else DEFAULT_THRESHOLD
+    except ValueError:
+        raise XAPIClientError(f"Invalid X_API_DUPLICATE_THRESHOLD: {value}")
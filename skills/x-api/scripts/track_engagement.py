@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Track engagement of your own tweets during the decay window.
+
+Tweets posted through the client are registered automatically
+(set X_API_TRACK_ENGAGEMENT=0 to disable). Run the poller to collect samples.
+
+Usage:
+    python3 track_engagement.py run [tick_seconds]
+    python3 track_engagement.py once
+    python3 track_engagement.py add <post_url_or_id>
+    python3 track_engagement.py list
+    python3 track_engagement.py show <post_url_or_id> [metric]
+
+Examples:
+    python3 track_engagement.py run
+    python3 track_engagement.py show https://x.com/user/status/123456789 impression_count
+"""
+
+import sys
+import os
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from engagement_tracker import get_tracker, METRICS
+
+
+def _format_age(seconds: float) -> str:
+    """Format an age in seconds as e.g. 4m or 2h05m."""
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    try:
+        client = get_client()
+        tracker = get_tracker()
+
+        if command == "run":
+            tick = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+            print(f"Polling tracked tweets every {tick:g}s "
+                  f"(max {tracker.max_requests_per_tick * 3600 / tick:.0f} requests/hour). Ctrl+C to stop.")
+            try:
+                tracker.run(client, tick_interval=tick)
+            except KeyboardInterrupt:
+                print("\nStopped.")
+
+        elif command == "once":
+            stored = tracker.poll_once(client)
+            print(f"Stored {stored} sample(s)")
+
+        elif command == "add":
+            if len(sys.argv) < 3:
+                print("Usage: python3 track_engagement.py add <post_url_or_id>")
+                sys.exit(1)
+            tweet_id = client.extract_tweet_id(sys.argv[2])
+            tracker.register(tweet_id)
+            print(f"Tracking tweet {tweet_id}")
+
+        elif command == "list":
+            tracked = tracker.tracked()
+            print(f"\nTracking {len(tracked)} tweet(s)\n")
+            now = time.time()
+            for item in tracked:
+                print(f"ID: {item['id']} | Age: {_format_age(now - item['created_at'])} | "
+                      f"Samples: {item['samples']} | "
+                      f"Next poll in: {max(0, int(item['next_poll'] - now))}s")
+
+        elif command == "show":
+            if len(sys.argv) < 3:
+                print("Usage: python3 track_engagement.py show <post_url_or_id> [metric]")
+                sys.exit(1)
+            tweet_id = client.extract_tweet_id(sys.argv[2])
+            metric = sys.argv[3] if len(sys.argv) > 3 else "like_count"
+            if metric not in METRICS:
+                print(f"Error: metric must be one of: {', '.join(METRICS)}")
+                sys.exit(1)
+
+            curve = tracker.velocity(tweet_id, metric)
+            print(f"\n{metric} for tweet {tweet_id} ({len(curve)} sample(s)):\n")
+            for point in curve:
+                print(f"   {_format_age(point['age']):>7} | {point['value']:>8} | "
+                      f"{point['per_minute']:+.2f}/min")
+
+        else:
+            print(f"Unknown command: {command}")
+            print(__doc__)
+            sys.exit(1)
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Sliding-window trend counts (5m / 1h / 24h) of hashtags, mentions, links and phrases.
+
+Tweets fed in are counted into a saved state, so every command builds on
+earlier runs. "rising" ranks terms by growth over the previous window of
+the same length.
+
+Usage:
+    python3 trending.py search <query> [interval_seconds] [window] [kind]
+    python3 trending.py timeline [interval_seconds] [window] [kind]
+    python3 trending.py ingest <file.jsonl|-> [window] [kind]
+    python3 trending.py top [window] [kind] [limit]
+    python3 trending.py rising [window] [kind] [limit]
+
+    search / timeline  Fetch new tweets (with interval_seconds: keep polling),
+                       count them and print the rising terms
+    ingest             Count tweets from JSON lines (e.g. search_backfill.py output)
+    window             5m, 1h (default) or 24h
+    kind               hashtag, mention, url, word, phrase or all (default)
+
+Examples:
+    python3 trending.py search "#ai OR #ml lang:en" 60 5m hashtag
+    python3 search_backfill.py "#python" 2d | python3 trending.py ingest - 1h
+    python3 trending.py rising 24h phrase 10
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import get_client, profile_from_argv, XAPIClientError
+from trends import TrendCounter
+
+_FIELDS = "created_at,entities"
+
+
+def print_rows(title: str, rows):
+    print(title)
+    if not rows:
+        print("   (nothing yet)")
+    for i, row in enumerate(rows, 1):
+        change = f"{row['previous']} -> {row['count']}"
+        print(f"{i:>3}. {row['term'][:60]:<60} {row['count']:>7}  ({change}, accel {row['acceleration']:+.1f})")
+
+
+def parse_view(args, start: int):
+    """Read optional [window] [kind] [limit] arguments."""
+    window = args[start] if len(args) > start else "1h"
+    kind = args[start + 1] if len(args) > start + 1 else None
+    limit = int(args[start + 2]) if len(args) > start + 2 else 20
+    return window, (None if kind in (None, "", "all") else kind), limit
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = sys.argv[2:]
+
+    try:
+        trends = TrendCounter.load()
+
+        if command in ("search", "timeline"):
+            if command == "search" and not args:
+                print(__doc__)
+                sys.exit(1)
+            query = args.pop(0) if command == "search" else None
+            interval = float(args[0]) if args and args[0] else None
+            window, kind, limit = parse_view(args, 1)
+            client = get_client()
+            since_id = None
+
+            while True:
+                if query is not None:
+                    tweets = [tweet for page in client.search_tweets_pages(
+                        query, since_id=since_id, fields=_FIELDS, max_pages=5
+                    ) for tweet in page["data"]]
+                else:
+                    tweets = client.get_timeline(count=100, fields=_FIELDS)
+                    tweets = [t for t in tweets if not since_id or int(t["id"]) > int(since_id)]
+                if tweets:
+                    since_id = max((t["id"] for t in tweets), key=int)
+                trends.add_tweets(tweets)
+                trends.save()
+                print_rows(f"\n[{time.strftime('%H:%M:%S')}] +{len(tweets)} tweet(s), "
+                           f"rising over {window}:", trends.accelerating(window, kind, limit))
+                if interval is None:
+                    break
+                time.sleep(interval)
+
+        elif command == "ingest":
+            if not args:
+                print(__doc__)
+                sys.exit(1)
+            window, kind, limit = parse_view(args, 1)
+            source = sys.stdin if args[0] == "-" else open(args[0])
+            with source:
+                count = trends.add_tweets(json.loads(line) for line in source if line.strip())
+            trends.save()
+            print(f"Counted {count} tweet(s) ({trends.stats['late']} too old for every window)")
+            print_rows(f"\nRising over {window}:", trends.accelerating(window, kind, limit))
+
+        elif command in ("top", "rising"):
+            window, kind, limit = parse_view(args, 0)
+            if command == "top":
+                print_rows(f"Top over {window}:", trends.top(window, kind, limit))
+            else:
+                print_rows(f"Rising over {window}:", trends.accelerating(window, kind, limit))
+
+        else:
+            print(f"Error: unknown command: {command}")
+            sys.exit(1)
+
+    except XAPIClientError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profile_from_argv()
+    main()
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Trends - Sliding-window counts of hashtags, mentions, links and phrases
+
+Feed it tweets from search, timeline or user post results and ask what is
+popular or accelerating over the last 5 minutes, hour or day. Memory is
+fixed no matter how many tweets pass through:
+
+    - each window is a ring of time buckets covering two window lengths
+      (the current window and the one before it, for acceleration)
+    - every bucket counts terms in a count-min sketch with conservative
+      update (width x depth counters; estimates can only overcount, by a
+      small fraction of the bucket's total)
+    - every bucket keeps a Space-Saving summary of its top terms, which
+      supplies the candidates that queries rank by sketch estimate
+
+Terms are "#hashtag", "@mention", links (expanded URL without scheme, www
+and tracking parameters), words and two-word phrases; each term counts at
+most once per tweet. Time is stream time: the newest tweet seen is "now",
+so replaying an export gives the same answers as watching live.
+
+State is saved to <data dir>/trends.bin (X_API_DATA_DIR, default ~/.x-api).
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import struct
+import threading
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+try:
+    from .x_api_client import XAPIClientError, get_data_dir, snowflake_time
+except ImportError:
+    from x_api_client import XAPIClientError, get_data_dir, snowflake_time
+
+
+# name -> (window seconds, bucket seconds)
+WINDOWS = {
+    "5m": (5 * 60, 30),
+    "1h": (3600, 5 * 60),
+    "24h": (24 * 3600, 3600),
+}
+
+KINDS = ("hashtag", "mention", "url", "word", "phrase")
+
+_MAGIC = b"XTRND1\n"
+
+_HASHTAG = re.compile(r"(?<![\w&])#(\w+)")
+_MENTION = re.compile(r"(?<![\w@])@(\w{1,15})")
+_URL = re.compile(r"https?://\S+")
+_WORD = re.compile(r"[^\W\d_][\w'-]*")
+_TRACKING_PARAM = re.compile(r"(^|&)(utm_\w+|ref|ref_src|s|t|fbclid|gclid)=[^&]*")
+
+_STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been being but by can could did do
+does doing don't for from get got had has have he her here him his how i i'm if in into
+is it it's its just like me more most my no not now of on one only or our out over rt
+she so some than that that's the their them then there these they this those to too up
+us very via was we were what when where which who why will with would you you're your
+""".split())
+
+
+def normalize_url(url: str) -> str:
+    """Drop scheme, www, tracking parameters, fragment and trailing slash."""
+    url = re.sub(r"^https?://(www\.)?", "", url.strip().rstrip(".,;:!?)\"'"), flags=re.I)
+    url, _, _ = url.partition("#")
+    path, _, query = url.partition("?")
+    query = _TRACKING_PARAM.sub("", query).lstrip("&")
+    path = path.rstrip("/")
+    host, slash, rest = path.partition("/")
+    return host.lower() + slash + rest + ("?" + query if query else "")
+
+
+def term_kind(term: str) -> str:
+    """Kind of a term: hashtag, mention, url, word or phrase."""
+    if term.startswith("#"):
+        return "hashtag"
+    if term.startswith("@"):
+        return "mention"
+    if " " in term:
+        return "phrase"
+    if "/" in term or ("." in term and not term.endswith(".")):
+        return "url"
+    return "word"
+
+
+def extract_terms(tweet: Dict[str, Any], kinds: Iterable[str] = KINDS) -> List[str]:
+    """
+    Get the distinct terms of a tweet.
+
+    Args:
+        tweet: Tweet dict ("text"; entities.urls expanded_url is used when present)
+        kinds: Term kinds to extract
+
+    Returns:
+        Terms, each once
+    """
+    kinds = set(kinds)
+    text = tweet.get("text") or ""
+    terms = []
+
+    if "hashtag" in kinds:
+        terms.extend("#" + tag.lower() for tag in _HASHTAG.findall(text))
+    if "mention" in kinds:
+        terms.extend("@" + name.lower() for name in _MENTION.findall(text))
+    if "url" in kinds:
+        expanded = [entity.get("expanded_url") or entity.get("url", "")
+                    for entity in (tweet.get("entities") or {}).get("urls", [])]
+        for url in expanded or _URL.findall(text):
+            if url and "//t.co/" not in url:
+                terms.append(normalize_url(url))
+
+    if "word" in kinds or "phrase" in kinds:
+        plain = _MENTION.sub(" ", _HASHTAG.sub(" ", _URL.sub(" ", text.lower())))
+        previous = None
+        for word in _WORD.findall(plain):
+            word = word.strip("'-")
+            if len(word) < 3 or word in _STOPWORDS:
+                previous = None
+                continue
+            if "word" in kinds:
+                terms.append(word)
+            if "phrase" in kinds and previous:
+                terms.append(f"{previous} {word}")
+            previous = word
+
+    return list(dict.fromkeys(terms))
+
+
+def tweet_time(tweet: Dict[str, Any]) -> float:
+    """Creation time of a tweet (created_at, or decoded from its ID)."""
+    created = tweet.get("created_at")
+    if created:
+        return datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp()
+    return snowflake_time(tweet["id"])
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-K summary: at most `capacity` counters; a new item
+    replaces the smallest one and inherits its count (so counts can only
+    overestimate, by at most the evicted count).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        # (count when pushed, item); refreshed lazily when popped
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, item: str, count: int = 1) -> None:
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            heapq.heappush(self._heap, (count, item))
+            return
+        while True:
+            smallest, victim = heapq.heappop(self._heap)
+            current = counts[victim]
+            if current == smallest:
+                break
+            heapq.heappush(self._heap, (current, victim))
+        del counts[victim]
+        counts[item] = smallest + count
+        heapq.heappush(self._heap, (smallest + count, item))
+
+
+class _Window:
+    """Ring of per-bucket count-min sketches and top-K summaries for one window length."""
+
+    def __init__(self, span: int, bucket_seconds: int, width: int, depth: int, top_k: int):
+        self.span = span
+        self.bucket_seconds = bucket_seconds
+        self.per_window = span // bucket_seconds
+        self.slots = 2 * self.per_window
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self._zero = array("I", [0]) * (width * depth)
+        self.bucket_ids = [-1] * self.slots
+        self.sketches = [array("I", self._zero) for _ in range(self.slots)]
+        self.heavy = [SpaceSaving(top_k) for _ in range(self.slots)]
+        self.tweets = [0] * self.slots
+
+    def _slot(self, bucket_id: int) -> int:
+        slot = bucket_id % self.slots
+        if self.bucket_ids[slot] != bucket_id:
+            self.bucket_ids[slot] = bucket_id
+            self.sketches[slot][:] = self._zero
+            self.heavy[slot] = SpaceSaving(self.top_k)
+            self.tweets[slot] = 0
+        return slot
+
+    def add(self, timestamp: float, terms: List[str], positions: List[List[int]]) -> None:
+        slot = self._slot(int(timestamp // self.bucket_seconds))
+        sketch = self.sketches[slot]
+        heavy = self.heavy[slot]
+        self.tweets[slot] += 1
+        for term, cells in zip(terms, positions):
+            # Conservative update: only raise the counters that are at the minimum
+            # (the others already overcount), which cuts the noise of busy buckets
+            target = min([sketch[cell] for cell in cells]) + 1
+            for cell in cells:
+                if sketch[cell] < target:
+                    sketch[cell] = target
+            heavy.add(term)
+
+    def live_slots(self, now: float, previous: bool = False) -> List[int]:
+        """Slots holding the current window ending at now (or the window before it)."""
+        last = int(now // self.bucket_seconds) - (self.per_window if previous else 0)
+        wanted = range(last - self.per_window + 1, last + 1)
+        return [bucket_id % self.slots for bucket_id in wanted
+                if self.bucket_ids[bucket_id % self.slots] == bucket_id]
+
+    def estimate(self, cells: List[int], slots: List[int]) -> int:
+        """Count-min estimate over several buckets: min over rows of the summed counters."""
+        if not slots:
+            return 0
+        return min(sum(self.sketches[slot][cell] for slot in slots) for cell in cells)
+
+
+class TrendCounter:
+    """
+    Bounded-memory sliding-window term counts over a stream of tweets.
+
+    Example:
+        trends = TrendCounter.load()
+        trends.add_tweets(client.search_tweets("#ai", max_results=100, fields="full"))
+        for row in trends.accelerating("1h", kind="hashtag"):
+            print(row["term"], row["count"], row["previous"])
+        trends.save()
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        width: int = 2048,
+        depth: int = 4,
+        top_k: int = 200,
+        kinds: Iterable[str] = KINDS,
+    ):
+        """
+        Args:
+            path: State file (default: <data dir>/trends.bin)
+            width: Counters per sketch row (a power of two); overcounting is
+                at most about e / width of a bucket's term total
+            depth: Sketch rows (overcounting beyond that bound has
+                probability about e ** -depth)
+            top_k: Candidate terms kept per bucket
+            kinds: Term kinds to count (hashtag, mention, url, word, phrase)
+        """
+        if width & (width - 1):
+            raise XAPIClientError("TrendCounter width must be a power of two")
+        self.path = Path(path) if path else get_data_dir() / "trends.bin"
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.kinds = tuple(kinds)
+        self.now = 0.0
+        self.stats = {"tweets": 0, "terms": 0, "late": 0}
+        self._words = struct.Struct(f"<{depth}I")
+        self._lock = threading.Lock()
+        self.windows = {
+            name: _Window(span, bucket_seconds, width, depth, top_k)
+            for name, (span, bucket_seconds) in WINDOWS.items()
+        }
+
+    def _cells(self, term: str) -> List[int]:
+        """Counter index of a term in each sketch row (shared by all buckets)."""
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=self._words.size).digest()
+        mask = self.width - 1
+        return [row * self.width + (word & mask) for row, word in enumerate(self._words.unpack(digest))]
+
+    def add_tweet(self, tweet: Dict[str, Any]) -> None:
+        """Count one tweet's terms at its creation time."""
+        timestamp = tweet_time(tweet)
+        terms = extract_terms(tweet, self.kinds)
+        positions = [self._cells(term) for term in terms]
+        with self._lock:
+            self.now = max(self.now, timestamp)
+            self.stats["tweets"] += 1
+            self.stats["terms"] += len(terms)
+            counted = False
+            for window in self.windows.values():
+                bucket_seconds = window.bucket_seconds
+                # Older than the ring holds: it would overwrite newer buckets
+                if int(timestamp // bucket_seconds) > int(self.now // bucket_seconds) - window.slots:
+                    window.add(timestamp, terms, positions)
+                    counted = True
+            if not counted:
+                self.stats["late"] += 1
+
+    def add_tweets(self, tweets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Count tweets from search, timeline or user posts results (or JSON lines).
+
+        Returns:
+            Number of tweets counted
+        """
+        count = 0
+        for tweet in tweets:
+            self.add_tweet(tweet)
+            count += 1
+        return count
+
+    def _window(self, window: str) -> _Window:
+        if window not in self.windows:
+            raise XAPIClientError(f"Unknown window: {window} (choose from {', '.join(self.windows)})")
+        return self.windows[window]
+
+    def count(self, term: str, window: str = "1h") -> int:
+        """Estimated tweets containing a term in the window ending now."""
+        w = self._window(window)
+        with self._lock:
+            return w.estimate(self._cells(term), w.live_slots(self.now))
+
+    def _rows(self, window: str, kind: Optional[str]) -> List[Dict[str, Any]]:
+        w = self._window(window)
+        with self._lock:
+            current = w.live_slots(self.now)
+            previous = w.live_slots(self.now, previous=True)
+            candidates = set()
+            for slot in current:
+                candidates.update(w.heavy[slot].counts)
+            rows = []
+            for term in candidates:
+                if kind and term_kind(term) != kind:
+                    continue
+                cells = self._cells(term)
+                count = w.estimate(cells, current)
+                before = w.estimate(cells, previous)
+                rows.append({
+                    "term": term,
+                    "count": count,
+                    "previous": before,
+                    # Poisson-style z-score: growth relative to the noise expected at that volume
+                    "acceleration": round((count - before) / math.sqrt(before + 1), 3),
+                })
+            return rows
+
+    def top(self, window: str = "1h", kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Most frequent terms in the window ending now.
+
+        Args:
+            window: "5m", "1h" or "24h"
+            kind: Only this term kind (hashtag, mention, url, word, phrase)
+            limit: Maximum rows
+
+        Returns:
+            [{"term", "count", "previous", "acceleration"}], highest count first
+        """
+        rows = self._rows(window, kind)
+        rows.sort(key=lambda row: (-row["count"], row["term"]))
+        return rows[:limit]
+
+    def accelerating(self, window: str = "1h", kind: Optional[str] = None, limit: int = 20,
+                     min_count: int = 3) -> List[Dict[str, Any]]:
+        """
+        Terms growing fastest: this window compared with the one before it.
+
+        Args:
+            window: "5m", "1h" or "24h"
+            kind: Only this term kind (hashtag, mention, url, word, phrase)
+            limit: Maximum rows
+            min_count: Ignore terms seen fewer times in the current window
+
+        Returns:
+            [{"term", "count", "previous", "acceleration"}], fastest growing first
+        """
+        rows = [row for row in self._rows(window, kind)
+                if row["count"] >= min_count and row["count"] > row["previous"]]
+        rows.sort(key=lambda row: (-row["acceleration"], row["term"]))
+        return rows[:limit]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory of the sketches and top-K summaries."""
+        counters = sum(len(sketch) * sketch.itemsize for w in self.windows.values() for sketch in w.sketches)
+        # Each summary entry costs a str (~60 bytes), a dict slot and a heap tuple
+        entries = sum(len(heavy.counts) for w in self.windows.values() for heavy in w.heavy)
+        return counters + entries * 150
+
+    # ---------- persistence ----------
+
+    def save(self) -> None:
+        """Write the state (atomically) to its file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            header = json.dumps({
+                "width": self.width,
+                "depth": self.depth,
+                "top_k": self.top_k,
+                "kinds": list(self.kinds),
+                "now": self.now,
+                "stats": self.stats,
+                "windows": {
+                    name: {
+                        "span": w.span,
+                        "bucket_seconds": w.bucket_seconds,
+                        "bucket_ids": w.bucket_ids,
+                        "tweets": w.tweets,
+                        "heavy": [heavy.counts for heavy in w.heavy],
+                    }
+                    for name, w in self.windows.items()
+                },
+            }).encode("utf-8")
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(_MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                for w in self.windows.values():
+                    for sketch in w.sketches:
+                        f.write(sketch.tobytes())
+            os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, **kwargs) -> "TrendCounter":
+        """
+        Load saved state (a fresh counter if there is none, or it was saved
+        with other sizes or windows).
+
+        Args:
+            path: State file (default: <data dir>/trends.bin)
+            **kwargs: TrendCounter options (width, depth, top_k, kinds)
+        """
+        counter = cls(path, **kwargs)
+        if not counter.path.exists():
+            return counter
+        with open(counter.path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise XAPIClientError(f"Not a trends state file: {counter.path}")
+            header = json.loads(f.read(struct.unpack("<I", f.read(4))[0]))
+            layout = {name: [w["span"], w["bucket_seconds"]] for name, w in header["windows"].items()}
+            if (header["width"], header["depth"], header["top_k"], header["kinds"]) != (
+                counter.width, counter.depth, counter.top_k, list(counter.kinds)
+            ) or layout != {name: list(value) for name, value in WINDOWS.items()}:
+                return counter
+            for name, w in counter.windows.items():
+                saved = header["windows"][name]
+                w.bucket_ids = saved["bucket_ids"]
+                w.tweets = saved["tweets"]
+                for slot, counts in enumerate(saved["heavy"]):
+                    heavy = SpaceSaving(counter.top_k)
+                    heavy.counts = counts
+                    heavy._heap = [(count, item) for item, count in counts.items()]
+                    heapq.heapify(heavy._heap)
+                    w.heavy[slot] = heavy
+                for sketch in w.sketches:
+                    sketch[:] = array("I", f.read(len(sketch) * sketch.itemsize))
+        counter.now = header["now"]
+        counter.stats = header["stats"]
+        return counter
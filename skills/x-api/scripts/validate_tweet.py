@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Check drafts against X's limits locally, without calling the API.
+
+Counts length the way X does (URLs count 23, CJK and emoji count 2,
+limit 280) and checks media and reply/quote parameters.
+
+Usage: python3 validate_tweet.py <draft> [draft...] [--media=N] [--quote]
+
+    -         Read drafts from stdin, one per line
+    --media=N Number of media attached to each draft
+    --quote   Drafts are quote tweets
+
+Exits with status 2 when any draft is invalid.
+
+Examples:
+    python3 validate_tweet.py "Shipping today! https://example.com/release-notes"
+    python3 validate_tweet.py "日本語のツイート" --media=2
+    cat drafts.txt | python3 validate_tweet.py -
+"""
+
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from x_api_client import MAX_TWEET_LENGTH, tweet_length, validate_tweet
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    media_count = 0
+    for flag in flags:
+        if flag.startswith("--media="):
+            media_count = int(flag.partition("=")[2])
+    media_ids = [str(i) for i in range(media_count)]
+    quote_tweet_id = "1" if "--quote" in flags else None
+
+    drafts = [line.rstrip("\n") for line in sys.stdin] if args == ["-"] else args
+    invalid = 0
+    for draft in drafts:
+        length = tweet_length(draft)
+        problems = validate_tweet(draft, media_ids=media_ids, quote_tweet_id=quote_tweet_id)
+        status = "INVALID" if problems else "ok"
+        print(f"[{status}] {length}/{MAX_TWEET_LENGTH} ({MAX_TWEET_LENGTH - length} left): "
+              f"{draft[:80]}{'...' if len(draft) > 80 else ''}")
+        for problem in problems:
+            print(f"    {problem}")
+        invalid += bool(problems)
+
+    if invalid:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,18 +15,31 @@ Or use a .env file in the root directory with these variables.
 """
 
 import os
+import sys
 import json
 import re
+import abc
 import base64
 import hashlib
 import hmac
+import html
 import time
 import random
+import unicodedata
+import copy
+import heapq
+import threading
 import urllib.parse
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Union
 from pathlib import Path
 
+# Start of client import, the beginning of the "import" phase when profiling
+_IMPORT_STARTED = time.perf_counter()
+
 try:
     import requests
 except ImportError:
@@ -34,9 +47,105 @@ except ImportError:
     raise
 
 
+class JSONCodec:
+    """A named pair of JSON decode/encode functions."""
+
+    def __init__(self, name: str, loads, dumps):
+        self.name = name
+        self.loads = loads  # bytes or str -> object
+        self.dumps = dumps  # object -> str
+
+
+def _stdlib_codec() -> JSONCodec:
+    return JSONCodec("json", json.loads, lambda obj: json.dumps(obj, separators=(",", ":")))
+
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+    return JSONCodec("orjson", orjson.loads, lambda obj: orjson.dumps(obj).decode("utf-8"))
+
+
+def _ujson_codec() -> JSONCodec:
+    import ujson
+    return JSONCodec("ujson", ujson.loads, ujson.dumps)
+
+
+# Codec factories in order of preference; optional libraries are used when installed
+_CODEC_FACTORIES = {
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+    "json": _stdlib_codec,
+}
+
+
+def available_codecs() -> Dict[str, JSONCodec]:
+    """Get every JSON codec that can be loaded, fastest first."""
+    codecs = {}
+    for name, factory in _CODEC_FACTORIES.items():
+        try:
+            codecs[name] = factory()
+        except ImportError:
+            pass
+    return codecs
+
+
+def register_codec(name: str, factory) -> None:
+    """
+    Register a JSON codec factory, preferred over the built-in ones.
+
+    Args:
+        name: Codec name (selectable with X_API_JSON_CODEC)
+        factory: Callable returning a JSONCodec (may raise ImportError)
+    """
+    global _CODEC_FACTORIES
+    _CODEC_FACTORIES = dict([(name, factory)] + list(_CODEC_FACTORIES.items()))
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Get a JSON codec.
+
+    Args:
+        name: Codec name (default: X_API_JSON_CODEC, else the fastest installed)
+
+    Returns:
+        The codec; falls back to the stdlib json module
+    """
+    name = name or os.getenv("X_API_JSON_CODEC")
+    if name:
+        if name not in _CODEC_FACTORIES:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        try:
+            return _CODEC_FACTORIES[name]()
+        except ImportError:
+            return _stdlib_codec()
+    return next(iter(available_codecs().values()))
+
+
+# Named field projections for read calls. id and text are always returned.
+FIELD_PROFILES: Dict[str, Dict[str, str]] = {
+    "minimal": {
+        "tweet.fields": "created_at",
+    },
+    "metrics": {
+        "tweet.fields": "created_at,public_metrics",
+    },
+    "full": {
+        "tweet.fields": "created_at,public_metrics,reply_settings,author_id,lang,"
+                        "conversation_id,entities,referenced_tweets",
+        "expansions": "author_id",
+        "user.fields": "name,username,verified,public_metrics",
+    },
+}
+
+
 class XAPIClientError(Exception):
     """Base exception for X API client errors."""
-    pass
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        # HTTP status code of the failed response, if any
+        self.status_code = status_code
 
 
 class XAPIAuthenticationError(XAPIClientError):
@@ -46,13 +155,757 @@ class XAPIAuthenticationError(XAPIClientError):
 
 class XAPIRateLimitError(XAPIClientError):
     """Rate limit exceeded errors."""
+
+    def __init__(self, message: str = "Rate limit exceeded", reset_at: Optional[float] = None):
+        super().__init__(message, status_code=429)
+        # Unix time at which the rate limit window resets (from x-rate-limit-reset)
+        self.reset_at = reset_at
+
+
+class XAPIConnectionError(XAPIClientError):
+    """The request failed in transit (timeout, connection reset); it may or may not have been applied."""
     pass
 
 
+class XAPICircuitOpenError(XAPIClientError):
+    """Requests to an endpoint fail fast because it has been failing (5xx, timeouts)."""
+
+    def __init__(self, message: str, retry_at: Optional[float] = None):
+        super().__init__(message)
+        # Unix time after which a probe request will be let through
+        self.retry_at = retry_at
+
+
+class XAPIDuplicateContentError(XAPIClientError):
+    """A post was blocked because it nearly duplicates earlier posts."""
+
+    def __init__(self, message: str, matches: List[Dict[str, Any]]):
+        super().__init__(message)
+        # Similar earlier posts: [{"id", "text", "similarity"}], most similar first
+        self.matches = matches
+
+
+class XAPIValidationError(XAPIClientError):
+    """A post failed local validation and was not sent."""
+
+    def __init__(self, message: str, problems: List[str]):
+        super().__init__(message)
+        # Every problem found, e.g. ["Text is 291 characters (limit 280)"]
+        self.problems = problems
+
+
+class XAPIThreadError(XAPIClientError):
+    """A thread could not be posted completely; carries what is needed to resume."""
+
+    def __init__(
+        self,
+        message: str,
+        failed_index: int,
+        posted: List[Dict[str, Any]],
+        last_tweet_id: Optional[str],
+        media_ids: List[Optional[List[str]]],
+        unknown_outcome: bool = False,
+    ):
+        super().__init__(message)
+        # Index of the first segment that was not posted (resume from here)
+        self.failed_index = failed_index
+        # Responses of the segments posted by this call
+        self.posted = posted
+        # ID to pass as reply_to_id when resuming (None if nothing posted yet)
+        self.last_tweet_id = last_tweet_id
+        # Uploaded media IDs per segment (None where not uploaded), reusable on resume
+        self.media_ids = media_ids
+        # The connection was lost while posting the failed segment: it may have been posted
+        self.unknown_outcome = unknown_outcome
+
+
+def parse_timeframe(timeframe: str) -> Optional[timedelta]:
+    """
+    Parse a timeframe like "30min", "2hrs", "1d" or "1w".
+
+    Args:
+        timeframe: Amount followed by a unit (min, hr, h, d, day, w, week)
+
+    Returns:
+        The duration, or None if the timeframe is not recognized
+    """
+    time_mappings = {
+        "min": "minutes",
+        "mins": "minutes",
+        "hr": "hours",
+        "hrs": "hours",
+        "h": "hours",
+        "d": "days",
+        "day": "days",
+        "days": "days",
+        "w": "weeks",
+        "week": "weeks",
+        "weeks": "weeks",
+    }
+
+    match = re.match(r'^(\d+)\s*([a-z]+)$', timeframe.strip().lower())
+    if not match or match.group(2) not in time_mappings:
+        return None
+    return timedelta(**{time_mappings[match.group(2)]: int(match.group(1))})
+
+
+def percentile(values, fraction: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Numbers, in any order
+        fraction: Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        The value at that rank, or 0 for no values
+    """
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+# Valid X handle (without the @)
+HANDLE_PATTERN = re.compile(r"^[A-Za-z0-9_]{1,15}$")
+
+
+def read_list(value: str) -> List[str]:
+    """Read a comma-separated list, or one item per line from a file (# starts a comment line)."""
+    if os.path.isfile(value):
+        with open(value) as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and entry/byte bounds.
+
+    Expired entries are dropped when read and evicted ahead of live ones;
+    when the cache is over max_entries or max_bytes, the least recently
+    used entries are evicted. Supports negative caching: store NOT_FOUND
+    with set_missing() to remember that a key does not exist.
+    """
+
+    NOT_FOUND = object()  # Marker for negatively cached keys
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = None,
+        ttl: float = 3600,
+        negative_ttl: float = 300,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries (None for no limit)
+            max_bytes: Maximum approximate size of values in bytes (None for no limit)
+            ttl: Seconds an entry stays valid
+            negative_ttl: Seconds a NOT_FOUND entry stays valid
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _size_of(self, value: Any) -> int:
+        """Approximate size of a value (only computed when max_bytes is set)."""
+        if self.max_bytes is None or value is self.NOT_FOUND:
+            return 0
+        try:
+            return len(json.dumps(value, separators=(",", ":")))
+        except (TypeError, ValueError):
+            return sys.getsizeof(value)
+
+    def _remove(self, key: Any) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get a live value and mark it most recently used.
+
+        Returns:
+            The value, NOT_FOUND for negatively cached keys, or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[1] <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            if entry[0] is self.NOT_FOUND:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[0]
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting expired and least recently used entries as needed."""
+        if ttl is None:
+            ttl = self.negative_ttl if value is self.NOT_FOUND else self.ttl
+        size = self._size_of(value)
+        now = time.time()
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, now + ttl, size)
+            self._bytes += size
+
+            # Expired entries at the LRU end go first, then live ones while over budget
+            while self._data:
+                oldest_key, (_, expires_at, _) = next(iter(self._data.items()))
+                if expires_at <= now and oldest_key != key:
+                    self._remove(oldest_key)
+                    self.expirations += 1
+                elif self._over_budget() and oldest_key != key:
+                    self._remove(oldest_key)
+                    self.evictions += 1
+                else:
+                    break
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._data) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def set_missing(self, key: Any) -> None:
+        """Remember that key does not exist (for negative_ttl seconds)."""
+        self.set(key, self.NOT_FOUND)
+
+    def delete(self, key: Any) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def purge_expired(self) -> int:
+        """
+        Remove every expired entry.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._data.items() if entry[1] <= now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class _SingleFlight:
+    """
+    Coalesces concurrent identical calls into a single in-flight call.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight wait and receive (a copy of) the same result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, Dict[str, Any]] = {}
+        self.executed = 0  # Calls actually run
+        self.coalesced = 0  # Calls served by another caller's in-flight call
+
+    def do(self, key, fn):
+        """Run fn for key, or wait for the identical call already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"event": threading.Event(), "waiters": 0, "copies": [], "error": None}
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                call["waiters"] += 1
+                self.coalesced += 1
+
+        if not leader:
+            call["event"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["copies"].pop()
+
+        result = None
+        try:
+            result = fn()
+            return result
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call["waiters"]
+            # Every follower gets its own copy, made before the leader's caller
+            # can mutate the result, so mutations don't leak between them
+            if call["error"] is None:
+                call["copies"] = [copy.deepcopy(result) for _ in range(waiters)]
+            call["event"].set()
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one endpoint group.
+
+    While responses are healthy and the limit is in use, it grows by about
+    one slot per round of requests (additive increase). A 429, 5xx or
+    connection failure multiplies it by `backoff`, and latency well above
+    the best seen shrinks it gently; decreases happen at most once per
+    `cooldown` so a burst of simultaneous failures counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._best_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a slot is free under the current limit."""
+        with self._cond:
+            while self.in_flight >= max(self.min_limit, int(self.limit)):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(float(self.min_limit), self.limit * factor)
+            self._last_decrease = now
+
+    def release(self, latency: float, healthy: bool) -> None:
+        """Free a slot and adapt the limit to the request's outcome."""
+        with self._cond:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            if not healthy:
+                self._decrease(self.backoff)
+            else:
+                # Baseline drifts up slowly so one unusually fast response doesn't pin it
+                if self._best_latency is None or latency < self._best_latency:
+                    self._best_latency = latency
+                else:
+                    self._best_latency *= 1.01
+                if latency > self._best_latency * self.latency_tolerance:
+                    self._decrease(0.9)
+                elif saturated:
+                    self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an endpoint group is degraded.
+
+    Opens after `failure_threshold` consecutive 5xx/connection failures (for
+    `recovery_timeout` seconds) or on a 429 (until the rate limit resets).
+    Once the wait is over a single probe request is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"  # closed, open or half_open
+        self.failures = 0
+        self.open_until = 0.0
+        self.rate_limited = False
+        self._lock = threading.Lock()
+
+    def check(self, name: str = "endpoint") -> None:
+        """
+        Raise if requests should not be sent now.
+
+        Raises:
+            XAPIRateLimitError: Open because of a 429
+            XAPICircuitOpenError: Open because of repeated failures
+        """
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.time() >= self.open_until:
+                self.state = "half_open"  # This caller is the probe
+                return
+            open_until, rate_limited = self.open_until, self.rate_limited
+
+        if rate_limited:
+            raise XAPIRateLimitError("Rate limit exceeded", reset_at=open_until)
+        raise XAPICircuitOpenError(
+            f"{name} is failing; not sending requests for {max(0.0, open_until - time.time()):.0f}s",
+            retry_at=open_until,
+        )
+
+    def record(self, status_code: Optional[int], reset_at: Optional[float] = None) -> None:
+        """
+        Record a request outcome.
+
+        Args:
+            status_code: HTTP status, or None if the request failed in transit
+            reset_at: Rate limit reset time, for 429s
+        """
+        with self._lock:
+            if status_code == 429:
+                self.state = "open"
+                self.rate_limited = True
+                self.open_until = reset_at or time.time() + self.recovery_timeout
+            elif status_code is None or status_code >= 500:
+                self.failures += 1
+                if self.state == "half_open" or self.failures >= self.failure_threshold:
+                    self.state = "open"
+                    self.rate_limited = False
+                    self.open_until = time.time() + self.recovery_timeout
+            else:
+                self.state = "closed"
+                self.failures = 0
+                self.rate_limited = False
+
+
+class TransportError(Exception):
+    """A request that got no HTTP response (connection, TLS or timeout failure)."""
+
+
+class Transport(abc.ABC):
+    """
+    Sends signed HTTP requests for the client.
+
+    The client builds and signs every request (OAuth header, query params)
+    before handing it over, so signing is identical whatever the transport.
+    send() returns a response with status_code, ok, headers (case-insensitive),
+    content and text, and raises TransportError (or a requests exception) when
+    no response arrives.
+    """
+
+    name = "transport"
+
+    @abc.abstractmethod
+    def send(self, method: str, url: str, headers: Dict[str, str], params: Optional[Dict] = None,
+             json: Any = None, data: Optional[Dict] = None, files: Optional[Dict] = None,
+             timeout: Optional[float] = None):
+        """Send one request and return its response."""
+
+    def close(self) -> None:
+        """Close pooled connections."""
+
+
+class RequestsTransport(Transport):
+    """
+    HTTP/1.1 over requests, with one keep-alive Session per thread (a Session
+    is not thread-safe), so each thread holds its own connection to the API.
+    """
+
+    name = "requests"
+
+    def __init__(self):
+        self._local = threading.local()
+        # Weak, so a finished thread's session is freed with its thread-local
+        self._sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP session of the calling thread."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            with self._lock:
+                self._sessions.add(session)
+        return session
+
+    def send(self, method: str, url: str, headers: Dict[str, str], params: Optional[Dict] = None,
+             json: Any = None, data: Optional[Dict] = None, files: Optional[Dict] = None,
+             timeout: Optional[float] = None) -> "requests.Response":
+        return self.session.request(method, url, headers=headers, params=params, json=json,
+                                    data=data, files=files, timeout=timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+TRANSPORTS = ("requests", "http2", "httpx", "h2c")
+
+
+def make_transport(name: Optional[str] = None) -> Transport:
+    """
+    Create a transport by name.
+
+    Args:
+        name: "requests" (default), "http2" (httpx with HTTP/2), "httpx"
+            (httpx over HTTP/1.1) or "h2c" (httpx with HTTP/2 by prior
+            knowledge, also over plain http); None reads X_API_TRANSPORT
+
+    Returns:
+        A Transport
+
+    Raises:
+        XAPIClientError: Unknown name, or httpx is not installed
+    """
+    name = (name or os.getenv("X_API_TRANSPORT") or "requests").strip().lower()
+    if name == "requests":
+        return RequestsTransport()
+    if name in ("http2", "httpx", "h2c"):
+        return _import_sibling("http2_transport").HTTPXTransport(http2=name != "httpx",
+                                                                 http1=name != "h2c")
+    raise XAPIClientError(f"Unknown transport: {name} (choose from {', '.join(TRANSPORTS)})")
+
+
+# Numeric path segments after the version prefix (/2/users/123 -> /2/users/:id)
+_ID_SEGMENT = re.compile(r"(?<=.)/\d+(?=/|$)")
+
+
+def endpoint_group(method: str, endpoint: str) -> str:
+    """Group endpoints that share limits (/2/users/123/tweets -> GET /2/users/:id/tweets)."""
+    endpoint = re.sub(r"/by/username/[^/]+", "/by/username/:username", endpoint)
+    return f"{method.upper()} {_ID_SEGMENT.sub('/:id', endpoint)}"
+
+
+# Twitter snowflake epoch (ms): tweet IDs encode their creation time
+SNOWFLAKE_EPOCH_MS = 1288834974657
+
+
+def snowflake_time(tweet_id: str) -> float:
+    """
+    Get a tweet's creation time from its ID.
+
+    Args:
+        tweet_id: Tweet ID
+
+    Returns:
+        Unix timestamp in seconds (millisecond precision)
+    """
+    return ((int(tweet_id) >> 22) + SNOWFLAKE_EPOCH_MS) / 1000.0
+
+
+def snowflake_id(timestamp: float) -> str:
+    """
+    Get the smallest tweet ID that could be created at a given time.
+
+    Args:
+        timestamp: Unix timestamp in seconds
+
+    Returns:
+        Tweet ID as string (usable as since_id / until_id bound)
+    """
+    return str(max(0, int(timestamp * 1000) - SNOWFLAKE_EPOCH_MS) << 22)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize tweet or DM text for matching (X shortens URLs and escapes entities)."""
+    text = html.unescape(text or "")
+    text = re.sub(r"https?://\S+", "", text)
+    return " ".join(text.split())
+
+
+# Tweet length, counted like twitter-text v3: code points (after NFC) weigh 2
+# except in these ranges, every URL counts 23, and an emoji sequence counts 2.
+# Premium accounts can post longer tweets: set X_TWEET_MAX_LENGTH=25000
+MAX_TWEET_LENGTH = int(os.getenv("X_TWEET_MAX_LENGTH", "280"))
+MAX_MEDIA_PER_TWEET = 4
+URL_LENGTH = 23
+_LIGHT_RANGES = "\u0000-\u10ff\u2000-\u200d\u2010-\u201f\u2032-\u2037"
+# Runs of weight-2 characters: one match per run rather than per character
+_HEAVY_RUN = re.compile(f"[^{_LIGHT_RANGES}]+")
+_TWEET_URL = re.compile(
+    r"(?<![\w@$#.-])(?:https?://[^\s<>\"]+|"
+    r"(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+(?:com|org|net|edu|gov|io|co|ai|dev|app|me|ly|tv|"
+    r"info|biz|xyz|us|uk|de|fr|jp|in|ca|au|ru|br|es|it|nl)\b(?::\d+)?(?:/[^\s<>\"]*)?)",
+    re.IGNORECASE,
+)
+_URL_TRAILING = ".,:;!?'\")]"
+# Every URL above contains one of these; cheap to rule out before the full scan
+_URL_HINT = re.compile(r"://|\.[a-z]", re.IGNORECASE)
+_EMOJI_PART = "[\U0001f000-\U0001faff\u2300-\u23ff\u2600-\u27bf\u2b00-\u2bff][\ufe0e\ufe0f\U0001f3fb-\U0001f3ff\U000e0020-\U000e007f]*"
+_EMOJI = re.compile(
+    f"[\U0001f1e6-\U0001f1ff]{{2}}|[#*0-9]\ufe0f?\u20e3|{_EMOJI_PART}(?:\u200d{_EMOJI_PART})*"
+)
+# Every emoji sequence above contains one of these
+_EMOJI_HINT = re.compile("[\U0001f000-\U0001faff\u2300-\u23ff\u2600-\u27bf\u2b00-\u2bff\u20e3]")
+
+
+def _heavy_count(text: str) -> int:
+    """Number of weight-2 characters in text."""
+    return sum(map(len, _HEAVY_RUN.findall(text)))
+
+
+def _weighted_chars(text: str) -> int:
+    """Weighted length of text without URLs."""
+    if text.isascii():
+        return len(text)
+    length = len(text) + _heavy_count(text)
+    hint = _EMOJI_HINT.search(text)
+    if hint is None:
+        return length
+    # No sequence starts more than two characters (a keycap) before its first hint
+    for match in _EMOJI.finditer(text, max(0, hint.start() - 2)):
+        sequence = match.group()
+        # The whole sequence (ZWJs, modifiers, flags) counts as one emoji of weight 2
+        length += 2 - (len(sequence) + _heavy_count(sequence))
+    return length
+
+
+def tweet_length(text: str) -> int:
+    """
+    Get the weighted length of tweet text, as X counts it against the 280 limit.
+
+    Args:
+        text: Tweet text
+
+    Returns:
+        Weighted length (CJK and emoji count 2, URLs count 23)
+    """
+    if text.isascii():
+        if "." not in text:
+            # Fast path: plain ASCII without URLs counts one per character
+            return len(text)
+    else:
+        text = unicodedata.normalize("NFC", text)
+    length = 0
+    position = 0
+    chunk_end = 0
+    for hint in _URL_HINT.finditer(text):
+        if hint.start() < chunk_end:
+            continue
+        # URLs contain no spaces: only the space-delimited chunk around a hint can hold one
+        chunk_start = text.rfind(" ", 0, hint.start()) + 1
+        chunk_end = text.find(" ", hint.end())
+        if chunk_end < 0:
+            chunk_end = len(text)
+        for match in _TWEET_URL.finditer(text, chunk_start, chunk_end):
+            url = match.group().rstrip(_URL_TRAILING)
+            length += _weighted_chars(text[position:match.start()]) + URL_LENGTH
+            position = match.start() + len(url)
+    return length + _weighted_chars(text[position:])
+
+
+def validate_tweet(
+    text: str,
+    media_ids: Optional[List[str]] = None,
+    reply_to_id: Optional[str] = None,
+    quote_tweet_id: Optional[str] = None,
+) -> List[str]:
+    """
+    Check a post against X's limits before sending it.
+
+    Args:
+        text: Tweet text
+        media_ids: Media IDs (or paths, for drafts) to attach
+        reply_to_id: Tweet ID (or URL) being replied to
+        quote_tweet_id: Tweet ID (or URL) being quoted
+
+    Returns:
+        Problems found (empty if the post is valid)
+    """
+    problems = []
+    media_ids = list(media_ids or [])
+    if not text.strip() and not media_ids:
+        problems.append("Text is empty")
+    else:
+        length = tweet_length(text)
+        if length > MAX_TWEET_LENGTH:
+            problems.append(f"Text is {length} characters (limit {MAX_TWEET_LENGTH}, URLs count {URL_LENGTH})")
+    if len(media_ids) > MAX_MEDIA_PER_TWEET:
+        problems.append(f"{len(media_ids)} media attached (limit {MAX_MEDIA_PER_TWEET})")
+    if len(set(media_ids)) < len(media_ids):
+        problems.append("The same media is attached more than once")
+    if quote_tweet_id and media_ids:
+        problems.append("A quote tweet cannot have media attached")
+    for name, value in (("reply_to_id", reply_to_id), ("quote_tweet_id", quote_tweet_id)):
+        if value is not None and not re.fullmatch(r"\d+|\S*/status/\d+\S*", str(value)):
+            problems.append(f"{name} is not a tweet ID or URL: {value}")
+    if reply_to_id and quote_tweet_id and str(reply_to_id) == str(quote_tweet_id):
+        problems.append("A post cannot reply to and quote the same tweet")
+    return problems
+
+
+def check_tweet(text: str, **kwargs) -> None:
+    """
+    Validate a post (see validate_tweet).
+
+    Raises:
+        XAPIValidationError: Listing every problem found
+    """
+    problems = validate_tweet(text, **kwargs)
+    if problems:
+        raise XAPIValidationError(f"Invalid post: {'; '.join(problems)}", problems)
+
+
 class XAPIClient:
-    """X API v2 Client using OAuth 1.0a authentication."""
+    """
+    X API v2 Client using OAuth 1.0a authentication.
+
+    Safe to share across threads: HTTP sessions are per thread, caches are
+    locked, and concurrent identical GET requests are coalesced into one.
+    """
 
     BASE_URL = "https://api.x.com"
+    REQUEST_TIMEOUT = 30  # Seconds before a request is abandoned
+    TWEET_LOOKUP_BATCH_SIZE = 100  # Max IDs per GET /2/tweets request
+    USER_FIELDS = "created_at,description,public_metrics,verified,protected"
+    USER_LOOKUP_BATCH_SIZE = 100  # Max usernames per GET /2/users/by request
+    USER_CACHE_MAX_ENTRIES = 10000
+    USER_CACHE_TTL = 3600  # 1 hour for user lookups
+    USER_CACHE_NEGATIVE_TTL = 300  # 5 minutes for "User not found"
+    CONCURRENCY_INITIAL = 8  # Starting in-flight limit per endpoint group
+    CONCURRENCY_MAX = 64
+    BREAKER_FAILURE_THRESHOLD = 5  # Consecutive 5xx/connection failures before failing fast
+    BREAKER_RECOVERY_TIMEOUT = 30  # Seconds before a probe request is let through
+    SENT_LOOKUP_SKEW = 120  # Seconds of clock skew allowed when looking for a sent message
 
     def __init__(
         self,
@@ -60,6 +913,8 @@ class XAPIClient:
         api_secret: Optional[str] = None,
         access_token: Optional[str] = None,
         access_secret: Optional[str] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[Transport] = None,
     ):
         """
         Initialize the X API client with OAuth 1.0a credentials.
@@ -69,6 +924,10 @@ class XAPIClient:
             api_secret: Consumer Secret. If None, will try to load from env.
             access_token: Access Token. If None, will try to load from env.
             access_secret: Access Token Secret. If None, will try to load from env.
+            base_url: API root (default: X_API_BASE_URL, else BASE_URL), e.g. a
+                local mock server for load tests
+            transport: How requests are sent (default: requests, one
+                connection per thread; see make_transport)
         """
         self.api_key = api_key or os.getenv("X_API_KEY") or os.getenv("TWITTER_API_KEY")
         self.api_secret = api_secret or os.getenv("X_API_SECRET") or os.getenv("TWITTER_API_SECRET")
@@ -81,10 +940,45 @@ class XAPIClient:
                 "X_ACCESS_TOKEN, X_ACCESS_SECRET"
             )
 
+        self.base_url = (base_url or os.getenv("X_API_BASE_URL") or self.BASE_URL).rstrip("/")
+
+        # Pooled connections keep the API warm (see Transport)
+        self.transport = transport or RequestsTransport()
+
+        # Guards caches, rate limit state and counters shared between threads
+        self._lock = threading.Lock()
+
+        # JSON decoder for responses (fastest installed, see get_codec)
+        self.codec = get_codec()
+
+        # Concurrent identical GET requests share one in-flight request
+        self._inflight = _SingleFlight()
+        self._requests_sent = 0
+
         # Caching for API efficiency
         self._cached_user_id = None
-        self._username_cache = {}
-        self._CACHE_TTL = 3600  # 1 hour for username cache
+        # User objects keyed by ("username", lowercase handle) and ("id", user ID)
+        self._user_cache = TTLCache(
+            max_entries=self.USER_CACHE_MAX_ENTRIES,
+            ttl=self.USER_CACHE_TTL,
+            negative_ttl=self.USER_CACHE_NEGATIVE_TTL,
+        )
+
+        # Last seen rate limit headers per endpoint: {endpoint: (remaining, reset_at)}
+        self._rate_limits: Dict[str, tuple] = {}
+
+        # Callbacks invoked with the response of every successful post_tweet
+        self._post_listeners: List[Any] = []
+        # Callbacks invoked with the request body before every post_tweet
+        self._pre_post_checks: List[Any] = []
+        # Check length, media and reply/quote parameters locally before posting
+        self.validate_posts = _env_enabled("X_API_VALIDATE")
+
+        # Adaptive in-flight limits and circuit breakers per endpoint group
+        # (X_API_ADAPTIVE_CONCURRENCY=0 disables both)
+        self.adaptive_concurrency = _env_enabled("X_API_ADAPTIVE_CONCURRENCY")
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
 
     def _generate_nonce(self) -> str:
         """Generate a random nonce for OAuth signature."""
@@ -191,6 +1085,62 @@ class XAPIClient:
 
         return f'OAuth {", ".join(oauth_header_parts)}'
 
+    def _send(self, method: str, url: str, **kwargs):
+        """
+        Send a signed HTTP request. Every API call goes through here, once the
+        breaker and adaptive limit of its endpoint group have admitted it.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            **kwargs: Passed to the transport (headers, params, json, data, files)
+
+        Returns:
+            The transport's response
+        """
+        with self._lock:
+            self._requests_sent += 1
+        return self.transport.send(method, url, timeout=self.REQUEST_TIMEOUT, **kwargs)
+
+    def get_request_stats(self) -> Dict[str, int]:
+        """
+        Get request counters.
+
+        Returns:
+            {"requests_sent": HTTP requests made,
+             "coalesced": GET calls served by an identical in-flight request}
+        """
+        with self._lock:
+            sent = self._requests_sent
+        return {"requests_sent": sent, "coalesced": self._inflight.coalesced}
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """
+        Call any X API endpoint, e.g. one without a method of its own.
+
+        The request is signed, concurrency-limited and decoded like those of
+        the built-in methods (identical concurrent GETs are coalesced).
+
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            endpoint: API endpoint path (e.g. "/2/users/me")
+            params: Query parameters
+            data: JSON request body
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            XAPIClientError: On API errors
+        """
+        return self._make_request(method, endpoint, params=params, data=data)
+
     def _make_request(
         self,
         method: str,
@@ -199,6 +1149,27 @@ class XAPIClient:
         data: Optional[Dict] = None,
         files: Optional[Dict] = None,
         multipart: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Make an HTTP request to the X API, coalescing identical concurrent GETs.
+
+        Takes the same arguments and returns the same result as _send_request.
+        """
+        if method.upper() == "GET" and not files:
+            key = (endpoint, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+            return self._inflight.do(
+                key, lambda: self._send_request(method, endpoint, params, data, files, multipart)
+            )
+        return self._send_request(method, endpoint, params, data, files, multipart)
+
+    def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        files: Optional[Dict] = None,
+        multipart: bool = False,
     ) -> Dict[str, Any]:
         """
         Make an HTTP request to the X API with OAuth 1.0a authentication.
@@ -217,7 +1188,7 @@ class XAPIClient:
         Raises:
             XAPIClientError: On API errors
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        url = f"{self.base_url}{endpoint}"
 
         # X API OAuth 1.0a signature rules:
         # - Query params always in signature
@@ -240,36 +1211,209 @@ class XAPIClient:
 
         try:
             if files:
-                response = requests.request(
+                response = self._guarded_send(method, endpoint, lambda: self._send(
                     method, url, headers=headers, data=data, files=files, params=params
-                )
+                ))
             else:
-                response = requests.request(
+                response = self._guarded_send(method, endpoint, lambda: self._send(
                     method, url, headers=headers, json=data, params=params
-                )
+                ))
+
+            self._record_rate_limit(endpoint, response)
 
             # Handle rate limiting
             if response.status_code == 429:
-                raise XAPIRateLimitError("Rate limit exceeded")
+                raise XAPIRateLimitError(
+                    "Rate limit exceeded", reset_at=self._rate_limits.get(endpoint, (None, None))[1]
+                )
 
             # Handle other errors
             if not response.ok:
                 try:
-                    error_data = response.json() if response.content else {}
-                except:
+                    error_data = self._decode(response) if response.content else {}
+                except XAPIClientError:
                     error_data = {}
                 error_msg = error_data.get("title", response.text)
                 detail = error_data.get("detail", "")
                 if detail:
                     error_msg += f": {detail}"
                 raise XAPIClientError(
-                    f"API Error {response.status_code}: {error_msg}"
+                    f"API Error {response.status_code}: {error_msg}",
+                    status_code=response.status_code,
                 )
 
-            return response.json()
+            return self._decode(response)
+
+        except (requests.RequestException, TransportError) as e:
+            raise XAPIConnectionError(f"Request failed: {e}")
+
+    def _decode(self, response) -> Any:
+        """
+        Decode a response body with the client's codec.
+
+        Raises:
+            XAPIClientError: If the body is not valid JSON (e.g. an HTML error
+                page from a proxy), with the status code and the start of the body
+        """
+        try:
+            return self.codec.loads(response.content)
+        except ValueError:
+            body = response.content[:200].decode("utf-8", "replace")
+            raise XAPIClientError(
+                f"Invalid response body (HTTP {response.status_code}): {body!r}",
+                status_code=response.status_code,
+            )
 
-        except requests.RequestException as e:
-            raise XAPIClientError(f"Request failed: {e}")
+    def _record_rate_limit(self, endpoint: str, response) -> None:
+        """Remember the x-rate-limit-* headers returned for an endpoint."""
+        remaining = response.headers.get("x-rate-limit-remaining")
+        reset = response.headers.get("x-rate-limit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            limit = (int(remaining), float(reset))
+        except ValueError:
+            return
+        with self._lock:
+            self._rate_limits[endpoint] = limit
+
+    def get_rate_limit(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the rate limit window of an endpoint, from its last response's headers.
+
+        Args:
+            endpoint: API endpoint path (e.g. "/2/tweets/search/recent")
+
+        Returns:
+            {"remaining": requests left in the window, "reset_at": Unix time
+             the window resets}, or None if unknown or the window has already reset
+        """
+        with self._lock:
+            remaining, reset_at = self._rate_limits.get(endpoint, (None, None))
+        if remaining is None or time.time() >= reset_at:
+            return None
+        return {"remaining": remaining, "reset_at": reset_at}
+
+    def _guard(self, group: str):
+        """Get (creating on first use) the limiter and breaker of an endpoint group."""
+        with self._lock:
+            if group not in self._limiters:
+                self._limiters[group] = AdaptiveLimiter(
+                    initial=self.CONCURRENCY_INITIAL, max_limit=self.CONCURRENCY_MAX
+                )
+                self._breakers[group] = CircuitBreaker(
+                    self.BREAKER_FAILURE_THRESHOLD, self.BREAKER_RECOVERY_TIMEOUT
+                )
+            return self._limiters[group], self._breakers[group]
+
+    def _guarded_send(self, method: str, endpoint: str, send):
+        """
+        Run send() under the endpoint group's breaker and adaptive limit.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            send: Callable sending the request and returning the response
+
+        Returns:
+            The response
+        """
+        if not self.adaptive_concurrency:
+            return send()
+
+        group = endpoint_group(method, endpoint)
+        limiter, breaker = self._guard(group)
+        breaker.check(group)
+        limiter.acquire()
+        started = time.perf_counter()
+        response = None
+        try:
+            response = send()
+            return response
+        finally:
+            status_code = response.status_code if response is not None else None
+            healthy = status_code is not None and status_code != 429 and status_code < 500
+            limiter.release(time.perf_counter() - started, healthy)
+            reset_at = None
+            if status_code == 429:
+                try:
+                    reset_at = float(response.headers.get("x-rate-limit-reset"))
+                except (TypeError, ValueError):
+                    pass
+            breaker.record(status_code, reset_at)
+
+    def get_concurrency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get adaptive concurrency state per endpoint group.
+
+        Returns:
+            {group: {"limit", "in_flight", "circuit", "failures"}}
+        """
+        with self._lock:
+            groups = list(self._limiters)
+        stats = {}
+        for group in groups:
+            limiter, breaker = self._guard(group)
+            stats[group] = {
+                "limit": int(limiter.limit),
+                "in_flight": limiter.in_flight,
+                "circuit": breaker.state,
+                "failures": breaker.failures,
+            }
+        return stats
+
+    def map_concurrent(self, fn, items, max_workers: int = 4) -> List[Any]:
+        """
+        Apply fn to every item using a bounded thread pool.
+
+        max_workers is a ceiling: requests made by fn are further bounded by
+        the adaptive limit and circuit breaker of their endpoint group.
+
+        Args:
+            fn: Function taking a single item
+            items: Items to process
+            max_workers: Maximum number of concurrent calls
+
+        Returns:
+            Results in the same order as items. The first exception raised
+            by fn is re-raised after in-flight calls finish.
+        """
+        items = list(items)
+        if max_workers <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    def add_post_listener(self, callback) -> None:
+        """
+        Register a callback to run after every successful post_tweet.
+
+        Args:
+            callback: Function called with the post_tweet response. Errors
+                raised by the callback are reported on stderr and never
+                fail the post.
+        """
+        self._post_listeners.append(callback)
+
+    def add_pre_post_check(self, callback) -> None:
+        """
+        Register a check run before every post_tweet (and so every reply,
+        quote and thread segment).
+
+        Args:
+            callback: Called with the request body ({"text", ...}); raise an
+                XAPIClientError subclass to stop the post from being sent
+        """
+        self._pre_post_checks.append(callback)
+
+    def _notify_post_listeners(self, result: Dict[str, Any]) -> None:
+        """Run post listeners for a successful post_tweet response."""
+        for callback in self._post_listeners:
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"Warning: post listener failed: {e}", file=sys.stderr)
 
     def extract_tweet_id(self, tweet_url_or_id: str) -> str:
         """
@@ -298,7 +1442,7 @@ class XAPIClient:
 
         raise XAPIClientError(f"Could not extract tweet ID from: {tweet_url_or_id}")
 
-    def _get_my_user_id(self) -> str:
+    def get_my_user_id(self) -> str:
         """
         Get the authenticated user's ID with caching.
 
@@ -306,39 +1450,221 @@ class XAPIClient:
             Cached user ID as string
         """
         if self._cached_user_id is None:
+            # Concurrent callers share a single /2/users/me request
             response = self._make_request("GET", "/2/users/me")
             self._cached_user_id = response["data"]["id"]
         return self._cached_user_id
 
-    def get_user_id_from_username(self, username: str) -> str:
+    def _cache_users(self, users: List[Dict[str, Any]]) -> None:
+        """Store user objects (from lookups or expansions) in the user cache."""
+        for user in users:
+            if "id" not in user:
+                continue
+            # Cache a private copy; reads hand out copies too, so callers can't alter it
+            user = copy.deepcopy(user)
+            self._user_cache.set(("id", user["id"]), user)
+            if "username" in user:
+                self._user_cache.set(("username", user["username"].lower()), user)
+
+    def get_cached_user(self, username_or_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get user ID from username with caching.
+        Get a cached user object without calling the API.
+
+        Args:
+            username_or_id: X handle (with or without @) or numeric user ID
+
+        Returns:
+            User object, or None if not cached (or cached as not found)
+        """
+        key = username_or_id.lstrip("@")
+        if key.isdigit():
+            user = self._user_cache.get(("id", key))
+        else:
+            user = self._user_cache.get(("username", key.lower()))
+        if user is None or user is TTLCache.NOT_FOUND:
+            return None
+        return copy.deepcopy(user)
+
+    def get_user(self, username: str) -> Dict[str, Any]:
+        """
+        Get a user object by username with caching.
+
+        Both found users and "User not found" results are cached.
 
         Args:
             username: X handle (with or without @)
 
         Returns:
-            User ID as string
+            User data (id, name, username and USER_FIELDS)
         """
         username = username.lstrip("@")
+        key = ("username", username.lower())
 
         # Check cache
-        if username in self._username_cache:
-            cached_id, timestamp = self._username_cache[username]
-            if time.time() - timestamp < self._CACHE_TTL:
-                return cached_id
+        cached = self._user_cache.get(key)
+        if cached is TTLCache.NOT_FOUND:
+            raise XAPIClientError(f"User not found: {username}")
+        if cached is not None:
+            return copy.deepcopy(cached)
 
         # Fetch from API
         response = self._make_request(
             "GET",
             f"/2/users/by/username/{username}",
+            params={"user.fields": self.USER_FIELDS},
         )
         if "data" not in response:
+            self._user_cache.set_missing(key)
             raise XAPIClientError(f"User not found: {username}")
 
-        user_id = response["data"]["id"]
-        self._username_cache[username] = (user_id, time.time())
-        return user_id
+        self._cache_users([response["data"]])
+        return response["data"]
+
+    def get_users(self, usernames: List[str]) -> List[Dict[str, Any]]:
+        """
+        Resolve many usernames to user objects in bulk.
+
+        Cached users (and cached "not found" results) are served from the
+        cache; the rest are looked up 100 at a time via GET /2/users/by.
+
+        Args:
+            usernames: X handles (with or without @)
+
+        Returns:
+            One entry per input, in input order: the user object, or
+            {"username": ..., "error": ...} for users that could not be resolved
+            (including malformed handles, which are never sent: one would make
+            the API reject the whole batch)
+        """
+        handles = [username.strip().lstrip("@") for username in usernames]
+
+        resolved: Dict[str, Any] = {}
+        to_fetch = []
+        for handle in dict.fromkeys(handle.lower() for handle in handles):
+            if not HANDLE_PATTERN.match(handle):
+                resolved[handle] = XAPIClientError(f"Invalid username: {handle}")
+                continue
+            cached = self._user_cache.get(("username", handle))
+            if cached is None:
+                to_fetch.append(handle)
+            else:
+                resolved[handle] = cached
+
+        size = self.USER_LOOKUP_BATCH_SIZE
+        for i in range(0, len(to_fetch), size):
+            batch = to_fetch[i:i + size]
+            response = self._make_request(
+                "GET",
+                "/2/users/by",
+                params={"usernames": ",".join(batch), "user.fields": self.USER_FIELDS},
+            )
+            self._cache_users(response.get("data", []))
+            for user in response.get("data", []):
+                resolved[user["username"].lower()] = user
+            for handle in batch:
+                if handle not in resolved:
+                    self._user_cache.set_missing(("username", handle))
+                    resolved[handle] = TTLCache.NOT_FOUND
+
+        results = []
+        for handle in handles:
+            user = resolved[handle.lower()]
+            if isinstance(user, XAPIClientError):
+                results.append({"username": handle, "error": str(user)})
+            elif user is TTLCache.NOT_FOUND:
+                results.append({"username": handle, "error": f"User not found: {handle}"})
+            else:
+                results.append(copy.deepcopy(user))
+        return results
+
+    def get_user_id_from_username(self, username: str) -> str:
+        """
+        Get user ID from username with caching.
+
+        Args:
+            username: X handle (with or without @)
+
+        Returns:
+            User ID as string
+        """
+        return self.get_user(username)["id"]
+
+    def _field_params(self, fields: Optional[str], default_tweet_fields: str) -> Dict[str, str]:
+        """
+        Resolve a field projection into request parameters.
+
+        Args:
+            fields: Profile name from FIELD_PROFILES, a comma-separated
+                tweet.fields list, or None for the method's default
+            default_tweet_fields: tweet.fields used when fields is None
+
+        Returns:
+            Query parameters (tweet.fields, and expansions/user.fields for profiles that need them)
+        """
+        if fields is None:
+            return {"tweet.fields": default_tweet_fields}
+        if fields in FIELD_PROFILES:
+            return dict(FIELD_PROFILES[fields])
+        return {"tweet.fields": fields}
+
+    def _paginate(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        token_param: str = "pagination_token",
+        pagination_token: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Follow next_token pagination of a GET endpoint lazily.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters for every page
+            token_param: Query parameter carrying the token
+                ("next_token" for search, "pagination_token" elsewhere)
+            pagination_token: Token of the first page to fetch (to resume)
+            max_pages: Stop after this many pages
+
+        Yields:
+            Raw page responses; meta.next_token is present while more pages remain
+        """
+        token = pagination_token
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            page_params = dict(params)
+            if token:
+                page_params[token_param] = token
+            response = self._make_request("GET", endpoint, params=page_params)
+            pages += 1
+            yield response
+            token = response.get("meta", {}).get("next_token")
+            if not token:
+                break
+
+    def _merge_authors(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get a response's tweets with expanded authors merged in as "author".
+
+        Expanded users are also stored in the user cache.
+        """
+        users = response.get("includes", {}).get("users", [])
+        if not users:
+            return response.get("data", [])
+
+        self._cache_users(users)
+        users_map = {user["id"]: user for user in users}
+        results = []
+        for tweet in response.get("data", []):
+            tweet_data = tweet.copy()
+            if tweet.get("author_id") in users_map:
+                tweet_data["author"] = users_map[tweet["author_id"]]
+            results.append(tweet_data)
+        return results
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get user cache counters (entries, bytes, hits, negative_hits, misses, evictions, expirations)."""
+        return self._user_cache.stats()
 
     def upload_media(self, media_path: str, media_category: str = "tweet_image") -> str:
         """
@@ -373,7 +1699,7 @@ class XAPIClient:
             raise XAPIClientError(f"Unsupported file type: {ext}")
 
         # Upload media using OAuth 1.0a with multipart
-        url = f"{self.BASE_URL}/2/media/upload"
+        url = f"{self.base_url}/2/media/upload"
 
         # Create OAuth header for multipart
         oauth_header = self._create_oauth_header("POST", url, {})
@@ -387,17 +1713,29 @@ class XAPIClient:
                 "Authorization": oauth_header,
             }
 
-            response = requests.post(url, headers=headers, data=data, files=files)
+            try:
+                response = self._guarded_send("POST", "/2/media/upload", lambda: self._send(
+                    "POST", url, headers=headers, data=data, files=files
+                ))
+            except (requests.RequestException, TransportError) as e:
+                raise XAPIConnectionError(f"Media upload failed: {e}")
+
+        self._record_rate_limit("/2/media/upload", response)
 
         if response.status_code == 429:
-            raise XAPIRateLimitError("Rate limit exceeded")
+            raise XAPIRateLimitError(
+                "Rate limit exceeded", reset_at=self._rate_limits.get("/2/media/upload", (None, None))[1]
+            )
 
         if not response.ok:
-            error_data = response.json() if response.content else {}
+            try:
+                error_data = self._decode(response) if response.content else {}
+            except XAPIClientError:
+                error_data = {}
             error_msg = error_data.get("title", response.text)
-            raise XAPIClientError(f"Media upload failed: {error_msg}")
+            raise XAPIClientError(f"Media upload failed: {error_msg}", status_code=response.status_code)
 
-        result = response.json()
+        result = self._decode(response)
         if "data" not in result:
             raise XAPIClientError(f"Media upload failed: {result}")
 
@@ -425,6 +1763,9 @@ class XAPIClient:
 
         Returns:
             Response with tweet data
+
+        Raises:
+            XAPIValidationError: If the post breaks X's limits (nothing is sent)
         """
         data: Dict[str, Any] = {"text": text}
 
@@ -440,7 +1781,15 @@ class XAPIClient:
         if reply_settings:
             data["reply_settings"] = reply_settings
 
-        return self._make_request("POST", "/2/tweets", data=data)
+        if self.validate_posts:
+            check_tweet(text, media_ids=media_ids, reply_to_id=reply_to_id, quote_tweet_id=quote_tweet_id)
+        for check in self._pre_post_checks:
+            check(data)
+
+        result = self._make_request("POST", "/2/tweets", data=data)
+        if "data" in result:
+            self._notify_post_listeners(result)
+        return result
 
     def post_reply(self, text: str, parent_post_link: str, **kwargs) -> Dict[str, Any]:
         """
@@ -494,6 +1843,128 @@ class XAPIClient:
         media_id = self.upload_media(media_location)
         return self.post_tweet(text, media_ids=[media_id], **kwargs)
 
+    def post_thread(
+        self,
+        texts: List[str],
+        media: Optional[List[Optional[List[str]]]] = None,
+        reply_to_id: Optional[str] = None,
+        start_index: int = 0,
+        media_ids: Optional[List[Optional[List[str]]]] = None,
+        max_upload_workers: int = 4,
+        max_rate_limit_wait: float = 900,
+    ) -> List[Dict[str, Any]]:
+        """
+        Post a thread: each segment replies to the previous one.
+
+        All media is uploaded concurrently before the first post, then the
+        segments are chained back to back. If the posting rate limit is hit,
+        waits for the window to reset (up to max_rate_limit_wait seconds).
+
+        Args:
+            texts: Ordered segment texts
+            media: Optional media file paths per segment (up to 4 each)
+            reply_to_id: Tweet ID or URL the first segment replies to
+            start_index: First segment to post (for resuming)
+            media_ids: Already uploaded media IDs per segment (for resuming)
+            max_upload_workers: Maximum concurrent media uploads
+            max_rate_limit_wait: Longest time to wait for a rate limit reset
+
+        Returns:
+            Responses of the posted segments, in order
+
+        Raises:
+            XAPIValidationError: If any segment breaks X's limits (checked
+                before anything is uploaded or posted)
+            XAPIThreadError: With failed_index, last_tweet_id and media_ids
+                to resume from the first segment that was not posted
+                (unknown_outcome: that segment may have been posted)
+        """
+        media = list(media or [])
+        media += [None] * (len(texts) - len(media))
+        media_ids = list(media_ids or [])
+        media_ids += [None] * (len(texts) - len(media_ids))
+
+        if self.validate_posts:
+            problems = [
+                f"segment {index + 1}: {problem}"
+                for index in range(start_index, len(texts))
+                for problem in validate_tweet(texts[index], media_ids=media_ids[index] or media[index])
+            ]
+            if problems:
+                raise XAPIValidationError(f"Invalid thread: {'; '.join(problems)}", problems)
+
+        previous_id = self.extract_tweet_id(reply_to_id) if reply_to_id else None
+        posted: List[Dict[str, Any]] = []
+
+        def failure(message: str, index: int, unknown_outcome: bool = False) -> XAPIThreadError:
+            return XAPIThreadError(
+                message,
+                failed_index=index,
+                posted=posted,
+                last_tweet_id=previous_id,
+                media_ids=media_ids,
+                unknown_outcome=unknown_outcome,
+            )
+
+        # Upload every pending attachment up front, concurrently
+        uploads = [
+            (index, position, path)
+            for index in range(start_index, len(texts))
+            if media[index] and not media_ids[index]
+            for position, path in enumerate(media[index])
+        ]
+
+        def upload(item):
+            index, position, path = item
+            try:
+                return index, position, self.upload_media(path)
+            except XAPIClientError as e:
+                return index, position, e
+
+        uploaded: Dict[int, Dict[int, str]] = {}
+        upload_errors = []
+        for index, position, result in self.map_concurrent(upload, uploads, max_upload_workers):
+            if isinstance(result, XAPIClientError):
+                upload_errors.append(f"segment {index + 1}: {result}")
+            else:
+                uploaded.setdefault(index, {})[position] = result
+
+        for index, ids in uploaded.items():
+            if len(ids) == len(media[index]):
+                media_ids[index] = [ids[position] for position in range(len(ids))]
+
+        if upload_errors:
+            raise failure(f"Media upload failed ({'; '.join(upload_errors)})", start_index)
+
+        # Chain the posts as fast as the rate limit allows
+        index = start_index
+        while index < len(texts):
+            try:
+                result = self.post_tweet(
+                    texts[index],
+                    reply_to_id=previous_id,
+                    media_ids=media_ids[index],
+                )
+            except XAPIRateLimitError as e:
+                wait = (e.reset_at - time.time()) if e.reset_at else None
+                if wait is not None and wait <= max_rate_limit_wait:
+                    time.sleep(max(0.0, wait) + 1)
+                    continue
+                raise failure(f"Segment {index + 1} failed: {e}", index)
+            except XAPIConnectionError as e:
+                raise failure(f"Segment {index + 1} failed: {e}", index, unknown_outcome=True)
+            except XAPIClientError as e:
+                raise failure(f"Segment {index + 1} failed: {e}", index)
+
+            if "data" not in result:
+                raise failure(f"Segment {index + 1} failed: {result}", index)
+
+            posted.append(result)
+            previous_id = result["data"]["id"]
+            index += 1
+
+        return posted
+
     def delete_post(self, post_link: str) -> Dict[str, Any]:
         """
         Delete a tweet.
@@ -521,7 +1992,7 @@ class XAPIClient:
         tweet_id = self.extract_tweet_id(child_post_link)
 
         if not user_id:
-            user_id = self._get_my_user_id()
+            user_id = self.get_my_user_id()
 
         data = {"tweet_id": tweet_id}
         return self._make_request("POST", f"/2/users/{user_id}/retweets", data=data)
@@ -540,7 +2011,7 @@ class XAPIClient:
         tweet_id = self.extract_tweet_id(post_link)
 
         if not user_id:
-            user_id = self._get_my_user_id()
+            user_id = self.get_my_user_id()
 
         data = {"tweet_id": tweet_id}
         return self._make_request("POST", f"/2/users/{user_id}/likes", data=data)
@@ -552,6 +2023,7 @@ class XAPIClient:
         recipient_handle: str,
         text: str,
         media_path: Optional[str] = None,
+        media_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Send a direct message.
@@ -560,19 +2032,41 @@ class XAPIClient:
             recipient_handle: X handle of recipient (with or without @)
             text: Message text content
             media_path: Optional path to media file
+            media_id: Already uploaded dm_image media ID (instead of media_path)
 
         Returns:
             Response with DM data
         """
         participant_id = self.get_user_id_from_username(recipient_handle)
 
+        if media_path and not media_id:
+            media_id = self.upload_media(media_path, media_category="dm_image")
+
+        return self.send_dm_to_id(participant_id, text, media_id=media_id)
+
+    def send_dm_to_id(
+        self,
+        participant_id: str,
+        text: str,
+        media_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a direct message to a user ID (no username lookup).
+
+        Args:
+            participant_id: Recipient's numeric user ID
+            text: Message text content
+            media_id: Optional uploaded dm_image media ID
+
+        Returns:
+            Response with DM data
+        """
         data: Dict[str, Any] = {}
 
         if text:
             data["text"] = text
 
-        if media_path:
-            media_id = self.upload_media(media_path, media_category="dm_image")
+        if media_id:
             data["attachments"] = [{"media_id": media_id}]
 
         return self._make_request(
@@ -581,74 +2075,225 @@ class XAPIClient:
             data=data,
         )
 
-    # ============== TIMELINE FUNCTIONS ==============
+    def get_dm_events(self, participant_id: str) -> List[Dict[str, Any]]:
+        """
+        Get recent messages of the one-to-one conversation with a user.
 
-    def get_user_posts(
-        self,
-        username: str,
-        timeframe: Optional[str] = None,
-        max_results: int = 10,
-    ) -> List[Dict[str, Any]]:
+        Args:
+            participant_id: The other participant's numeric user ID
+
+        Returns:
+            MessageCreate events (id, text, created_at, sender_id), newest first
         """
-        Get recent posts from a user.
+        response = self._make_request(
+            "GET",
+            f"/2/dm_conversations/with/{participant_id}/dm_events",
+            params={"dm_event.fields": "text,created_at,sender_id", "event_types": "MessageCreate"},
+        )
+        return response.get("data", [])
+
+    def find_sent_dm(self, participant_id: str, text: str, since: float) -> Optional[str]:
+        """
+        Find a message you sent to a user, e.g. after a send whose outcome is unknown.
 
         Args:
-            username: X handle (with or without @)
-            timeframe: Time filter like "2hrs", "8hrs", "1d", "1w"
-            max_results: Number of results (5-100)
+            participant_id: The recipient's numeric user ID
+            text: Text of the message (matched after normalize_text)
+            since: Unix time the message was sent at the earliest
+                (SENT_LOOKUP_SKEW seconds of clock skew are allowed)
 
         Returns:
-            List of tweet data
+            The message's dm_event ID, or None if it is not in the recent messages
         """
-        user_id = self.get_user_id_from_username(username)
+        text = normalize_text(text)
+        my_id = self.get_my_user_id()
+        since -= self.SENT_LOOKUP_SKEW
+        for event in self.get_dm_events(participant_id):
+            created = event.get("created_at")
+            if created and datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp() < since:
+                continue
+            if event.get("sender_id") == my_id and normalize_text(event.get("text")) == text:
+                return event["id"]
+        return None
+
+    # ============== TIMELINE FUNCTIONS ==============
 
+    def _user_posts_params(
+        self,
+        timeframe: Optional[str],
+        max_results: int,
+        fields: Optional[str],
+    ) -> Dict[str, Any]:
+        """Build query parameters for GET /2/users/{id}/tweets."""
         params: Dict[str, Any] = {
             "max_results": max_results,
-            "tweet.fields": "created_at,public_metrics,reply_settings",
+            **self._field_params(fields, "created_at,public_metrics,reply_settings"),
         }
 
         # Parse timeframe and set start_time
-        if timeframe:
-            now = datetime.utcnow()
-            time_mappings = {
-                "min": ("minutes", 1),
-                "mins": ("minutes", 1),
-                "hr": ("hours", 1),
-                "hrs": ("hours", 1),
-                "h": ("hours", 1),
-                "d": ("days", 1),
-                "day": ("days", 1),
-                "days": ("days", 1),
-                "w": ("weeks", 1),
-                "week": ("weeks", 1),
-                "weeks": ("weeks", 1),
-            }
+        delta = parse_timeframe(timeframe) if timeframe else None
+        if delta:
+            start_time = datetime.utcnow() - delta
+            params["start_time"] = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-            # Parse the timeframe
-            match = re.match(r'^(\d+)\s*([a-z]+)$', timeframe.lower())
-            if match:
-                amount = int(match.group(1))
-                unit = match.group(2)
+        return params
 
-                if unit in time_mappings:
-                    unit_name, multiplier = time_mappings[unit]
-                    kwargs = {unit_name: amount}
-                    start_time = now - timedelta(**kwargs)
-                    params["start_time"] = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+    def get_user_posts(
+        self,
+        username: Union[str, List[str]],
+        timeframe: Optional[str] = None,
+        max_results: int = 10,
+        fields: Optional[str] = None,
+        errors: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recent posts from a user, or from several users at once.
+
+        Args:
+            username: X handle (with or without @), or a list of handles
+                (see get_many_user_posts)
+            timeframe: Time filter like "2hrs", "8hrs", "1d", "1w"
+            max_results: Number of results (5-100), per user
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
+            errors: With a list of handles, receives {handle: error message}
+                for accounts that failed (they are skipped)
+
+        Returns:
+            List of tweet data (for a list of handles: merged newest first,
+            each with "author" set to the user object)
+        """
+        if not isinstance(username, str):
+            result = self.get_many_user_posts(username, timeframe, max_results, fields)
+            if errors is not None:
+                errors.update(result["errors"])
+            return result["data"]
+
+        user_id = self.get_user_id_from_username(username)
 
         response = self._make_request(
             "GET",
             f"/2/users/{user_id}/tweets",
-            params=params,
+            params=self._user_posts_params(timeframe, max_results, fields),
         )
 
-        return response.get("data", [])
+        return self._merge_authors(response)
+
+    def get_many_user_posts(
+        self,
+        usernames: List[str],
+        timeframe: Optional[str] = None,
+        max_results: int = 10,
+        fields: Optional[str] = None,
+        max_workers: int = 8,
+    ) -> Dict[str, Any]:
+        """
+        Get recent posts from many users concurrently.
+
+        Handles are resolved in bulk (GET /2/users/by, 100 per request, cached),
+        then timelines are fetched with bounded parallelism. A failing account
+        (suspended, protected, not found) never fails the batch.
+
+        Args:
+            usernames: X handles (with or without @)
+            timeframe: Time filter like "2hrs", "8hrs", "1d", "1w"
+            max_results: Number of results (5-100) per user
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
+            max_workers: Maximum concurrent timeline requests
+
+        Returns:
+            {"data": tweets merged newest first, each with "author" set to the user object,
+             "errors": {handle: error message}}
+        """
+        params = self._user_posts_params(timeframe, max_results, fields)
+        errors: Dict[str, str] = {}
+
+        users = []
+        for user in self.get_users(usernames):
+            if "error" in user:
+                errors[user["username"]] = user["error"]
+            else:
+                users.append(user)
+
+        def fetch(user: Dict[str, Any]):
+            try:
+                response = self._make_request("GET", f"/2/users/{user['id']}/tweets", params=params)
+            except XAPIClientError as e:
+                return user, e
+            posts = []
+            for tweet in self._merge_authors(response):
+                tweet = dict(tweet)
+                tweet.setdefault("author", user)
+                posts.append(tweet)
+            return user, posts
+
+        timelines = []
+        unique_users = list({user["id"]: user for user in users}.values())
+        for user, result in self.map_concurrent(fetch, unique_users, max_workers):
+            if isinstance(result, XAPIClientError):
+                errors[user["username"]] = str(result)
+            else:
+                timelines.append(result)
+
+        merged = list(heapq.merge(*timelines, key=lambda tweet: int(tweet["id"]), reverse=True))
+        return {"data": merged, "errors": errors}
+
+    def get_user_posts_pages(
+        self,
+        username: Optional[str],
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        max_results: int = 100,
+        fields: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        pagination_token: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Page through a user's posts, newest first (the API serves the latest 3200).
+
+        Args:
+            username: X handle (with or without @), or None for your own posts
+            since_id: Return posts after this ID (exclusive)
+            until_id: Return posts before this ID (exclusive)
+            start_time: Oldest time, inclusive (ISO 8601)
+            end_time: Newest time, exclusive (ISO 8601)
+            max_results: Posts per page (5-100)
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
+            exclude: Types to exclude (e.g. ["replies", "retweets"])
+            pagination_token: Token of the first page to fetch (to resume)
+            max_pages: Stop after this many pages
+
+        Yields:
+            {"data": posts (authors merged), "meta": page meta with next_token if more remain}
+        """
+        user_id = self.get_user_id_from_username(username) if username else self.get_my_user_id()
+        params: Dict[str, Any] = {
+            "max_results": min(max(5, max_results), 100),
+            **self._field_params(fields, "created_at,public_metrics,reply_settings"),
+        }
+        for name, value in (("since_id", since_id), ("until_id", until_id),
+                            ("start_time", start_time), ("end_time", end_time)):
+            if value:
+                params[name] = value
+        if exclude:
+            params["exclude"] = ",".join(exclude)
+
+        for response in self._paginate(
+            f"/2/users/{user_id}/tweets",
+            params,
+            pagination_token=pagination_token,
+            max_pages=max_pages,
+        ):
+            yield {"data": self._merge_authors(response), "meta": response.get("meta", {})}
 
     def get_timeline(
         self,
         count: int = 10,
         user_id: Optional[str] = None,
         exclude: Optional[List[str]] = None,
+        fields: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Get timeline posts (reverse chronological home timeline).
@@ -657,16 +2302,17 @@ class XAPIClient:
             count: Number of posts to retrieve (1-100)
             user_id: Your user ID (if None, will use cached value)
             exclude: List of types to exclude (replies, retweets)
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
 
         Returns:
             List of tweet data
         """
         if not user_id:
-            user_id = self._get_my_user_id()
+            user_id = self.get_my_user_id()
 
         params: Dict[str, Any] = {
             "max_results": min(max(1, count), 100),
-            "tweet.fields": "created_at,public_metrics,reply_settings,author_id",
+            **self._field_params(fields, "created_at,public_metrics,reply_settings,author_id"),
         }
 
         if exclude:
@@ -678,7 +2324,7 @@ class XAPIClient:
             params=params,
         )
 
-        return response.get("data", [])
+        return self._merge_authors(response)
 
     # ============== SEARCH FUNCTIONS ==============
 
@@ -690,6 +2336,7 @@ class XAPIClient:
         end_time: Optional[str] = None,
         since_id: Optional[str] = None,
         until_id: Optional[str] = None,
+        fields: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search for tweets using X API v2 recent search.
@@ -701,9 +2348,10 @@ class XAPIClient:
             end_time: ISO 8601 datetime string (e.g., "2025-01-31T23:59:59Z")
             since_id: Return tweets after this ID (exclusive)
             until_id: Return tweets before this ID (exclusive)
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
 
         Returns:
-            List of tweet data dictionaries
+            List of tweet data dictionaries (with "author" when authors are expanded)
 
         Search Query Operators:
             - Text: "keyword", "phrase search"
@@ -724,7 +2372,7 @@ class XAPIClient:
         params: Dict[str, Any] = {
             "query": query,
             "max_results": min(max(10, max_results), 100),
-            "tweet.fields": "created_at,public_metrics,reply_settings,author_id,lang",
+            **self._field_params(fields, "created_at,public_metrics,reply_settings,author_id,lang"),
         }
 
         if start_time:
@@ -743,20 +2391,291 @@ class XAPIClient:
         )
 
         # Return tweets with author info merged
-        results = []
-        users_map = {}
-        if "includes" in response and "users" in response["includes"]:
-            for user in response["includes"]["users"]:
-                users_map[user["id"]] = user
+        return self._merge_authors(response)
 
-        for tweet in response.get("data", []):
-            tweet_data = tweet.copy()
-            if "author_id" in tweet and tweet["author_id"] in users_map:
-                tweet_data["author"] = users_map[tweet["author_id"]]
-            results.append(tweet_data)
+    def search_tweets_pages(
+        self,
+        query: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        max_results: int = 100,
+        fields: Optional[str] = None,
+        next_token: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Page through recent search results, newest first.
 
+        Args:
+            query: Search query
+            start_time: Oldest time, inclusive (ISO 8601)
+            end_time: Newest time, exclusive (ISO 8601)
+            since_id: Return tweets after this ID (exclusive)
+            until_id: Return tweets before this ID (exclusive)
+            max_results: Tweets per page (10-100)
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
+            next_token: Token of the first page to fetch (to resume)
+            max_pages: Stop after this many pages
+
+        Yields:
+            {"data": tweets (authors merged), "meta": page meta with next_token if more remain}
+        """
+        params: Dict[str, Any] = {
+            "query": query,
+            "max_results": min(max(10, max_results), 100),
+            **self._field_params(fields, "created_at,public_metrics,reply_settings,author_id,lang"),
+        }
+        for name, value in (("start_time", start_time), ("end_time", end_time),
+                            ("since_id", since_id), ("until_id", until_id)):
+            if value:
+                params[name] = value
+
+        for response in self._paginate(
+            "/2/tweets/search/recent",
+            params,
+            token_param="next_token",
+            pagination_token=next_token,
+            max_pages=max_pages,
+        ):
+            yield {"data": self._merge_authors(response), "meta": response.get("meta", {})}
+
+    # ============== LOOKUP FUNCTIONS ==============
+
+    def get_tweets(
+        self,
+        ids: List[str],
+        tweet_fields: Optional[str] = None,
+        expansions: Optional[str] = None,
+        user_fields: Optional[str] = None,
+        max_workers: int = 4,
+        fields: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Look up any number of tweets by ID or URL.
+
+        IDs are deduplicated and sent in batches of 100 to GET /2/tweets.
+        Batches run concurrently, capped by max_workers and by the remaining
+        rate limit budget for the endpoint.
+
+        Args:
+            ids: Tweet IDs or URLs
+            tweet_fields: Comma-separated tweet.fields to request
+                (default: "created_at,public_metrics,reply_settings,author_id,lang")
+            expansions: Comma-separated expansions (e.g. "author_id")
+            user_fields: Comma-separated user.fields for expanded users
+            max_workers: Maximum number of concurrent batch requests
+            fields: Field profile ("minimal", "metrics", "full"); explicit
+                tweet_fields/expansions/user_fields take precedence
+
+        Returns:
+            One entry per input, in input order. Found tweets are returned as
+            tweet data (with "author" merged when expanded). Missing, deleted
+            or protected tweets are returned as {"id": ..., "error": ...}.
+        """
+        tweet_ids = [self.extract_tweet_id(str(i)) for i in ids]
+        unique_ids = list(dict.fromkeys(tweet_ids))
+        if not unique_ids:
+            return []
+
+        params: Dict[str, Any] = self._field_params(
+            fields, "created_at,public_metrics,reply_settings,author_id,lang"
+        )
+        if tweet_fields:
+            params["tweet.fields"] = tweet_fields
+        if expansions:
+            params["expansions"] = expansions
+        if user_fields:
+            params["user.fields"] = user_fields
+
+        size = self.TWEET_LOOKUP_BATCH_SIZE
+        batches = [unique_ids[i:i + size] for i in range(0, len(unique_ids), size)]
+
+        limit = self.get_rate_limit("/2/tweets")
+        if limit and limit["remaining"] == 0:
+            raise XAPIRateLimitError("Rate limit exceeded", reset_at=limit["reset_at"])
+        if limit:
+            max_workers = min(max_workers, limit["remaining"])
+
+        def fetch_batch(batch: List[str]) -> Dict[str, Any]:
+            return self._make_request(
+                "GET",
+                "/2/tweets",
+                params=dict(params, ids=",".join(batch)),
+            )
+
+        found: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        for response in self.map_concurrent(fetch_batch, batches, max_workers):
+            for tweet in self._merge_authors(response):
+                found[tweet["id"]] = tweet
+            for error in response.get("errors", []):
+                error_id = error.get("resource_id") or error.get("value")
+                if error_id:
+                    errors[error_id] = error.get("detail") or error.get("title", "Unknown error")
+
+        results = []
+        for tweet_id in tweet_ids:
+            if tweet_id in found:
+                results.append(found[tweet_id])
+            else:
+                results.append({
+                    "id": tweet_id,
+                    "error": errors.get(tweet_id, f"Tweet not returned: {tweet_id}"),
+                })
         return results
 
+    def get_quote_tweets_pages(
+        self,
+        post_link: str,
+        max_results: int = 100,
+        fields: Optional[str] = None,
+        pagination_token: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Page through the quote tweets of a post, newest first.
+
+        Args:
+            post_link: Tweet URL or ID
+            max_results: Quote tweets per page (10-100)
+            fields: Field profile ("minimal", "metrics", "full") or tweet.fields list
+            pagination_token: Token of the first page to fetch (to resume)
+            max_pages: Stop after this many pages
+
+        Yields:
+            {"data": quote tweets (authors merged and cached), "meta": page meta}
+        """
+        tweet_id = self.extract_tweet_id(post_link)
+        params: Dict[str, Any] = {
+            "max_results": min(max(10, max_results), 100),
+            **self._field_params(fields, "created_at,public_metrics,author_id"),
+        }
+        # Quote authors are always expanded, so they can be cached and aggregated
+        params.setdefault("expansions", "author_id")
+        params.setdefault("user.fields", self.USER_FIELDS)
+
+        for response in self._paginate(
+            f"/2/tweets/{tweet_id}/quote_tweets",
+            params,
+            pagination_token=pagination_token,
+            max_pages=max_pages,
+        ):
+            yield {"data": self._merge_authors(response), "meta": response.get("meta", {})}
+
+    def _user_list_pages(
+        self,
+        endpoint: str,
+        max_results: int,
+        pagination_token: Optional[str],
+        max_pages: Optional[int],
+    ) -> Iterator[Dict[str, Any]]:
+        """Page through an endpoint returning users; every user is cached."""
+        params = {"max_results": min(max(1, max_results), 100), "user.fields": self.USER_FIELDS}
+        for response in self._paginate(endpoint, params, pagination_token=pagination_token,
+                                       max_pages=max_pages):
+            users = response.get("data", [])
+            self._cache_users(users)
+            yield {"data": users, "meta": response.get("meta", {})}
+
+    def get_retweeted_by_pages(
+        self,
+        post_link: str,
+        max_results: int = 100,
+        pagination_token: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Page through the users who retweeted a post.
+
+        Args:
+            post_link: Tweet URL or ID
+            max_results: Users per page (1-100)
+            pagination_token: Token of the first page to fetch (to resume)
+            max_pages: Stop after this many pages
+
+        Yields:
+            {"data": user objects (cached), "meta": page meta}
+        """
+        tweet_id = self.extract_tweet_id(post_link)
+        return self._user_list_pages(f"/2/tweets/{tweet_id}/retweeted_by", max_results,
+                                     pagination_token, max_pages)
+
+    def get_liking_users_pages(
+        self,
+        post_link: str,
+        max_results: int = 100,
+        pagination_token: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Page through the users who liked a post (X only lists likers of your
+        own posts to most apps).
+
+        Args:
+            post_link: Tweet URL or ID
+            max_results: Users per page (1-100)
+            pagination_token: Token of the first page to fetch (to resume)
+            max_pages: Stop after this many pages
+
+        Yields:
+            {"data": user objects (cached), "meta": page meta}
+        """
+        tweet_id = self.extract_tweet_id(post_link)
+        return self._user_list_pages(f"/2/tweets/{tweet_id}/liking_users", max_results,
+                                     pagination_token, max_pages)
+
+    def _collect(self, pages: Iterator[Dict[str, Any]], limit: Optional[int]) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        for page in pages:
+            items.extend(page["data"])
+            if limit is not None and len(items) >= limit:
+                return items[:limit]
+        return items
+
+    def get_quote_tweets(self, post_link: str, limit: Optional[int] = 100,
+                         fields: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the quote tweets of a post (authors merged), newest first.
+
+        Args:
+            post_link: Tweet URL or ID
+            limit: Maximum number of quote tweets (None: all pages)
+            fields: Field profile or tweet.fields list
+
+        Returns:
+            List of quote tweets
+        """
+        pages = self.get_quote_tweets_pages(post_link, max_results=min(limit or 100, 100), fields=fields)
+        return self._collect(pages, limit)
+
+    def get_retweeted_by(self, post_link: str, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """
+        Get the users who retweeted a post.
+
+        Args:
+            post_link: Tweet URL or ID
+            limit: Maximum number of users (None: all pages)
+
+        Returns:
+            List of user objects
+        """
+        return self._collect(self.get_retweeted_by_pages(post_link, max_results=min(limit or 100, 100)), limit)
+
+    def get_liking_users(self, post_link: str, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """
+        Get the users who liked a post.
+
+        Args:
+            post_link: Tweet URL or ID
+            limit: Maximum number of users (None: all pages)
+
+        Returns:
+            List of user objects
+        """
+        return self._collect(self.get_liking_users_pages(post_link, max_results=min(limit or 100, 100)), limit)
+
 
 # ============== CLI FUNCTIONS ==============
 
@@ -772,10 +2691,74 @@ def _load_env():
                     os.environ[key.strip()] = value.strip()
 
 
+def get_data_dir() -> Path:
+    """
+    Get the directory for local state (trackers, queues, caches).
+
+    Uses X_API_DATA_DIR if set, otherwise ~/.x-api. Created if missing.
+    """
+    path = Path(os.getenv("X_API_DATA_DIR") or Path.home() / ".x-api")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _import_sibling(name: str):
+    """Import a module from the scripts directory, as a script or as a package."""
+    import importlib
+
+    if __package__:
+        return importlib.import_module(f"{__package__}.{name}")
+    return importlib.import_module(name)
+
+
+def _env_enabled(name: str, default: bool = True) -> bool:
+    """Read a boolean switch from the environment (0/false/no/off disable it)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
 def get_client() -> XAPIClient:
     """Get an initialized X API client."""
     _load_env()
-    return XAPIClient()
+    # HTTP transport (X_API_TRANSPORT=requests|http2|httpx|h2c, see http2_transport.py)
+    client = XAPIClient(transport=make_transport())
+
+    # Record or replay HTTP traffic (X_API_CASSETTE=path, X_API_CASSETTE_MODE=record|replay)
+    if os.getenv("X_API_CASSETTE"):
+        _import_sibling("cassette").install(
+            client,
+            os.environ["X_API_CASSETTE"],
+            mode=os.getenv("X_API_CASSETTE_MODE"),
+            simulate_latency=_env_enabled("X_API_CASSETTE_LATENCY", default=False),
+        )
+
+    # Block near-duplicates of already posted tweets (see similarity_index.py)
+    if _env_enabled("X_API_DUPLICATE_CHECK", default=False):
+        similarity_index = _import_sibling("similarity_index")
+        similarity_index.attach(client, threshold=similarity_index.default_threshold())
+
+    # Register every posted tweet with the engagement tracker
+    if _env_enabled("X_API_TRACK_ENGAGEMENT"):
+        _import_sibling("engagement_tracker").attach(client)
+
+    return client
+
+
+def profile_from_argv() -> None:
+    """
+    Turn on profiling when a script is run with --profile or --profile=<path>
+    (see profiling.py). Scripts call this before reading their arguments: the
+    flag is removed from sys.argv.
+    """
+    if any(arg == "--profile" or arg.startswith("--profile=") for arg in sys.argv[1:]):
+        _import_sibling("profiling").enable(_IMPORT_STARTED)
+
+
+# Opt-in phase profiling for any program using the client (X_API_PROFILE=1|path)
+if _env_enabled("X_API_PROFILE", default=False):
+    _import_sibling("profiling").enable(_IMPORT_STARTED)
 
 
 if __name__ == "__main__":